@@ -1,3 +1,15 @@
 """Main project entry point."""
 
-from lib.gameplay.game import Game
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:  # pragma: no cover
+    from lib.gameplay.game import Game
+
+
+def __getattr__(name: str) -> Any:
+    # Imported lazily so light entry points (lib.worker) stay cheap to import
+    if name == "Game":
+        from lib.gameplay.game import Game
+
+        return Game
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
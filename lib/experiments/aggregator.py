@@ -0,0 +1,202 @@
+from statistics import NormalDist
+from typing import Any, Union
+import math
+
+
+def wilson_interval(successes: int, trials: int, z: float) -> tuple[float, float]:
+    """Wilson score interval for a binomial proportion"""
+    if trials == 0:
+        return 0.0, 1.0
+    p = successes / trials
+    denominator = 1 + z**2 / trials
+    center = (p + z**2 / (2 * trials)) / denominator
+    half_width = (
+        z * math.sqrt(p * (1 - p) / trials + z**2 / (4 * trials**2)) / denominator
+    )
+    return max(0.0, center - half_width), min(1.0, center + half_width)
+
+
+class RunningMoments:
+    """Welford's online mean and variance"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+
+class ResultAggregator:
+    """Online win rates and turn counts for a batch of games.
+
+    Stops early once every win rate is known to within ``target_half_width``
+    or, with ``stop_on_difference``, once the leader's interval no longer
+    overlaps any other player's interval. Checking after every game inflates
+    the error rate of the difference rule, so prefer a high confidence.
+    """
+
+    def __init__(
+        self,
+        players: list[str],
+        confidence: float = 0.95,
+        target_half_width: Union[float, None] = None,
+        stop_on_difference: bool = False,
+        min_games: int = 20,
+    ):
+        self.players = list(players)
+        self.wins = {player: 0 for player in players}
+        self.games = 0
+        self.failed = 0
+        self.turns = RunningMoments()
+        self.confidence = confidence
+        self.z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        self.target_half_width = target_half_width
+        self.stop_on_difference = stop_on_difference
+        self.min_games = min_games
+
+    def add(self, winner: Union[str, None], turns: Union[int, None]) -> None:
+        self.games += 1
+        if winner is None:
+            self.failed += 1
+        else:
+            if winner not in self.wins:
+                self.players.append(winner)
+                self.wins[winner] = 0
+            self.wins[winner] += 1
+        if turns is not None:
+            self.turns.add(turns)
+
+    def win_rate(self, player: str) -> float:
+        return self.wins[player] / self.games if self.games > 0 else 0.0
+
+    def interval(self, player: str) -> tuple[float, float]:
+        return wilson_interval(self.wins[player], self.games, self.z)
+
+    def leader(self) -> str:
+        return max(self.players, key=lambda player: self.wins[player])
+
+    def precision_reached(self) -> bool:
+        if self.target_half_width is None:
+            return False
+        return all(
+            (high - low) / 2 <= self.target_half_width
+            for low, high in (self.interval(player) for player in self.players)
+        )
+
+    def difference_found(self) -> bool:
+        if not self.stop_on_difference or len(self.players) < 2:
+            return False
+        leader = self.leader()
+        leader_low, _ = self.interval(leader)
+        return all(
+            self.interval(player)[1] < leader_low
+            for player in self.players
+            if player != leader
+        )
+
+    def should_stop(self) -> bool:
+        if self.games < self.min_games:
+            return False
+        return self.precision_reached() or self.difference_found()
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "games": self.games,
+            "failed": self.failed,
+            "confidence": self.confidence,
+            "win_rates": {
+                player: {
+                    "wins": self.wins[player],
+                    "rate": self.win_rate(player),
+                    "interval": self.interval(player),
+                }
+                for player in self.players
+            },
+            "turns": {
+                "mean": self.turns.mean,
+                "std": self.turns.std,
+                "count": self.turns.count,
+            },
+        }
+
+    def __str__(self) -> str:
+        rates = ", ".join(
+            f"{player}: {self.win_rate(player):.2f} "
+            f"[{self.interval(player)[0]:.2f}, {self.interval(player)[1]:.2f}]"
+            for player in self.players
+        )
+        return (
+            f"{self.games} games, {rates}, "
+            f"turns {self.turns.mean:.1f} +/- {self.turns.std:.1f}"
+        )
+
+
+class PairedComparison:
+    """Differences between a candidate and a baseline played on the same seeds.
+
+    The interval of the mean difference uses the spread of the differences,
+    which is small when both games of a pair share their random numbers.
+    """
+
+    def __init__(self, confidence: float = 0.95):
+        self.confidence = confidence
+        self.z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        self.failed = 0
+        self.baseline = {"points": RunningMoments(), "wins": RunningMoments()}
+        self.candidate = {"points": RunningMoments(), "wins": RunningMoments()}
+        self.differences = {"points": RunningMoments(), "wins": RunningMoments()}
+
+    def add(self, baseline: dict[str, float], candidate: dict[str, float]) -> None:
+        """Add a pair of games, each given as its ``points`` and ``wins``"""
+        for key in self.differences:
+            self.baseline[key].add(baseline[key])
+            self.candidate[key].add(candidate[key])
+            self.differences[key].add(candidate[key] - baseline[key])
+
+    @property
+    def pairs(self) -> int:
+        return self.differences["points"].count
+
+    def interval(self, key: str) -> tuple[float, float]:
+        moments = self.differences[key]
+        if moments.count < 2:
+            return -math.inf, math.inf
+        half_width = self.z * moments.std / math.sqrt(moments.count)
+        return moments.mean - half_width, moments.mean + half_width
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "pairs": self.pairs,
+            "failed": self.failed,
+            "confidence": self.confidence,
+            **{
+                key: {
+                    "baseline": self.baseline[key].mean,
+                    "candidate": self.candidate[key].mean,
+                    "difference": self.differences[key].mean,
+                    "std": self.differences[key].std,
+                    "interval": self.interval(key),
+                }
+                for key in self.differences
+            },
+        }
+
+    def __str__(self) -> str:
+        return f"{self.pairs} pairs, " + ", ".join(
+            f"{key} {self.differences[key].mean:+.3f} "
+            f"[{self.interval(key)[0]:+.3f}, {self.interval(key)[1]:+.3f}]"
+            for key in self.differences
+        )
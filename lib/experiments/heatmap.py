@@ -0,0 +1,188 @@
+"""Where pieces and the robber end up, counted over many games.
+
+Counts are accumulated in NumPy arrays as games finish, so no per-action
+logging is needed. Every layer has a ``win_`` variant that only counts the
+pieces of the winner, or the robber moves the winner made.
+"""
+
+from lib.gameplay.events import Event, GameEvent, Subscriber
+from lib.gameplay.game import Game
+from lib.gameplay.layout import BoardLayout
+from lib.gameplay.pieces import PieceType
+from lib.gameplay.topology import NUM_EDGES, NUM_HEXES, NUM_VERTICES
+from lib.visualizer.renderer import Renderer
+from lib.worker import play_game
+from typing import Union
+import logging
+import numpy as np
+import os
+
+logger = logging.getLogger(__name__)
+
+LAYER_SIZES = {
+    "settlements": NUM_VERTICES,
+    "cities": NUM_VERTICES,
+    "roads": NUM_EDGES,
+    "robber": NUM_HEXES,
+}
+LAYERS = list(LAYER_SIZES) + [f"win_{layer}" for layer in LAYER_SIZES]
+
+
+class HeatmapAccumulator:
+    def __init__(self):
+        self.games = 0
+        self.counts = {
+            layer: np.zeros(LAYER_SIZES[layer.removeprefix("win_")], dtype=np.int64)
+            for layer in LAYERS
+        }
+        # Robber moves of the games in progress as (player id, hex id)
+        self.robber_moves: dict[str, list[tuple[int, int]]] = {}
+        # Callbacks subscribed to each attached game object
+        self.attached: dict[Game, list[tuple[GameEvent, Subscriber]]] = {}
+
+    def attach(self, game: Game) -> None:
+        """Count every game the game object plays until detached"""
+        if game in self.attached:
+            return
+        self.attached[game] = [
+            (GameEvent.MOVE_ROBBER, self.on_move_robber(game)),
+            (GameEvent.END_GAME, self.on_end_game(game)),
+        ]
+        for event_type, callback in self.attached[game]:
+            game.events.subscribe(event_type, callback)
+
+    def detach(self) -> None:
+        """Stop counting the games of every attached game object"""
+        for game, subscriptions in self.attached.items():
+            for event_type, callback in subscriptions:
+                game.events.unsubscribe(event_type, callback)
+        self.attached = {}
+        self.robber_moves = {}
+
+    def on_move_robber(self, game: Game):
+        def callback(event: Event) -> None:
+            if event.player is not None and event.location is not None:
+                moves = self.robber_moves.setdefault(game.game_id, [])
+                moves.append((event.player.id, event.location))
+
+        return callback
+
+    def on_end_game(self, game: Game):
+        def callback(event: Event) -> None:
+            self.add_game(game, self.robber_moves.pop(game.game_id, []))
+
+        return callback
+
+    def add_game(
+        self, game: Game, robber_moves: Union[list[tuple[int, int]], None] = None
+    ) -> None:
+        """Add the final board of a game"""
+        counts = self.counts
+        winner = game.winning_player
+        self.games += 1
+        for vertex in game.board.vertices:
+            piece = vertex.piece
+            if piece is None:
+                continue
+            layer = "cities" if piece.type == PieceType.CITY else "settlements"
+            counts[layer][vertex.id] += 1
+            if piece.player is winner:
+                counts[f"win_{layer}"][vertex.id] += 1
+        for edge in game.board.edges:
+            if edge.piece is not None:
+                counts["roads"][edge.id] += 1
+                if edge.piece.player is winner:
+                    counts["win_roads"][edge.id] += 1
+        for player_id, hex_id in robber_moves or []:
+            counts["robber"][hex_id] += 1
+            if winner is not None and player_id == winner.id:
+                counts["win_robber"][hex_id] += 1
+
+    def merge(self, other: "HeatmapAccumulator") -> None:
+        self.games += other.games
+        for layer in LAYERS:
+            self.counts[layer] += other.counts[layer]
+
+    def frequency(self, layer: str) -> np.ndarray:
+        """Counts per game"""
+        return self.counts[layer] / max(self.games, 1)
+
+    def save(self, path: str) -> None:
+        np.savez(path, **{"games": np.array(self.games), **self.counts})
+
+    @staticmethod
+    def load(path: str) -> "HeatmapAccumulator":
+        accumulator = HeatmapAccumulator()
+        with np.load(path) as data:
+            accumulator.games = int(data["games"])
+            for layer in LAYERS:
+                accumulator.counts[layer] = data[layer]
+        return accumulator
+
+
+def heat_color(value: float) -> str:
+    """White for 0 through to red for 1"""
+    level = round(255 * (1 - min(max(value, 0.0), 1.0)))
+    return f"rgb(255,{level},{level})"
+
+
+def heatmap_svg(
+    accumulator: HeatmapAccumulator,
+    layer: str,
+    layout: Union[BoardLayout, None] = None,
+) -> str:
+    """Draw one layer onto the board, scaled so the hottest element is red"""
+    game = Game(layout=layout, placement="empty")
+    renderer = Renderer(game, output_file=None)
+    renderer.update()
+    counts = accumulator.counts[layer]
+    scaled = counts / counts.max() if counts.max() > 0 else counts.astype(float)
+    kind = layer.removeprefix("win_")
+    if kind in ("settlements", "cities"):
+        for vertex in game.board.vertices:
+            renderer.vertex_polygons[vertex.id].set(
+                "fill", heat_color(scaled[vertex.id])
+            )
+            renderer.vertex_paths[vertex.id].set("opacity", "1")
+    elif kind == "roads":
+        for edge in game.board.edges:
+            if counts[edge.id] > 0:
+                start, end = renderer.get_edge_coordinates(edge)
+                renderer.draw_line(start, end, heat_color(scaled[edge.id]))
+    else:
+        for hex in game.board.hexes:
+            renderer.hex_polygons[hex.id].set("fill", heat_color(scaled[hex.id]))
+        renderer.robber.set("opacity", "0")
+    return renderer.to_svg()
+
+
+def write_heatmaps(
+    accumulator: HeatmapAccumulator,
+    output_dir: str = "output",
+    layout: Union[BoardLayout, None] = None,
+) -> list[str]:
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    for layer in LAYERS:
+        path = os.path.join(output_dir, f"heatmap_{layer}.svg")
+        with open(path, "w") as f:
+            f.write(heatmap_svg(accumulator, layer, layout))
+        paths.append(path)
+    accumulator.save(os.path.join(output_dir, "heatmap_counts.npz"))
+    logger.info(f"Saved {len(paths)} heatmaps of {accumulator.games} games")
+    return paths
+
+
+def collect_heatmaps(num_games: int, output_dir: str = "output") -> HeatmapAccumulator:
+    """Play games on the default board and write a heatmap per layer"""
+    accumulator = HeatmapAccumulator()
+    for i in range(num_games):
+        outcome = play_game(setup=accumulator.attach)
+        if outcome["turns"] is None:
+            logger.error(f"Game {i} failed")
+            # Games are played one at a time, so these are the failed game's
+            accumulator.robber_moves.clear()
+    # The worker keeps its game for later calls
+    accumulator.detach()
+    write_heatmaps(accumulator, output_dir)
+    return accumulator
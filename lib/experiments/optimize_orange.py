@@ -1,45 +1,53 @@
 from typing import Literal, Union
+from lib.experiments.paired import paired_evaluation
+from lib.experiments.result_cache import PARAMETER_DECIMALS, ResultCache, play_cached
 from lib.experiments.win_stats import win_stats
-from lib.gameplay import Game
 from lib.gameplay.params import DEFAULT_PARAMETERS, GameParameters
 from lib.logging.database import MongoLogger
+import functools
 import logging
 import uuid
-import optuna
-from typing import cast
+from typing import TYPE_CHECKING, cast
 
+if TYPE_CHECKING:  # pragma: no cover
+    import optuna
 
-def objective(trial: optuna.Trial) -> float:
+
+# Games each trial plays, the same seeds for every trial
+TRIAL_SEEDS = 5
+
+
+def objective(
+    trial: "optuna.Trial",
+    seed: Union[int, None] = None,
+    cache: Union[ResultCache, None] = None,
+    num_seeds: int = TRIAL_SEEDS,
+) -> float:
+    """Mean points of orange over the seeds ``seed`` to ``seed + num_seeds - 1``.
+
+    Every trial plays the same seeds and values are suggested at the precision
+    of the cache, so a point suggested again is read from the cache. Without a
+    seed a single unseeded game is played.
+    """
+    suggest = functools.partial(trial.suggest_float, step=10**-PARAMETER_DECIMALS)
     orange_params: GameParameters = {
         # Player specific parameters
-        "road_building_reward": trial.suggest_float(
-            "road_building_reward", 3.5, 4.5
-        ),  # 4,
-        "settlement_building_reward": trial.suggest_float(
+        "road_building_reward": suggest("road_building_reward", 3.5, 4.5),  # 4,
+        "settlement_building_reward": suggest(
             "settlement_building_reward", 2.7, 3.7
         ),  # 3.2,
-        "city_building_reward": trial.suggest_float(
-            "city_building_reward", 2.1, 3.1
-        ),  # 2.6,
-        "development_card_reward": trial.suggest_float(
-            "development_card_reward", 1.1, 2.1
-        ),  # 1.6,
-        "settlement_building_cost": trial.suggest_float(
-            "settlement_building_cost", 0, 0.7
-        ),  # 0.2,
-        "city_building_cost": trial.suggest_float(
-            "city_building_cost", 1.1, 2.1
-        ),  # 1.6,
-        "development_card_cost": trial.suggest_float(
-            "development_card_cost", 0.3, 1.3
-        ),  # 0.8,
-        "road_building_cost": trial.suggest_float("road_building_cost", 0, 0.9),  # 0.4,
+        "city_building_reward": suggest("city_building_reward", 2.1, 3.1),  # 2.6,
+        "development_card_reward": suggest("development_card_reward", 1.1, 2.1),  # 1.6,
+        "settlement_building_cost": suggest("settlement_building_cost", 0, 0.7),  # 0.2,
+        "city_building_cost": suggest("city_building_cost", 1.1, 2.1),  # 1.6,
+        "development_card_cost": suggest("development_card_cost", 0.3, 1.3),  # 0.8,
+        "road_building_cost": suggest("road_building_cost", 0, 0.9),  # 0.4,
         "play_development_card_cost_bias": 0,  # 0,
         "play_development_card_reward": 2,  # 2.0,
-        "road_building_when_abundant_resources": trial.suggest_float(
+        "road_building_when_abundant_resources": suggest(
             "road_building_when_abundant_resources", 0.01, 0.3
         ),  # 0.1,
-        "development_card_reward_when_abundant_resources": trial.suggest_float(
+        "development_card_reward_when_abundant_resources": suggest(
             "development_card_reward_when_abundant_resources", 0, 0.4
         ),  # 0.2,
         # Applies to all players
@@ -47,22 +55,18 @@ def objective(trial: optuna.Trial) -> float:
         "num_cards_per_resource": 36,
     }
 
-    try:
-        game = Game(
-            parameters=[
-                DEFAULT_PARAMETERS,
-                DEFAULT_PARAMETERS,
-                DEFAULT_PARAMETERS,
-                orange_params,
-            ],
-            experiment_id=trial.study.study_name,
-        )
-        game.play()
-    except Exception as _:
-        logger.error("Game failed")
-        return 0
-
-    return game.players[3].points()
+    parameters = [
+        DEFAULT_PARAMETERS,
+        DEFAULT_PARAMETERS,
+        DEFAULT_PARAMETERS,
+        orange_params,
+    ]
+    seeds = [None] if seed is None else range(seed, seed + num_seeds)
+    points = []
+    for game_seed in seeds:
+        outcome = play_cached(cache, parameters, game_seed, trial.study.study_name)
+        points.append(outcome["points"][3] if outcome["points"] else 0)
+    return sum(points) / len(points)
 
 
 logger = logging.getLogger(__name__)
@@ -72,17 +76,23 @@ logger.setLevel(logging.INFO)
 
 def optimize_orange(
     num_games: int,
-    mode: Literal["optimize", "evaluate"] = "optimize",
+    mode: Literal["optimize", "evaluate", "paired"] = "optimize",
     study_name: Union[str, None] = None,
+    seed: Union[int, None] = None,
+    cache: Union[ResultCache, None] = None,
 ) -> None:
     if mode == "optimize":
+        import optuna
+
         study_name = str(uuid.uuid4())
         study = optuna.create_study(direction="maximize", study_name=study_name)
-        study.optimize(objective, n_trials=num_games)
+        study.optimize(
+            functools.partial(objective, seed=seed, cache=cache), n_trials=num_games
+        )
         MongoLogger.log(
             "optimize_orange", {"study_name": study_name, **study.best_params}
         )
-    elif mode == "evaluate" and study_name is not None:
+    elif mode in ("evaluate", "paired") and study_name is not None:
         study = MongoLogger.get_orange_study(study_name)
         if study is None:
             logger.error(f"Study {study_name} not found")
@@ -94,6 +104,16 @@ def optimize_orange(
             "play_development_card_reward": 2,
         }
         print(study_params)
+        if mode == "paired":
+            comparison = paired_evaluation(
+                num_games,
+                cast(GameParameters, study_params),
+                seed=seed or 0,
+                cache=cache,
+                experiment_id=study_name,
+            )
+            logger.info(f"Paired evaluation of {study_name}: {comparison}")
+            return
         win_stats(
             num_games=num_games,
             parameters=[
@@ -102,4 +122,6 @@ def optimize_orange(
                 DEFAULT_PARAMETERS,
                 cast(GameParameters, study_params),
             ],
+            seed=seed,
+            cache=cache,
         )
@@ -0,0 +1,70 @@
+"""Paired evaluation of parameter sets on common random numbers.
+
+The baseline and the candidate play the same seeds, so both games of a pair
+have the same board, development card deck and dice rolls. The difference
+within a pair is then mostly due to the parameters, and far fewer games are
+needed to detect an effect than with independent games.
+"""
+
+from lib.experiments.aggregator import PairedComparison
+from lib.experiments.result_cache import ResultCache, play_cached
+from lib.gameplay.game import NUM_PLAYERS
+from lib.gameplay.params import DEFAULT_PARAMETERS, GameParameters
+from lib.logging.database import MongoLogger
+from typing import Union
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def seat_parameters(
+    parameters: GameParameters,
+    seat: int,
+    others: GameParameters = DEFAULT_PARAMETERS,
+    num_players: int = NUM_PLAYERS,
+) -> list[GameParameters]:
+    """Parameters of every seat, with ``parameters`` in one seat"""
+    return [parameters if i == seat else others for i in range(num_players)]
+
+
+def paired_evaluation(
+    num_games: int,
+    candidate: GameParameters,
+    baseline: GameParameters = DEFAULT_PARAMETERS,
+    seat: int = 3,
+    seed: int = 0,
+    cache: Union[ResultCache, None] = None,
+    confidence: float = 0.95,
+    experiment_id: Union[str, None] = None,
+) -> PairedComparison:
+    """Compare the candidate with the baseline in one seat on the same seeds.
+
+    Pair ``i`` plays seed ``seed + i`` with each parameter set.
+    """
+    comparison = PairedComparison(confidence)
+    baseline_seats = seat_parameters(baseline, seat)
+    candidate_seats = seat_parameters(candidate, seat)
+    for game_seed in range(seed, seed + num_games):
+        outcomes = [
+            play_cached(cache, parameters, game_seed, experiment_id)
+            for parameters in (baseline_seats, candidate_seats)
+        ]
+        if any(outcome["turns"] is None for outcome in outcomes):
+            logger.error(f"Pair on seed {game_seed} failed")
+            comparison.failed += 1
+            continue
+        baseline_result, candidate_result = (
+            {
+                "points": outcome["points"][seat],
+                "wins": float(outcome["winner"] == seat),
+            }
+            for outcome in outcomes
+        )
+        comparison.add(baseline_result, candidate_result)
+        logger.info(str(comparison))
+
+    MongoLogger.log(
+        "paired_evaluation",
+        {"experiment_id": experiment_id, "seat": seat, **comparison.summary()},
+    )
+    return comparison
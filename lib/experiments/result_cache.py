@@ -0,0 +1,152 @@
+"""Outcomes of finished games stored in SQLite.
+
+A game is fully determined by its parameters, its seed and the engine that
+played it, so its outcome is stored under a hash of the parameters, the seed
+and ``ENGINE_VERSION``. Experiments that play the same seeds with the same
+parameters reuse the stored outcomes instead of playing the games again.
+Parameters are rounded to ``PARAMETER_DECIMALS`` first, so a search that
+suggests nearly the same values again reads them from the cache too.
+"""
+
+from lib.gameplay.game import ENGINE_VERSION, NUM_PLAYERS
+from lib.gameplay.params import GameParameters
+from lib.worker import play_game
+from typing import Any, Union, cast
+import hashlib
+import json
+import os
+import sqlite3
+
+Outcome = dict[str, Any]
+
+PARAMETER_KEYS = sorted(GameParameters.__annotations__)
+
+PARAMETER_DECIMALS = 2
+
+
+def quantize(parameters: GameParameters) -> GameParameters:
+    """The parameters with float fields rounded to ``PARAMETER_DECIMALS``"""
+    return cast(
+        GameParameters,
+        {
+            key: round(value, PARAMETER_DECIMALS) if isinstance(value, float) else value
+            for key, value in parameters.items()
+        },
+    )
+
+
+def parameters_hash(
+    parameters: Union[GameParameters, list[GameParameters]],
+    num_players: int = NUM_PLAYERS,
+) -> str:
+    """Hash of the parameters of every seat.
+
+    Only ``GameParameters`` fields count, so key order, int or float values,
+    differences below ``PARAMETER_DECIMALS`` and extra fields such as a
+    study's ``_id`` do not change the hash.
+    """
+    if not isinstance(parameters, list):
+        parameters = [parameters] * num_players
+    canonical = json.dumps(
+        [
+            {
+                key: round(float(p[key]), PARAMETER_DECIMALS)
+                for key in PARAMETER_KEYS
+                if key in p
+            }
+            for p in parameters
+        ]
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class ResultCache:
+    def __init__(
+        self, path: str = "output/results.sqlite", engine_version: int = ENGINE_VERSION
+    ):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.engine_version = engine_version
+        self.hits = 0
+        self.misses = 0
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "parameters TEXT NOT NULL, seed INTEGER NOT NULL, "
+            "engine_version INTEGER NOT NULL, winner INTEGER, "
+            "points TEXT NOT NULL, turns INTEGER NOT NULL, "
+            "PRIMARY KEY (parameters, seed, engine_version))"
+        )
+        self.connection.commit()
+
+    def get(
+        self, parameters: Union[GameParameters, list[GameParameters]], seed: int
+    ) -> Union[Outcome, None]:
+        row = self.connection.execute(
+            "SELECT winner, points, turns FROM results "
+            "WHERE parameters = ? AND seed = ? AND engine_version = ?",
+            (parameters_hash(parameters), seed, self.engine_version),
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return {
+            "seed": seed,
+            "winner": row[0],
+            "points": json.loads(row[1]),
+            "turns": row[2],
+        }
+
+    def put(
+        self,
+        parameters: Union[GameParameters, list[GameParameters]],
+        seed: int,
+        outcome: Outcome,
+    ) -> None:
+        """Store the outcome of a finished game, failed games are not stored"""
+        if outcome["turns"] is None:
+            return
+        self.connection.execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                parameters_hash(parameters),
+                seed,
+                self.engine_version,
+                outcome["winner"],
+                json.dumps(outcome["points"]),
+                outcome["turns"],
+            ),
+        )
+        self.connection.commit()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __str__(self) -> str:
+        return f"ResultCache({self.hits} hits, {self.misses} misses)"
+
+
+def play_cached(
+    cache: Union[ResultCache, None],
+    parameters: Union[GameParameters, list[GameParameters]],
+    seed: Union[int, None],
+    experiment_id: Union[str, None] = None,
+) -> Outcome:
+    """The stored outcome of a game, playing and storing it if there is none.
+
+    Unseeded games are always played. Stored games are played with the
+    rounded parameters their outcome is stored under.
+    """
+    if cache is None or seed is None:
+        return play_game(parameters, seed, experiment_id)
+    if isinstance(parameters, list):
+        parameters = [quantize(p) for p in parameters]
+    else:
+        parameters = quantize(parameters)
+    outcome = cache.get(parameters, seed)
+    if outcome is None:
+        outcome = play_game(parameters, seed, experiment_id)
+        cache.put(parameters, seed, outcome)
+    return outcome
@@ -1,50 +1,82 @@
 from typing import Union
-from lib.gameplay import Game
-from lib.gameplay.game import COLORS
+from lib.experiments.aggregator import ResultAggregator
+from lib.experiments.result_cache import ResultCache, play_cached
+from lib.gameplay.constants import COLORS
+from lib.gameplay.game import NUM_PLAYERS
 from lib.gameplay.params import DEFAULT_PARAMETERS, GameParameters
 from lib.logging.database import MongoLogger
 from lib.visualizer import Renderer
-import matplotlib.pyplot as plt
-import matplotlib
+from lib.worker import current_game
 import logging
 import os
 import uuid
 
-matplotlib.rcParams["text.usetex"] = True
-matplotlib.rcParams["font.family"] = "serif"  # Use a serif font like in LaTeX
-
 logger = logging.getLogger(__name__)
 
 logger.setLevel(logging.INFO)
 
 
 def win_stats(
-    num_games: int, parameters: Union[list[GameParameters], None] = None
-) -> None:
+    num_games: int,
+    parameters: Union[GameParameters, list[GameParameters], None] = None,
+    target_half_width: Union[float, None] = None,
+    stop_on_difference: bool = False,
+    seed: Union[int, None] = None,
+    cache: Union[ResultCache, None] = None,
+) -> ResultAggregator:
+    """Play games and aggregate who won.
+
+    Given a seed, game ``i`` is played with seed ``seed + i - 1`` and its
+    outcome is read from and stored in the cache.
+    """
+    parameters = parameters or DEFAULT_PARAMETERS
     results: list[str] = []
-    turn_counts: list[int] = []
     experiment_id = str(uuid.uuid4())
+    aggregator = ResultAggregator(
+        COLORS[:NUM_PLAYERS],
+        target_half_width=target_half_width,
+        stop_on_difference=stop_on_difference,
+    )
     for i in range(1, num_games + 1):
-        game = Game(
-            experiment_id=experiment_id, parameters=parameters or DEFAULT_PARAMETERS
-        )
-        if i == num_games:
-            Renderer(game)
-        try:
-            game.play()
-            logger.info(f"Game {i} done: {game.winning_player} won")
-            turn_counts.append(game.turn_number)
-        except Exception as e:
-            logger.error(f"Game {i} failed: {e}")
-
-        results.append(game.winning_player.color if game.winning_player else "none")
+        game_seed = None if seed is None else seed + i - 1
+        outcome = play_cached(cache, parameters, game_seed, experiment_id)
+        if outcome["turns"] is None:
+            logger.error(f"Game {i} failed")
+            aggregator.add(None, None)
+            results.append("none")
+            continue
+
+        winner = COLORS[outcome["winner"]] if outcome["winner"] is not None else None
+        logger.info(f"Game {i} done: {winner} won")
+        aggregator.add(winner, outcome["turns"])
+        results.append(winner or "none")
         logger.info(f"=======================Game {i} Done=======================")
+        logger.info(str(aggregator))
+        if aggregator.should_stop():
+            logger.info(f"Stopping early after {i} games")
+            break
+    game = current_game()
+    if game is not None:
+        # The final board of the last game played
+        Renderer(game).flush()
+    if cache is not None:
+        logger.info(str(cache))
+    MongoLogger.log(
+        "win_stats_summary", {**aggregator.summary(), "experiment_id": experiment_id}
+    )
     plot_results(results, experiment_id)
+    return aggregator
 
 
 def plot_results(results: list[str], id: str):
+    import matplotlib
+    import matplotlib.pyplot as plt
+
+    matplotlib.rcParams["text.usetex"] = True
+    matplotlib.rcParams["font.family"] = "serif"  # Use a serif font like in LaTeX
+
     # Count the occurrences of each result
-    counts = {color: 0 for color in COLORS}
+    counts = {color: 0 for color in COLORS[:NUM_PLAYERS]}
 
     for result in results:
         if result not in counts:
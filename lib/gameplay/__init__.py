@@ -1 +1,12 @@
-from .game import Game
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .game import Game
+
+
+def __getattr__(name: str) -> Any:
+    if name == "Game":
+        from .game import Game
+
+        return Game
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,7 +2,6 @@ from lib.gameplay.params import DEFAULT_PARAMETERS, GameParameters
 from lib.gameplay.pieces import ResourceCard, DevelopmentCard, CardType
 from lib.gameplay.hex import ResourceType
 from typing import TYPE_CHECKING, Union
-import numpy as np
 import random
 
 if TYPE_CHECKING:  # pragma: no cover
@@ -33,16 +32,47 @@ class Bank:
             ResourceCard(ResourceType.ORE) for _ in range(self.num_cards_per_resource)
         ]
 
-        self.dev_cards = [DevelopmentCard(CardType.KNIGHT) for _ in range(14)] + [
+        cards = [DevelopmentCard(CardType.KNIGHT) for _ in range(14)] + [
             DevelopmentCard(CardType.VICTORY_POINT) for _ in range(5)
         ]
         if include_progress_cards:
-            self.dev_cards.extend(
+            cards.extend(
                 [DevelopmentCard(CardType.ROAD_BUILDING) for _ in range(2)]
                 + [DevelopmentCard(CardType.MONOPOLY) for _ in range(2)]
                 + [DevelopmentCard(CardType.YEAR_OF_PLENTY) for _ in range(2)]
             )
-        random.shuffle(self.dev_cards)
+        # Every development card of the game, in the order of a new deck
+        self.all_dev_cards = tuple(cards)
+        # The deck is shuffled once and drawn from the top by moving an index,
+        # cards before deck_position have already been drawn
+        self.deck: list[DevelopmentCard] = []
+        self.deck_position = 0
+        self.dev_card_counts = {type: 0 for type in CardType}
+        self.reset()
+
+    def reset(self) -> None:
+        """Shuffle a new deck holding every development card of the game"""
+        for card in self.all_dev_cards:
+            card.flipped = False
+        deck = list(self.all_dev_cards)
+        random.shuffle(deck)
+        self.dev_cards = deck
+
+    @property
+    def dev_cards(self) -> list[DevelopmentCard]:
+        """The cards left in the deck, in draw order"""
+        return self.deck[self.deck_position :]
+
+    @dev_cards.setter
+    def dev_cards(self, cards: list[DevelopmentCard]) -> None:
+        self.deck = list(cards)
+        self.deck_position = 0
+        self.dev_card_counts = {type: 0 for type in CardType}
+        for card in self.deck:
+            self.dev_card_counts[card.cardType] += 1
+
+    def num_dev_cards(self) -> int:
+        return len(self.deck) - self.deck_position
 
     def get_cards(self, *resourceType: ResourceType) -> list[ResourceCard]:
         return [self.get_card(resource) for resource in resourceType]
@@ -63,21 +93,37 @@ class Bank:
             raise ValueError(f"Bank ran out of {resourceType}")
 
     def get_dev_card(self, type: Union[CardType, None] = None) -> DevelopmentCard:
-        if type is not None:
-            # Find the next card of the passed in type
-            def is_type(card: DevelopmentCard) -> bool:
-                return card.get_type() == type
-
-            index = next((i for i, v in enumerate(self.dev_cards) if is_type(v)), None)
-            if index is None:
+        position = self.deck_position
+        if type is None:
+            if position == len(self.deck):
+                raise ValueError("No development cards in the bank")
+        else:
+            if self.dev_card_counts[type] == 0:
                 raise ValueError(f"No {type} cards in the bank")
-            return self.dev_cards.pop(index)
-        # Default to a random card
-        index = np.random.randint(0, len(self.dev_cards))
-        return self.dev_cards.pop(index)
+            # Swap the next card of the passed in type to the top of the deck
+            index = next(
+                i
+                for i in range(position, len(self.deck))
+                if self.deck[i].cardType == type
+            )
+            self.deck[position], self.deck[index] = (
+                self.deck[index],
+                self.deck[position],
+            )
+        card = self.deck[position]
+        self.deck_position = position + 1
+        self.dev_card_counts[card.cardType] -= 1
+        return card
 
     def return_dev_card(self, card: DevelopmentCard) -> None:
-        self.dev_cards.append(card)
+        """Put a card back on top of the deck, in the slot of the last card drawn"""
+        card.flipped = False
+        if self.deck_position > 0:
+            self.deck_position -= 1
+            self.deck[self.deck_position] = card
+        else:
+            self.deck.insert(0, card)
+        self.dev_card_counts[card.cardType] += 1
 
     def return_card(self, card: ResourceCard) -> None:
         if card.resourceType == ResourceType.BRICK:
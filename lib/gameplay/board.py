@@ -1,6 +1,18 @@
-from lib.gameplay.hex import Hex, ResourceType, Edge, Vertex
-from lib.gameplay.pieces import Road, PieceType, Settlement
+from lib.gameplay.constants import MAX_PLAYERS
+from lib.gameplay.hex import Hex, Edge, Vertex
+from lib.gameplay.layout import BoardLayout, DEFAULT_LAYOUT, LAYOUT_CACHE
+from lib.gameplay.pieces import City, Road, PieceType, Settlement
+from lib.gameplay.road_network import RoadNetwork
+from lib.gameplay.topology import (
+    HEX_EDGES,
+    HEX_VERTICES,
+    NUM_EDGES,
+    NUM_HEXES,
+    NUM_VERTICES,
+    VERTEX_HEXES,
+)
 from collections import deque
+import numpy as np
 
 from typing import TYPE_CHECKING, Set, Union, cast
 
@@ -9,100 +21,64 @@ if TYPE_CHECKING:  # pragma: no cover
 
 
 class Board:
-    def __init__(self):
+    def __init__(self, layout: Union[BoardLayout, None] = None):
+        self.layout = layout if layout is not None else DEFAULT_LAYOUT
+        self.tables = LAYOUT_CACHE.get(self.layout)
         self.setup_hexes()
-        self.robberLoc = 9
+        self.robberLoc = self.layout.desert
+        # Expected production each player loses per roll while the robber is
+        # on a hex, kept up to date as settlements and cities are placed
+        self.blocking = np.zeros((MAX_PLAYERS, NUM_HEXES))
+        # Road connectivity and buildable edges of each player, keyed by id
+        self.networks: dict[int, RoadNetwork] = {}
 
     def setup_hexes(self):
-        self.hexes = [Hex(i) for i in range(19)]
-        self.edges = [Edge(i) for i in range(72)]
-        self.vertices = [Vertex(i) for i in range(54)]
-
-        def get_vertices(*indices: int) -> list[Vertex]:
-            return [self.vertices[i] for i in indices]
-
-        def get_edges(*indices: int) -> list[Edge]:
-            return [self.edges[i] for i in indices]
-
-        self.hexes[0].attach_resource(ResourceType.ORE)
-        self.hexes[0].attach_value(10)
-        self.hexes[0].attach_edges(get_edges(1, 7, 12, 11, 6, 0))
-        self.hexes[0].attach_vertices(get_vertices(1, 2, 10, 9, 8, 0))
-        self.hexes[1].attach_resource(ResourceType.SHEEP)
-        self.hexes[1].attach_value(2)
-        self.hexes[1].attach_edges(get_edges(3, 8, 14, 13, 7, 2))
-        self.hexes[1].attach_vertices(get_vertices(3, 4, 12, 11, 10, 2))
-        self.hexes[2].attach_resource(ResourceType.WOOD)
-        self.hexes[2].attach_value(9)
-        self.hexes[2].attach_edges(get_edges(5, 9, 16, 15, 8, 4))
-        self.hexes[2].attach_vertices(get_vertices(5, 6, 14, 13, 12, 4))
-        self.hexes[3].attach_resource(ResourceType.WHEAT)
-        self.hexes[3].attach_value(12)
-        self.hexes[3].attach_edges(get_edges(11, 19, 25, 24, 18, 10))
-        self.hexes[3].attach_vertices(get_vertices(8, 9, 19, 18, 17, 7))
-        self.hexes[4].attach_resource(ResourceType.BRICK)
-        self.hexes[4].attach_value(6)
-        self.hexes[4].attach_edges(get_edges(13, 20, 27, 26, 19, 12))
-        self.hexes[4].attach_vertices(get_vertices(10, 11, 21, 20, 19, 9))
-        self.hexes[5].attach_resource(ResourceType.SHEEP)
-        self.hexes[5].attach_value(4)
-        self.hexes[5].attach_edges(get_edges(15, 21, 29, 28, 20, 14))
-        self.hexes[5].attach_vertices(get_vertices(12, 13, 23, 22, 21, 11))
-        self.hexes[6].attach_resource(ResourceType.BRICK)
-        self.hexes[6].attach_value(10)
-        self.hexes[6].attach_edges(get_edges(17, 22, 31, 30, 21, 16))
-        self.hexes[6].attach_vertices(get_vertices(14, 15, 25, 24, 23, 13))
-        self.hexes[7].attach_resource(ResourceType.WHEAT)
-        self.hexes[7].attach_value(9)
-        self.hexes[7].attach_edges(get_edges(24, 34, 40, 39, 33, 23))
-        self.hexes[7].attach_vertices(get_vertices(17, 18, 29, 28, 27, 16))
-        self.hexes[8].attach_resource(ResourceType.WOOD)
-        self.hexes[8].attach_value(11)
-        self.hexes[8].attach_edges(get_edges(26, 35, 42, 41, 34, 25))
-        self.hexes[8].attach_vertices(get_vertices(19, 20, 31, 30, 29, 18))
-        # self.hexes[9] is the desert
-        self.hexes[9].robber = True
-        self.hexes[9].attach_edges(get_edges(28, 36, 44, 43, 35, 27))
-        self.hexes[9].attach_vertices(get_vertices(21, 22, 33, 32, 31, 20))
-        self.hexes[10].attach_resource(ResourceType.WOOD)
-        self.hexes[10].attach_value(3)
-        self.hexes[10].attach_edges(get_edges(30, 37, 46, 45, 36, 29))
-        self.hexes[10].attach_vertices(get_vertices(23, 24, 35, 34, 33, 22))
-        self.hexes[11].attach_resource(ResourceType.ORE)
-        self.hexes[11].attach_value(8)
-        self.hexes[11].attach_edges(get_edges(32, 38, 48, 47, 37, 31))
-        self.hexes[11].attach_vertices(get_vertices(25, 26, 37, 36, 35, 24))
-        self.hexes[12].attach_resource(ResourceType.WOOD)
-        self.hexes[12].attach_value(8)
-        self.hexes[12].attach_edges(get_edges(41, 50, 55, 54, 49, 40))
-        self.hexes[12].attach_vertices(get_vertices(29, 30, 40, 39, 38, 28))
-        self.hexes[13].attach_resource(ResourceType.ORE)
-        self.hexes[13].attach_value(3)
-        self.hexes[13].attach_edges(get_edges(43, 51, 57, 56, 50, 42))
-        self.hexes[13].attach_vertices(get_vertices(31, 32, 42, 41, 40, 30))
-        self.hexes[14].attach_resource(ResourceType.WHEAT)
-        self.hexes[14].attach_value(4)
-        self.hexes[14].attach_edges(get_edges(45, 52, 59, 58, 51, 44))
-        self.hexes[14].attach_vertices(get_vertices(33, 34, 44, 43, 42, 32))
-        self.hexes[15].attach_resource(ResourceType.SHEEP)
-        self.hexes[15].attach_value(5)
-        self.hexes[15].attach_edges(get_edges(47, 53, 61, 60, 52, 46))
-        self.hexes[15].attach_vertices(get_vertices(35, 36, 46, 45, 44, 34))
-        self.hexes[16].attach_resource(ResourceType.BRICK)
-        self.hexes[16].attach_value(5)
-        self.hexes[16].attach_edges(get_edges(56, 63, 67, 66, 62, 55))
-        self.hexes[16].attach_vertices(get_vertices(40, 41, 49, 48, 47, 39))
-        self.hexes[17].attach_resource(ResourceType.WHEAT)
-        self.hexes[17].attach_value(6)
-        self.hexes[17].attach_edges(get_edges(58, 64, 69, 68, 63, 57))
-        self.hexes[17].attach_vertices(get_vertices(42, 43, 51, 50, 49, 41))
-        self.hexes[18].attach_resource(ResourceType.SHEEP)
-        self.hexes[18].attach_value(11)
-        self.hexes[18].attach_edges(get_edges(60, 65, 71, 70, 64, 59))
-        self.hexes[18].attach_vertices(get_vertices(44, 45, 53, 52, 51, 43))
+        self.hexes = [Hex(i) for i in range(NUM_HEXES)]
+        self.edges = [Edge(i) for i in range(NUM_EDGES)]
+        self.vertices = [Vertex(i) for i in range(NUM_VERTICES)]
+
+        for hex in self.hexes:
+            resource = self.layout.resources[hex.id]
+            value = self.layout.values[hex.id]
+            if resource is not None:
+                hex.attach_resource(resource)
+            if value is not None:
+                hex.attach_value(value)
+            hex.attach_edges([self.edges[i] for i in HEX_EDGES[hex.id]])
+            hex.attach_vertices([self.vertices[i] for i in HEX_VERTICES[hex.id]])
+
+        self.hexes[self.layout.desert].robber = True
+
+    def reset(self, layout: Union[BoardLayout, None] = None) -> None:
+        """Clear every piece and move the robber back to the desert.
+
+        Passing a layout swaps the resources and number tokens in place.
+        """
+        for vertex in self.vertices:
+            vertex.piece = None
+        for edge in self.edges:
+            edge.piece = None
+        if layout is not None and layout != self.layout:
+            self.layout = layout
+            self.tables = LAYOUT_CACHE.get(layout)
+            for hex in self.hexes:
+                hex.resourceType = layout.resources[hex.id]
+                hex.value = layout.values[hex.id]
+        self.hexes[self.robberLoc].robber = False
+        self.robberLoc = self.layout.desert
+        self.hexes[self.robberLoc].robber = True
+        self.blocking[:] = 0
+        for network in self.networks.values():
+            network.reset()
+
+    def network(self, player: "Player") -> RoadNetwork:
+        network = self.networks.get(player.id)
+        if network is None:
+            network = self.networks[player.id] = RoadNetwork(player.id, self)
+        return network
 
     def get_desert(self) -> Hex:
-        return self.hexes[9]
+        return self.hexes[self.layout.desert]
 
     def place_settlement(self, player: "Player", vertexLoc: int) -> None:
         """Place a settlement at a vertex location"""
@@ -114,6 +90,16 @@ class Board:
             raise ValueError("No unplaced settlements available")
         vertex.attach_piece(settlement)
         settlement.set_vertex(vertex)
+        self.add_blocking(player, vertexLoc)
+        self.update_networks_for_settlement(vertexLoc)
+
+    def attach_settlement(self, settlement: Settlement, vertexLoc: int) -> None:
+        """Put a settlement on a vertex the caller has already validated"""
+        vertex = self.vertices[vertexLoc]
+        vertex.piece = settlement
+        settlement.set_vertex(vertex)
+        self.add_blocking(settlement.player, vertexLoc)
+        self.update_networks_for_settlement(vertexLoc)
 
     def can_place_city(self, player: "Player", vertexLoc: int) -> bool:
         vertex = self.vertices[vertexLoc]
@@ -135,11 +121,32 @@ class Board:
         city = player.get_unplaced_city()
         if city is None:
             raise ValueError("No unplaced cities available")
-        settlement = vertex.piece
-        vertex.piece = None
-        cast(Settlement, settlement).set_vertex(None)
-        vertex.attach_piece(city)
+        self.attach_city(city, vertexLoc)
+
+    def attach_city(self, city: City, vertexLoc: int) -> None:
+        """Replace a settlement with a city, the caller has already validated the move"""
+        vertex = self.vertices[vertexLoc]
+        cast(Settlement, vertex.piece).set_vertex(None)
+        vertex.piece = city
         city.set_vertex(vertex)
+        # A city produces one more card than the settlement it replaces
+        self.add_blocking(city.player, vertexLoc)
+
+    def add_blocking(self, player: "Player", vertexLoc: int) -> None:
+        """Add one card of production at a vertex to the player's blocking row"""
+        likelihood = self.tables.hex_likelihood
+        for hex_id in VERTEX_HEXES[vertexLoc]:
+            self.blocking[player.id, hex_id] += likelihood[hex_id]
+
+    def robber_scores(self, player: "Player", victim: "Player") -> np.ndarray:
+        """Production of the victim blocked on each hex.
+
+        Hexes where the player would block itself and the robber's current
+        hex score zero.
+        """
+        scores = np.where(self.blocking[player.id] > 0, 0.0, self.blocking[victim.id])
+        scores[self.robberLoc] = 0.0
+        return scores
 
     def place_road(self, player: "Player", edgeLoc: int) -> None:
         """Place a road at an edge location"""
@@ -149,8 +156,21 @@ class Board:
         road = player.get_unplaced_road()
         if road is None:
             raise ValueError("No unplaced roads available")
-        edge.attach_piece(road)
+        self.attach_road(road, edgeLoc)
+
+    def attach_road(self, road: Road, edgeLoc: int) -> None:
+        """Put a road on an edge the caller has already validated"""
+        self.edges[edgeLoc].piece = road
         road.set_position(edgeLoc)
+        for network in self.networks.values():
+            if network.player_id != road.player.id:
+                network.edge_taken(edgeLoc)
+        self.network(road.player).add_road(edgeLoc)
+
+    def update_networks_for_settlement(self, vertexLoc: int) -> None:
+        """Split the networks of opponents that run through a new settlement"""
+        for network in self.networks.values():
+            network.vertex_settled(vertexLoc)
 
     def get_settlements(self) -> list[Vertex]:
         return [vertex for vertex in self.vertices if vertex.piece is not None]
@@ -383,45 +403,25 @@ class Board:
 
     def get_possible_branch_vertices(self, player: "Player") -> list[int]:
         """Return a list of possible branch vertices for a player"""
-        player_roads = [road for road in player.roads if road.position is not None]
-
-        vertices = set()
-        for road in player_roads:
-            edge = self.get_edge(road)
-            vertices = vertices.union(edge.vertices())
+        network = self.network(player)
         return [
-            v.id
-            for v in vertices
-            if (v.piece is None or v.piece.player == player)
-            and any([v.piece is None for v in v.connected_edges()])
+            v
+            for v in np.flatnonzero(network.vertex_roads).tolist()
+            if network.reaches(v)
+            and any(edge.piece is None for edge in self.vertices[v].connected_edges())
         ]
 
     def get_possible_road_locations(self, player: "Player") -> list[Edge]:
         """Return a list of possible road locations for a player"""
-        vertices = [self.vertices[v] for v in self.get_possible_branch_vertices(player)]
-        edges: Set[Edge] = set()
-        for vertex in vertices:
-            for edge in vertex.connected_edges():
-                if edge.piece is None:
-                    edges.add(edge)
-        return list(edges)
+        return [self.edges[e] for e in sorted(self.network(player).frontier)]
 
     def possible_settlement_locations(self, player: "Player") -> list[int]:
         """Return a list of possible settlement locations for a player"""
-        player_roads = [road for road in player.roads if road.position is not None]
-
-        def get_edge(road: "Road") -> Edge:
-            edgeLoc = road.position
-            if edgeLoc is None:
-                raise ValueError("Edge location is None")
-            return self.edges[edgeLoc]
-
-        vertices = set()
-        for road in player_roads:
-            edge = get_edge(road)
-            vertices = vertices.union(edge.vertices())
-
-        return [v.id for v in vertices if self.can_settle(v.id)]
+        return [
+            int(v)
+            for v in np.flatnonzero(self.network(player).vertex_roads)
+            if self.can_settle(int(v))
+        ]
 
     def move_robber(self, hexLoc: int) -> list["Player"]:
         """Move the robber to a new hex location and return a list of players who have pieces on that hex"""
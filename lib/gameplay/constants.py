@@ -0,0 +1,9 @@
+"""Player seats shared by the board and the game.
+
+Kept apart from ``lib.gameplay.game`` so lower layers such as the board can
+import them without importing the game.
+"""
+
+# One color per seat, indexed by player id
+COLORS = ["red", "blue", "white", "orange", "green", "brown"]
+MAX_PLAYERS = len(COLORS)
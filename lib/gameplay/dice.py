@@ -1,14 +1,27 @@
+from typing import Union
 import random
 
 
 class Dice:
+    """Two dice rolled from their own random number generator.
+
+    Players draw from the global generators, so games on the same seed roll
+    the same numbers whatever the players decide.
+    """
+
     def __init__(self):
         self.total = 0
         self.dice = [0, 0]
+        self.rng = random.Random()
+        self.reseed()
+
+    def reseed(self, seed: Union[int, None] = None) -> None:
+        """Seed the dice, from the global generator unless a seed is given"""
+        self.rng.seed(random.getrandbits(64) if seed is None else seed)
 
     def roll(self):
-        self.dice[0] = random.randint(1, 6)
-        self.dice[1] = random.randint(1, 6)
+        self.dice[0] = self.rng.randint(1, 6)
+        self.dice[1] = self.rng.randint(1, 6)
         self.total = self.get_sum()
         return self.dice
 
@@ -0,0 +1,87 @@
+"""Typed game events delivered only to the subscribers of each event type."""
+
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Callable, Union
+
+if TYPE_CHECKING:  # pragma: no cover
+    from lib.gameplay.player import Player
+
+
+class GameEvent(Enum):
+    START_GAME = "START_GAME"
+    ROLL_DICE = "ROLL_DICE"
+    BUILD_SETTLEMENT = "BUILD_SETTLEMENT"
+    BUILD_ROAD = "BUILD_ROAD"
+    BUILD_CITY = "BUILD_CITY"
+    BUY_DEVELOPMENT_CARD = "BUY_DEVELOPMENT_CARD"
+    PLAY_DEVELOPMENT_CARD = "PLAY_DEVELOPMENT_CARD"
+    MOVE_ROBBER = "MOVE_ROBBER"
+    TRADE = "TRADE"
+    END_TURN = "END_TURN"
+    START_TURN = "START_TURN"
+    END_GAME = "END_GAME"
+
+
+class Event:
+    """An event and its payload.
+
+    ``location`` is the vertex, edge or hex id the event happened at and
+    ``value`` holds the roll, the card or the robbed player.
+    """
+
+    __slots__ = ("type", "player", "location", "value")
+
+    def __init__(
+        self,
+        type: GameEvent,
+        player: Union["Player", None] = None,
+        location: Union[int, None] = None,
+        value: Any = None,
+    ):
+        self.type = type
+        self.player = player
+        self.location = location
+        self.value = value
+
+    def __repr__(self) -> str:
+        return f"Event({self.type.name}, {self.player}, {self.location}, {self.value})"
+
+
+Subscriber = Callable[[Event], None]
+
+
+class EventBus:
+    def __init__(self):
+        self.subscribers: dict[GameEvent, list[Subscriber]] = {}
+
+    def subscribe(self, event_type: GameEvent, callback: Subscriber) -> None:
+        self.subscribers.setdefault(event_type, []).append(callback)
+
+    def subscribe_all(self, callback: Subscriber) -> None:
+        for event_type in GameEvent:
+            self.subscribe(event_type, callback)
+
+    def unsubscribe(self, event_type: GameEvent, callback: Subscriber) -> None:
+        callbacks = self.subscribers.get(event_type, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+        if len(callbacks) == 0:
+            self.subscribers.pop(event_type, None)
+
+    def has_subscribers(self, event_type: GameEvent) -> bool:
+        return event_type in self.subscribers
+
+    def emit(
+        self,
+        event_type: GameEvent,
+        player: Union["Player", None] = None,
+        location: Union[int, None] = None,
+        value: Any = None,
+    ) -> None:
+        """Deliver an event, the payload is only built when someone subscribed"""
+        callbacks = self.subscribers.get(event_type)
+        if callbacks is None:
+            return
+        event = Event(event_type, player, location, value)
+        for callback in tuple(callbacks):
+            callback(event)
@@ -3,20 +3,30 @@ from lib.logging.database import MongoLogger
 from lib.robot.robot import Robot
 from lib.gameplay.bank import Bank
 from lib.gameplay.board import Board
+from lib.gameplay.constants import COLORS
 from lib.gameplay.hex import ResourceType
+from lib.gameplay.layout import BoardLayout
+from lib.gameplay.placement import OpeningBook, snake_draft
 from lib.gameplay.dice import Dice
+from lib.gameplay.events import Event, EventBus, GameEvent
 from lib.gameplay.params import DEFAULT_PARAMETERS, GameParameters
-from enum import Enum
-from typing import Callable, Union
+from typing import TYPE_CHECKING, Callable, Literal, Union
 import logging
+import numpy as np
+import random
 import time
 import uuid
 
+if TYPE_CHECKING:  # pragma: no cover
+    from lib.logging.replay import ReplayRecorder
+
 logger = logging.getLogger(__name__)
 
 NUM_PLAYERS = 4
 
-COLORS = ["red", "blue", "white", "orange"]
+# Bump whenever a change alters how a seeded game plays out, cached results
+# of older versions are then ignored
+ENGINE_VERSION = 2
 
 INITIAL_PLACEMENTS = {
     0: {
@@ -42,17 +52,6 @@ INITIAL_PLACEMENTS = {
 }
 
 
-class GameEvent(Enum):
-    START_GAME = "START_GAME"
-    ROLL_DICE = "ROLL_DICE"
-    BUILD_SETTLEMENT = "BUILD_SETTLEMENT"
-    BUILD_ROAD = "BUILD_ROAD"
-    BUILD_CITY = "BUILD_CITY"
-    TRADE = "TRADE"
-    END_TURN = "END_TURN"
-    START_TURN = "START_TURN"
-
-
 class Game:
     def __init__(
         self,
@@ -60,6 +59,11 @@ class Game:
         game_delay: int = 0,
         parameters: Union[GameParameters, list[GameParameters]] = DEFAULT_PARAMETERS,
         experiment_id: Union[str, None] = None,
+        layout: Union[BoardLayout, None] = None,
+        placement: Union[
+            Literal["fixed"], Literal["draft"], Literal["empty"], None
+        ] = None,
+        opening_book: Union[OpeningBook, None] = None,
     ):
         self.game_id = str(uuid.uuid4())
         self.experiment_id = experiment_id
@@ -67,9 +71,19 @@ class Game:
         self.turn_number: int = 0
         self.winning_player: Union[Player, None] = None
         self.bank = Bank(include_progress_cards=False)
-        self.board = Board()
+        self.board = Board(layout)
         self.dice = Dice()
-        self.listeners = []
+        self.events = EventBus()
+        self.recorder: Union["ReplayRecorder", None] = None
+        if placement is None:
+            # The fixed placements only exist for the default board and 4 players
+            placement = (
+                "fixed"
+                if layout is None and num_players <= len(INITIAL_PLACEMENTS)
+                else "draft"
+            )
+        self.placement = placement
+        self.opening_book = opening_book
         self.players = self.setup_players(num_players)
         self.num_players = num_players
 
@@ -84,27 +98,78 @@ class Game:
         return self.params
 
     def listen(self, callback: Callable[[GameEvent], None]) -> None:
-        self.listeners.append(callback)
+        """Call back with the type of every event, prefer ``events.subscribe``"""
+
+        def on_event(event: Event) -> None:
+            callback(event.type)
+
+        self.events.subscribe_all(on_event)
 
     def notify(self, event: GameEvent) -> None:
-        for listener in self.listeners:
-            listener(event)
+        self.events.emit(event, self.get_current_player())
 
     def setup_players(self, num_players: int) -> list[Player]:
-        players = []
-        for i in range(num_players):
-            player = Robot(i, COLORS[i], self)
-            players.append(player)
+        if num_players > len(COLORS):
+            raise ValueError(f"At most {len(COLORS)} players are supported")
+        players: list[Player] = [Robot(i, COLORS[i], self) for i in range(num_players)]
+        self.place_initial_pieces(players)
+        return players
 
-            for resource in INITIAL_PLACEMENTS[i]["resources"]:
+    def place_initial_pieces(self, players: list[Player]) -> None:
+        if self.placement == "empty":
+            return
+        if self.placement == "draft":
+            snake_draft(players, self.board, self.bank, self.opening_book)
+            return
+
+        if len(players) > len(INITIAL_PLACEMENTS):
+            raise ValueError("Fixed placements only exist for 4 players")
+        for player in players:
+            for resource in INITIAL_PLACEMENTS[player.id]["resources"]:
                 player.resources.append(self.bank.get_card(resource))
 
-            for settlement in INITIAL_PLACEMENTS[i]["settlement"]:
+            for settlement in INITIAL_PLACEMENTS[player.id]["settlement"]:
                 self.board.place_settlement(player, settlement)
 
-            for road in INITIAL_PLACEMENTS[i]["road"]:
+            for road in INITIAL_PLACEMENTS[player.id]["road"]:
                 self.board.place_road(player, road)
-        return players
+
+    def reset(
+        self,
+        seed: Union[int, None] = None,
+        parameters: Union[GameParameters, list[GameParameters], None] = None,
+        layout: Union[BoardLayout, None] = None,
+    ) -> None:
+        """Return the game to its initial state, reusing every allocated object.
+
+        Seeding reseeds the global random number generators before the
+        development cards are shuffled and the dice are seeded, so
+        ``reset(seed)`` plays out like a fresh game built right after
+        ``random.seed(seed)`` and ``np.random.seed(seed)``. The placement mode
+        is kept.
+        """
+        if seed is not None:
+            random.seed(seed)
+            np.random.seed(seed)
+        if parameters is not None:
+            self.params = parameters
+        if self.recorder is not None:
+            self.recorder.discard(self)
+        self.game_id = str(uuid.uuid4())
+        self.current_player = 0
+        self.turn_number = 0
+        self.winning_player = None
+        self.player_with_largest_army = None
+        self.player_with_longest_road = None
+        self.dice.total = 0
+        self.dice.dice = [0, 0]
+
+        for player in self.players:
+            player.reset(self.bank)
+        self.bank.reset()
+        self.dice.reseed()
+        self.board.reset(layout)
+        self.place_initial_pieces(self.players)
 
     def get_current_player(self) -> Player:
         return self.players[self.current_player]
@@ -163,7 +228,7 @@ class Game:
         self.notify(GameEvent.START_TURN)
         curr_player.pre_roll(self.board, self.bank, self.players)
         self.dice.roll()
-        self.notify(GameEvent.ROLL_DICE)
+        self.events.emit(GameEvent.ROLL_DICE, curr_player, value=self.dice.total)
         logger.info(f"Dice roll: {self.dice.total}")
 
         if self.dice.total == 7:
@@ -188,7 +253,7 @@ class Game:
                     f"{resource}: {sum(player.resource_counts()[resource] for player in self.players) + self.bank.resource_counts()[resource]}"
                 )
             logger.info(
-                f"Development cards: {len(self.bank.dev_cards) + sum(len(player.development_cards) for player in self.players)}"
+                f"Development cards: {self.bank.num_dev_cards() + sum(len(player.development_cards) for player in self.players)}"
             )
 
         if curr_player.points() >= 10:
@@ -204,13 +269,40 @@ class Game:
         self.notify(GameEvent.START_GAME)
         self.turn_number = 0
 
-        while not self.step():
+        while not self.advance():
+            pass
+        self.finish()
+
+    def advance(self) -> bool:
+        """Play one turn and count it, returns True once the game is over.
+
+        A game still going after 100 turns per player ends in a draw, won by
+        the player whose turn is next.
+        """
+        try:
+            if self.step():
+                return True
             self.turn_number += 1
             if self.turn_number == 100 * self.num_players:
                 self.winning_player = self.get_current_player()
                 logger.warning("Game ended in a draw")
+                return True
+            return False
+        except Exception:
+            if self.recorder is not None:
+                self.recorder.discard(self)
+            raise
+
+    def finish(self) -> None:
+        """Announce the winner, close the replay and log the game"""
         logger.info(f"{self.winning_player} wins in {self.turn_number} turns!")
 
+        self.events.emit(
+            GameEvent.END_GAME, self.winning_player, value=self.turn_number
+        )
+        if self.recorder is not None:
+            self.recorder.end_game(self)
+
         MongoLogger.log(
             "game_logs",
             {
@@ -1,7 +1,7 @@
 from __future__ import annotations
 from enum import Enum
 from typing import TYPE_CHECKING
-from typing import Union, Set
+from typing import Union
 
 if TYPE_CHECKING:  # pragma: no cover
     from lib.gameplay.pieces import Piece
@@ -25,28 +25,34 @@ class HexPieceType(Enum):
 
 
 class HexPiece:
+    """A vertex or edge shared by up to three hexes.
+
+    Hashing and equality use object identity: every element is unique within
+    a board, and sets of elements are hot in the path finding code.
+    """
+
+    __slots__ = ("id", "type", "hexes", "hex_locations", "piece")
+
+    max_hexes = 3
+
     def __init__(self, id: int, type: HexPieceType):
         self.id = id
         self.type = type
-        self.hexes: dict["Hex", int] = dict()
+        # Attached hexes and this element's location on each of them
+        self.hexes: tuple["Hex", ...] = ()
+        self.hex_locations: tuple[int, ...] = ()
         self.piece: Union[Piece, None] = None
-        self.max_hexes = 3 if type == HexPieceType.VERTEX else 2
-
-    def __eq__(self, value: "HexPiece") -> bool:
-        return isinstance(value, HexPiece) and self.id == value.id
 
     def __repr__(self):
         return f"{self.type} {self.id}"
 
-    def __hash__(self):
-        return self.id
-
     def get_hexes(self) -> list["Hex"]:
-        return list(self.hexes.keys())
+        return list(self.hexes)
 
     def attach_hex(self, hex: "Hex", loc: int):
         if hex not in self.hexes:
-            self.hexes[hex] = loc
+            self.hexes += (hex,)
+            self.hex_locations += (loc,)
         if len(self.hexes) > self.max_hexes:
             raise ValueError("Too many hexes")
 
@@ -57,14 +63,17 @@ class HexPiece:
 
 
 class Vertex(HexPiece):
+    __slots__ = ()
+
     def __init__(self, id: int):
         super().__init__(id, HexPieceType.VERTEX)
 
     def connected_edges(self) -> list[Edge]:
-        edges: Set[Edge] = set()
-        for index, (hex, loc) in enumerate(self.hexes.items()):
-            edges.add(hex.edges[(loc + 1) % 12])
-            edges.add(hex.edges[(loc + 11) % 12])
+        # An ordered dict rather than a set keeps the order independent of ids
+        edges: dict[Edge, None] = {}
+        for index, (hex, loc) in enumerate(zip(self.hexes, self.hex_locations)):
+            edges[hex.edges[(loc + 1) % 12]] = None
+            edges[hex.edges[(loc + 11) % 12]] = None
             if index == 1:
                 break
         return list(edges)
@@ -77,18 +86,22 @@ class Vertex(HexPiece):
 
 
 class Edge(HexPiece):
+    __slots__ = ()
+
+    max_hexes = 2
+
     def __init__(self, id: int):
         super().__init__(id, HexPieceType.EDGE)
 
     def north_neighbor(self) -> Vertex:
-        hex, hexLoc = next(iter(self.hexes.items()))
+        hex, hexLoc = self.hexes[0], self.hex_locations[0]
         if hexLoc < 6:
             return hex.vertices[hexLoc - 1]
         else:
             return hex.vertices[(hexLoc + 1) % 12]
 
     def south_neighbor(self) -> Vertex:
-        hex, hexLoc = next(iter(self.hexes.items()))
+        hex, hexLoc = self.hexes[0], self.hex_locations[0]
         if hexLoc < 6:
             return hex.vertices[hexLoc + 1]
         else:
@@ -96,13 +109,13 @@ class Edge(HexPiece):
 
     def connected_edges(self, player: Player) -> list[Edge]:
         """Return all edges connected to this edge that are owned by the player or unowned."""
-        edges: Set[Edge] = set()
+        edges: dict[Edge, None] = {}
         for vertex in self.vertices():
             if vertex.piece is not None and vertex.piece.player != player:
                 # If the vertex is not owned by the player, skip it
                 continue
             edges.update(
-                edge
+                (edge, None)
                 for edge in vertex.connected_edges()
                 if (edge.piece is None or edge.piece.player == player) and edge != self
             )
@@ -131,8 +144,25 @@ class Edge(HexPiece):
 VERTEX_LOCATIONS = [0, 2, 4, 6, 8, 10]
 EDGE_LOCATIONS = [1, 3, 5, 7, 9, 11]
 
+# Approximate probability of rolling each value with two dice
+VALUE_LIKELIHOODS = {
+    2: 0.03,
+    3: 0.06,
+    4: 0.08,
+    5: 0.11,
+    6: 0.14,
+    7: 0.17,
+    8: 0.14,
+    9: 0.11,
+    10: 0.08,
+    11: 0.06,
+    12: 0.03,
+}
+
 
 class Hex:
+    __slots__ = ("edges", "vertices", "id", "resourceType", "value", "robber")
+
     def __init__(self, id: int):
         self.edges: dict[int, Edge] = {}
         self.vertices: dict[int, Vertex] = {}
@@ -141,15 +171,9 @@ class Hex:
         self.value = None
         self.robber = False
 
-    def __hash__(self):
-        return self.id
-
     def __repr__(self):
         return f"Hex {self.id}"
 
-    def __eq__(self, value: "Hex") -> bool:
-        return isinstance(value, Hex) and self.id == value.id
-
     def attach_resource(self, resourceType: ResourceType):
         if self.resourceType is not None:
             raise ValueError("Resource already attached")
@@ -163,19 +187,9 @@ class Hex:
     def likelihood(self) -> float:
         if self.value is None:
             return 0
-        if self.value in [2, 12]:
-            return 0.03
-        if self.value in [3, 11]:
-            return 0.06
-        if self.value in [4, 10]:
-            return 0.08
-        if self.value in [5, 9]:
-            return 0.11
-        if self.value in [6, 8]:
-            return 0.14
-        if self.value == 7:
-            return 0.17
-        raise ValueError("Invalid value")
+        if self.value not in VALUE_LIKELIHOODS:
+            raise ValueError("Invalid value")
+        return VALUE_LIKELIHOODS[self.value]
 
     def attach_edges(self, edges: list[Edge]):
         if len(edges) != 6:
@@ -0,0 +1,178 @@
+from collections import OrderedDict
+from lib.gameplay.hex import ResourceType, VALUE_LIKELIHOODS
+from lib.gameplay.topology import (
+    HEX_NEIGHBORS,
+    HEX_VERTICES,
+    NUM_HEXES,
+    NUM_VERTICES,
+)
+from typing import Sequence, Union
+import hashlib
+import numpy as np
+import random
+
+RESOURCE_TILES: list[Union[ResourceType, None]] = (
+    [ResourceType.WOOD] * 4
+    + [ResourceType.BRICK] * 3
+    + [ResourceType.SHEEP] * 4
+    + [ResourceType.WHEAT] * 4
+    + [ResourceType.ORE] * 3
+    + [None]
+)
+
+NUMBER_TOKENS = [2, 3, 3, 4, 4, 5, 5, 6, 6, 8, 8, 9, 9, 10, 10, 11, 11, 12]
+
+# Number of dice combinations that roll each value
+PIPS = {value: 6 - abs(7 - value) for value in range(2, 13)}
+
+# Column of each resource in the per-resource tables
+RESOURCE_INDEX = {resource: i for i, resource in enumerate(ResourceType)}
+
+
+class BoardLayout:
+    """Resource and number token assignment for each of the 19 hexes"""
+
+    def __init__(
+        self,
+        resources: Sequence[Union[ResourceType, None]],
+        values: Sequence[Union[int, None]],
+    ):
+        if len(resources) != NUM_HEXES or len(values) != NUM_HEXES:
+            raise ValueError(f"Layout must describe {NUM_HEXES} hexes")
+        deserts = [i for i, resource in enumerate(resources) if resource is None]
+        if len(deserts) != 1:
+            raise ValueError("Layout must have exactly one desert")
+        if values[deserts[0]] is not None:
+            raise ValueError("Desert cannot have a value")
+        self.resources = tuple(resources)
+        self.values = tuple(values)
+        self.desert = deserts[0]
+        self.key = hashlib.sha1(repr(self).encode()).hexdigest()
+
+    def __repr__(self):
+        return f"BoardLayout({list(self.resources)}, {list(self.values)})"
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __eq__(self, value: object) -> bool:
+        return isinstance(value, BoardLayout) and self.key == value.key
+
+
+DEFAULT_LAYOUT = BoardLayout(
+    [
+        ResourceType.ORE,
+        ResourceType.SHEEP,
+        ResourceType.WOOD,
+        ResourceType.WHEAT,
+        ResourceType.BRICK,
+        ResourceType.SHEEP,
+        ResourceType.BRICK,
+        ResourceType.WHEAT,
+        ResourceType.WOOD,
+        None,
+        ResourceType.WOOD,
+        ResourceType.ORE,
+        ResourceType.WOOD,
+        ResourceType.ORE,
+        ResourceType.WHEAT,
+        ResourceType.SHEEP,
+        ResourceType.BRICK,
+        ResourceType.WHEAT,
+        ResourceType.SHEEP,
+    ],
+    [10, 2, 9, 12, 6, 4, 10, 9, 11, None, 3, 8, 8, 3, 4, 5, 5, 6, 11],
+)
+
+
+def has_adjacent_red_numbers(values: Sequence[Union[int, None]]) -> bool:
+    """Check if two 6s or 8s are on neighboring hexes"""
+    for hex_id, value in enumerate(values):
+        if value not in (6, 8):
+            continue
+        if any(values[n] in (6, 8) for n in HEX_NEIGHBORS[hex_id]):
+            return True
+    return False
+
+
+def generate_layout(seed: Union[int, None] = None) -> BoardLayout:
+    """Generate a random layout using the standard tiles and number tokens.
+
+    The desert never gets a number token and 6s and 8s are never adjacent.
+    The same seed always produces the same layout.
+    """
+    rng = random.Random(seed)
+    resources = list(RESOURCE_TILES)
+    rng.shuffle(resources)
+    desert = resources.index(None)
+
+    tokens = list(NUMBER_TOKENS)
+    while True:
+        rng.shuffle(tokens)
+        values: list[Union[int, None]] = list(tokens)
+        values.insert(desert, None)
+        if not has_adjacent_red_numbers(values):
+            return BoardLayout(resources, values)
+
+
+class LayoutTables:
+    """Tables derived from a layout that do not change during a game"""
+
+    def __init__(self, layout: BoardLayout):
+        self.layout = layout
+
+        # Likelihood and pips of each hex producing on a roll
+        self.hex_likelihood = np.zeros(NUM_HEXES)
+        self.hex_pips = np.zeros(NUM_HEXES, dtype=np.int8)
+        # Hexes producing for each dice value
+        self.dice_index: dict[int, tuple[int, ...]] = {
+            value: () for value in range(2, 13)
+        }
+        for hex_id, value in enumerate(layout.values):
+            if value is None:
+                continue
+            self.hex_likelihood[hex_id] = VALUE_LIKELIHOODS[value]
+            self.hex_pips[hex_id] = PIPS[value]
+            self.dice_index[value] += (hex_id,)
+
+        # Expected production of a settlement at each vertex, per resource
+        self.vertex_production = np.zeros((NUM_VERTICES, len(ResourceType)))
+        self.vertex_pips = np.zeros(NUM_VERTICES, dtype=np.int16)
+        for hex_id, vertices in enumerate(HEX_VERTICES):
+            resource = layout.resources[hex_id]
+            if resource is None:
+                continue
+            for vertex in vertices:
+                self.vertex_production[vertex, RESOURCE_INDEX[resource]] += (
+                    self.hex_likelihood[hex_id]
+                )
+                self.vertex_pips[vertex] += self.hex_pips[hex_id]
+
+
+class LayoutCache:
+    """Keeps the derived tables of recently used layouts"""
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self.tables: OrderedDict[str, LayoutTables] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.tables)
+
+    def get(self, layout: BoardLayout) -> LayoutTables:
+        tables = self.tables.get(layout.key)
+        if tables is not None:
+            self.tables.move_to_end(layout.key)
+            return tables
+
+        tables = LayoutTables(layout)
+        self.tables[layout.key] = tables
+        if len(self.tables) > self.max_size:
+            self.tables.popitem(last=False)
+        return tables
+
+    def clear(self) -> None:
+        self.tables.clear()
+
+
+LAYOUT_CACHE = LayoutCache()
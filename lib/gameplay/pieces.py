@@ -18,6 +18,8 @@ class PieceType(Enum):
 
 
 class Piece:
+    __slots__ = ("type", "player", "position", "id")
+
     count = 0
 
     def __init__(
@@ -40,20 +42,23 @@ class Piece:
 
 
 class Settlement(Piece):
-    vertex: Union[Vertex, None] = None
+    __slots__ = ("vertex",)
 
     def __init__(self, player: Player, position: Union[int, None] = None):
         super().__init__(PieceType.SETTLEMENT, player, position)
+        self.vertex: Union[Vertex, None] = None
 
     def set_vertex(self, vertex: Union[Vertex, None]) -> None:
+        points = self.get_points()
         if vertex is not None:
             self.position = vertex.id
         else:
             self.position = None
         self.vertex = vertex
+        self.player.victory_points += self.get_points() - points
 
     def get_resources(self) -> list[ResourceType]:
-        hexes = list(self.vertex.hexes if self.vertex is not None else [])
+        hexes = self.vertex.hexes if self.vertex is not None else ()
         return [hex.resourceType for hex in hexes if hex.resourceType is not None]
 
     def get_points(self) -> int:
@@ -63,17 +68,20 @@ class Settlement(Piece):
 
 
 class City(Piece):
-    vertex: Union[Vertex, None] = None
+    __slots__ = ("vertex",)
 
     def __init__(self, player: Player, position: Union[int, None] = None):
         super().__init__(PieceType.CITY, player, position)
+        self.vertex: Union[Vertex, None] = None
 
     def set_vertex(self, vertex: Union[Vertex, None]) -> None:
+        points = self.get_points()
         if vertex is not None:
             self.position = vertex.id
         else:
             self.position = None
         self.vertex = vertex
+        self.player.victory_points += self.get_points() - points
 
     def get_points(self) -> int:
         if self.position is None:
@@ -82,6 +90,8 @@ class City(Piece):
 
 
 class Road(Piece):
+    __slots__ = ()
+
     def __init__(self, player: Player, position: Union[int, None] = None):
         super().__init__(PieceType.ROAD, player, position)
 
@@ -118,6 +128,8 @@ class CardType(Enum):
 
 
 class DevelopmentCard:
+    __slots__ = ("cardType", "flipped")
+
     def __init__(self, cardType: CardType):
         self.cardType = cardType
         self.flipped = False
@@ -138,6 +150,8 @@ class DevelopmentCard:
 
 
 class ResourceCard:
+    __slots__ = ("resourceType",)
+
     def __init__(self, resourceType: ResourceType):
         self.resourceType = resourceType
 
@@ -0,0 +1,150 @@
+from collections import OrderedDict
+from lib.gameplay.layout import LayoutTables
+from typing import TYPE_CHECKING, Callable, Union
+import json
+import logging
+import numpy as np
+
+if TYPE_CHECKING:  # pragma: no cover
+    from lib.gameplay.bank import Bank
+    from lib.gameplay.board import Board
+    from lib.gameplay.player import Player
+
+logger = logging.getLogger(__name__)
+
+# Scores every vertex of a layout, higher is better
+VertexScorer = Callable[[LayoutTables], np.ndarray]
+
+
+def production_score(tables: LayoutTables) -> np.ndarray:
+    """Expected production of a vertex with a small bonus for each distinct resource"""
+    production = tables.vertex_production
+    diversity = (production > 0).sum(axis=1)
+    return production.sum(axis=1) + 0.02 * diversity
+
+
+class OpeningBook:
+    """Vertex rankings of recently used layouts, so repeated boards skip scoring"""
+
+    def __init__(self, scorer: VertexScorer = production_score, max_size: int = 1024):
+        self.scorer = scorer
+        self.max_size = max_size
+        self.rankings: OrderedDict[str, tuple[np.ndarray, np.ndarray]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.rankings)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.rankings
+
+    def ranking(self, tables: LayoutTables) -> tuple[np.ndarray, np.ndarray]:
+        """Return the vertex scores and the vertices sorted from best to worst"""
+        key = tables.layout.key
+        entry = self.rankings.get(key)
+        if entry is not None:
+            self.rankings.move_to_end(key)
+            return entry
+
+        scores = self.scorer(tables)
+        order = np.argsort(-scores, kind="stable")
+        entry = (scores, order)
+        self.add(key, entry)
+        return entry
+
+    def add(self, key: str, entry: tuple[np.ndarray, np.ndarray]) -> None:
+        self.rankings[key] = entry
+        if len(self.rankings) > self.max_size:
+            self.rankings.popitem(last=False)
+
+    def precompute(self, tables: list[LayoutTables]) -> None:
+        for table in tables:
+            self.ranking(table)
+
+    def save(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump(
+                {
+                    key: {"scores": scores.tolist(), "order": order.tolist()}
+                    for key, (scores, order) in self.rankings.items()
+                },
+                f,
+            )
+
+    @staticmethod
+    def load(
+        path: str, scorer: VertexScorer = production_score, max_size: int = 1024
+    ) -> "OpeningBook":
+        book = OpeningBook(scorer, max_size)
+        with open(path) as f:
+            for key, entry in json.load(f).items():
+                book.add(
+                    key,
+                    (
+                        np.array(entry["scores"]),
+                        np.array(entry["order"], dtype=np.intp),
+                    ),
+                )
+        return book
+
+
+OPENING_BOOK = OpeningBook()
+
+
+def pick_settlement(board: "Board", order: np.ndarray) -> int:
+    for vertexLoc in order:
+        if board.can_settle(int(vertexLoc)):
+            return int(vertexLoc)
+    raise ValueError("No settlement locations left")  # pragma: no cover
+
+
+def pick_road(board: "Board", vertexLoc: int, scores: np.ndarray) -> int:
+    """Pick the free edge at a vertex leading towards the best vertex"""
+    vertex = board.vertices[vertexLoc]
+    best_edge, best_score = None, -1.0
+    for edge in vertex.connected_edges():
+        if edge.piece is not None:
+            continue
+        other = next(v for v in edge.vertices() if v != vertex)
+        score = max(
+            (
+                scores[v.id]
+                for e in other.connected_edges()
+                for v in e.vertices()
+                if v != other and v.piece is None and board.can_settle(v.id)
+            ),
+            default=0.0,
+        )
+        if best_edge is None or score > best_score or (
+            score == best_score and edge.id < best_edge
+        ):
+            best_edge, best_score = edge.id, score
+    if best_edge is None:
+        raise ValueError("No road locations left")  # pragma: no cover
+    return best_edge
+
+
+def snake_draft(
+    players: list["Player"],
+    board: "Board",
+    bank: "Bank",
+    book: Union[OpeningBook, None] = None,
+) -> None:
+    """Place two settlements and two roads per player in snake order.
+
+    Each player takes the best free vertex from the opening book ranking and
+    receives one card for every resource next to their second settlement.
+    """
+    book = book if book is not None else OPENING_BOOK
+    scores, order = book.ranking(board.tables)
+
+    for draft_round, draft in enumerate([players, list(reversed(players))]):
+        for player in draft:
+            vertexLoc = pick_settlement(board, order)
+            board.place_settlement(player, vertexLoc)
+            board.place_road(player, pick_road(board, vertexLoc, scores))
+            logger.info(f"{player} placed initial settlement at {vertexLoc}")
+
+            if draft_round == 1:
+                for hex in board.vertices[vertexLoc].get_hexes():
+                    if hex.resourceType is not None:
+                        player.resources.append(bank.get_card(hex.resourceType))
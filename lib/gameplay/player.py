@@ -8,10 +8,21 @@ from lib.gameplay.pieces import (
 )
 from lib.gameplay.bank import Bank
 from lib.gameplay.board import Board
-from functools import reduce
+from lib.gameplay.events import GameEvent
 from lib.gameplay.hex import Hex
 from lib.gameplay.pieces import PieceType
-from typing import Union, Literal, TYPE_CHECKING
+from lib.gameplay.purchase import (
+    MAX_COST,
+    Hand,
+    Purchase,
+    PurchaseResult,
+    can_afford,
+    cost_vector,
+    hand_vector,
+    payment_plan,
+    purchase_plan,
+)
+from typing import Union, Literal, TYPE_CHECKING, cast
 from lib.gameplay.hex import ResourceType
 import logging
 import random
@@ -25,26 +36,13 @@ logger = logging.getLogger(__name__)
 def has_resources_or_can_trade(
     player: "Player", resources: list[ResourceType], bank: Bank
 ) -> bool:
-    resource_counts = player.resource_counts().copy()
-
-    needed_trades = []
-    for resource in resources:
-        if resource_counts[resource] > 0:
-            resource_counts[resource] -= 1
-        else:
-            needed_trades.append(resource)
-
-    for _ in needed_trades:
-        trade_found = False
-        for have_resource, count in resource_counts.items():
-            if count >= bank.exchange_rate:
-                resource_counts[have_resource] -= bank.exchange_rate
-                trade_found = True
-                break
-        if not trade_found:
-            return False
-
-    return True
+    cost = cost_vector(resources)
+    hand = hand_vector(
+        (card.resourceType for card in player.resources),
+        bank.exchange_rate,
+        max(MAX_COST, sum(cost)),
+    )
+    return payment_plan(hand, bank.exchange_rate, cost) is not None
 
 
 class Player:
@@ -58,6 +56,9 @@ class Player:
         self.roads: list[Road] = []
         self.resources: list[ResourceCard] = []
         self.development_cards: list[DevelopmentCard] = []
+        # Maintained as pieces are placed and cards are given or played
+        self.victory_points = 0
+        self.knights_played = 0
 
         self.setup_pieces()
 
@@ -75,33 +76,40 @@ class Player:
         self.settlements = [Settlement(self) for _ in range(5)]
         self.roads = [Road(self) for _ in range(15)]
 
+    def reset(self, bank: Bank) -> None:
+        """Return every card to the bank and take every piece off the board"""
+        bank.return_cards(self.resources)
+        self.resources.clear()
+        for card in self.development_cards:
+            bank.return_dev_card(card)
+            self.victory_points -= card.get_points()
+        self.development_cards.clear()
+        self.knights_played = 0
+        for settlement in self.settlements:
+            settlement.set_vertex(None)
+        for city in self.cities:
+            city.set_vertex(None)
+        for road in self.roads:
+            road.position = None
+
     def longest_contiguous_road(self, board: Board) -> int:
         return board.longest_road(self)
 
     def largest_army_size(self) -> int:
-        return len(
-            [
-                card
-                for card in self.development_cards
-                if card.cardType == CardType.KNIGHT and card.flipped
-            ]
-        )
+        return self.knights_played
 
     def points(self) -> int:
-        playerWithLongestRoad = self.game.player_with_longest_road
-        playerWithLargestArmy = self.game.player_with_largest_army
         return (
-            reduce(lambda acc, curr: acc + curr.get_points(), self.cities, 0)
-            + reduce(lambda acc, curr: acc + curr.get_points(), self.settlements, 0)
-            + reduce(
-                lambda acc, curr: acc + curr.get_points(), self.development_cards, 0
-            )
-            + (2 if playerWithLongestRoad == self else 0)
-            + (2 if playerWithLargestArmy == self else 0)
+            self.victory_points
+            + (2 if self.game.player_with_longest_road is self else 0)
+            + (2 if self.game.player_with_largest_army is self else 0)
         )
 
     def give_development_card(self, card: DevelopmentCard) -> None:
         self.development_cards.append(card)
+        self.victory_points += card.get_points()
+        if card.flipped and card.cardType == CardType.KNIGHT:
+            self.knights_played += 1
 
     def get_active_settlements(self) -> list[Settlement]:
         return [
@@ -181,59 +189,49 @@ class Player:
     def take_resources_from_player(
         self, resources: list["ResourceType"]
     ) -> list[ResourceCard]:
-        cards: list[ResourceCard] = []
-        resource_counts = self.resource_counts().copy()
-        needed_resources = []
-
-        # First handle exact matches
-        for type in resources:
-            if resource_counts[type] > 0:
-                # Find and take the actual card
-                cards.append(self.pop_resource(type))
-                resource_counts[type] -= 1
-            else:
-                needed_resources.append(type)
-
-        # Then handle remaining resources through trades
+        """Take the cards for a cost, trading with the bank for missing resources"""
         exchange_rate = self.game.bank.exchange_rate
-        if len(needed_resources) > 0:
-            for needed_resource in needed_resources:
-                # TODO: sort by importance
-                for have_resource, count in resource_counts.items():
-                    if count >= exchange_rate:
-                        logger.info(
-                            f"{self} attempting to finish transaction with {exchange_rate} {have_resource} for {needed_resource}"
-                        )
-                        # Execute the trade
-                        trade_cards = []
-                        for i, card in enumerate(self.resources):
-                            if card.resourceType == have_resource:
-                                trade_cards.append(self.resources.pop(i))
-                                if len(trade_cards) == exchange_rate:
-                                    break
-                        cards.extend(trade_cards)
-                        break
-                else:  # No trade was possible
-                    # Return all collected cards and raise error
-                    self.resources.extend(cards)
-                    raise ValueError(
-                        f"Player does not have required resources and cannot trade for them. Needed {needed_resource}"
-                    )
-        return cards
+        cost = cost_vector(resources)
+        plan = payment_plan(self.hand(max(MAX_COST, sum(cost))), exchange_rate, cost)
+        if plan is None:
+            raise ValueError(
+                f"Player does not have required resources and cannot trade for them. Needed {resources}"
+            )
+        if plan != cost:
+            logger.info(
+                f"{self} trading {exchange_rate}:1 with the bank for {resources}"
+            )
+        return self.remove_resources(plan)
+
+    def remove_resources(self, counts: Hand) -> list[ResourceCard]:
+        """Remove the first cards of each resource from the hand in a single pass"""
+        remaining = list(counts)
+        kept: list[ResourceCard] = []
+        taken: list[ResourceCard] = []
+        for card in self.resources:
+            i = card.resourceType.value - 1
+            if remaining[i] > 0:
+                remaining[i] -= 1
+                taken.append(card)
+            else:
+                kept.append(card)
+        self.resources[:] = kept
+        return taken
 
     def give_resource_to_player(self, card: ResourceCard) -> None:
         self.resources.append(card)
 
-    def get_settled_hexes(self) -> set[Hex]:
+    def get_settled_hexes(self) -> list[Hex]:
         settlements = self.get_active_settlements() + self.get_active_cities()
 
-        settled_hexes = set()
+        settled_hexes: set[Hex] = set()
 
         for settlement in settlements:
             if settlement.vertex is not None:
-                settled_hexes.update(settlement.vertex.get_hexes())
+                settled_hexes.update(settlement.vertex.hexes)
 
-        return settled_hexes
+        # Sorted so ties are broken the same way however pieces were placed
+        return sorted(settled_hexes, key=lambda hex: hex.id)
 
     def resource_counts(self) -> dict[ResourceType, int]:
         counts = {resource: 0 for resource in ResourceType}
@@ -244,13 +242,15 @@ class Player:
     def resource_abundance(self) -> dict[ResourceType, float]:
         counts = {resource: 0.0 for resource in ResourceType}
         for settlement in self.get_active_settlements():
-            for hex in list(
-                settlement.vertex.hexes if settlement.vertex is not None else []
-            ):
+            if settlement.vertex is None:
+                continue
+            for hex in settlement.vertex.hexes:
                 if hex.resourceType is not None:
                     counts[hex.resourceType] += 1 * hex.likelihood()
         for city in self.get_active_cities():
-            for hex in list(city.vertex.hexes if city.vertex is not None else []):
+            if city.vertex is None:
+                continue
+            for hex in city.vertex.hexes:
                 if hex.resourceType is not None:
                     counts[hex.resourceType] += 2 * hex.likelihood()
 
@@ -288,50 +288,104 @@ class Player:
         ) / 3
         return purchase_power
 
+    def hand(self, cap: int = MAX_COST) -> Hand:
+        return hand_vector(
+            (card.resourceType for card in self.resources),
+            self.game.bank.exchange_rate,
+            cap,
+        )
+
+    def can_afford(self, purchase: Purchase) -> bool:
+        """Whether the hand pays for a purchase, trading with the bank if needed"""
+        return can_afford(self.hand(), self.game.bank.exchange_rate, purchase)
+
     def can_build_settlement(self) -> bool:
-        return self.unplaced_settlement_count() > 0 and has_resources_or_can_trade(
-            self,
-            [
-                ResourceType.BRICK,
-                ResourceType.WOOD,
-                ResourceType.WHEAT,
-                ResourceType.SHEEP,
-            ],
-            self.game.bank,
+        return self.unplaced_settlement_count() > 0 and self.can_afford(
+            Purchase.SETTLEMENT
         )
 
     def can_build_settlement_at_vertex(self, vertexLoc: int, board: "Board") -> bool:
-        return (
-            self.can_build_settlement()
-            and board.vertices[vertexLoc].player_is_connected(self)
-            and board.can_settle(vertexLoc)
-        )
+        return self.can_purchase(Purchase.SETTLEMENT, vertexLoc)
 
     def can_build_city(self) -> bool:
-        return self.unplaced_city_count() > 0 and has_resources_or_can_trade(
-            self,
-            [
-                ResourceType.ORE,
-                ResourceType.ORE,
-                ResourceType.ORE,
-                ResourceType.WHEAT,
-                ResourceType.WHEAT,
-            ],
-            self.game.bank,
-        )
+        return self.unplaced_city_count() > 0 and self.can_afford(Purchase.CITY)
 
     def can_build_city_at_vertex(self, vertexLoc: int, board: "Board") -> bool:
-        return self.can_build_city() and board.can_place_city(self, vertexLoc)
+        return self.can_purchase(Purchase.CITY, vertexLoc)
 
     def can_build_road(self) -> bool:
-        return self.unplaced_road_count() > 0 and has_resources_or_can_trade(
-            self,
-            [ResourceType.BRICK, ResourceType.WOOD],
-            self.game.bank,
-        )
+        return self.unplaced_road_count() > 0 and self.can_afford(Purchase.ROAD)
 
     def can_build_road_at_edge(self, edgeLoc: int, board: "Board") -> bool:
-        return self.can_build_road() and board.edges[edgeLoc].player_is_connected(self)
+        return self.can_purchase(Purchase.ROAD, edgeLoc)
+
+    def plan_purchase(
+        self, item: Purchase, location: Union[int, None] = None
+    ) -> tuple[PurchaseResult, Union[Hand, None]]:
+        """Check a purchase and return the cards to pay for it when it is allowed"""
+        board = self.game.board
+        if item == Purchase.ROAD:
+            if self.get_unplaced_road() is None:
+                return PurchaseResult.NO_PIECES, None
+        elif item == Purchase.SETTLEMENT:
+            if self.get_unplaced_settlement() is None:
+                return PurchaseResult.NO_PIECES, None
+        elif item == Purchase.CITY:
+            if self.get_unplaced_city() is None:
+                return PurchaseResult.NO_PIECES, None
+        elif self.game.bank.num_dev_cards() == 0:
+            return PurchaseResult.NO_CARDS, None
+
+        plan = purchase_plan(self.hand(), self.game.bank.exchange_rate, item)
+        if plan is None:
+            return PurchaseResult.CANNOT_AFFORD, None
+
+        if item == Purchase.DEVELOPMENT_CARD:
+            return PurchaseResult.SUCCESS, plan
+        if location is None:
+            return PurchaseResult.INVALID_LOCATION, None
+        if item == Purchase.ROAD:
+            valid = location in board.network(self).frontier
+        elif item == Purchase.SETTLEMENT:
+            connected = board.network(self).vertex_roads[location] > 0
+            valid = bool(connected) and board.can_settle(location)
+        else:
+            valid = board.can_place_city(self, location)
+        if not valid:
+            return PurchaseResult.INVALID_LOCATION, None
+        return PurchaseResult.SUCCESS, plan
+
+    def can_purchase(self, item: Purchase, location: Union[int, None] = None) -> bool:
+        return self.plan_purchase(item, location)[0] == PurchaseResult.SUCCESS
+
+    def purchase(
+        self, item: Purchase, location: Union[int, None] = None
+    ) -> PurchaseResult:
+        """Validate, pay for and place a purchase in one pass.
+
+        Nothing changes unless the result is ``PurchaseResult.SUCCESS``.
+        """
+        result, plan = self.plan_purchase(item, location)
+        if plan is None or result != PurchaseResult.SUCCESS:
+            return result
+        board, bank, events = self.game.board, self.game.bank, self.game.events
+        bank.return_cards(self.remove_resources(plan))
+        if item == Purchase.ROAD:
+            board.attach_road(cast(Road, self.get_unplaced_road()), cast(int, location))
+            events.emit(GameEvent.BUILD_ROAD, self, location)
+        elif item == Purchase.SETTLEMENT:
+            board.attach_settlement(
+                cast(Settlement, self.get_unplaced_settlement()), cast(int, location)
+            )
+            events.emit(GameEvent.BUILD_SETTLEMENT, self, location)
+        elif item == Purchase.CITY:
+            board.attach_city(cast(City, self.get_unplaced_city()), cast(int, location))
+            events.emit(GameEvent.BUILD_CITY, self, location)
+        else:
+            card = bank.get_dev_card()
+            self.give_development_card(card)
+            events.emit(GameEvent.BUY_DEVELOPMENT_CARD, self, value=card)
+        return result
 
     def pop_least_valuable_resource(self) -> Union[ResourceCard, None]:
         if len(self.resources) == 0:
@@ -356,35 +410,20 @@ class Player:
                 else:
                     raise ValueError("No cards to split")
 
-    def play_development_card(self, card: DevelopmentCard):
-        pass
+    def play_development_card(self, card: DevelopmentCard) -> None:
+        if card.flipped:
+            raise ValueError("Development card already played")
+        card.flip()
+        if card.cardType == CardType.KNIGHT:
+            self.knights_played += 1
+        self.game.events.emit(GameEvent.PLAY_DEVELOPMENT_CARD, self, value=card)
 
     def trade_bank(self, offer: list[ResourceType], request: ResourceType, bank: Bank):
         bank.return_cards(self.take_resources_from_player(offer))
         self.resources.append(bank.get_card(request))
 
-    def build_settlement(self, board: Board, vertexLoc: int, bank: Bank):
-        bank.purchase_settlement(self)
-        board.place_settlement(self, vertexLoc)
-
-    def build_city(self, board: Board, vertexLoc: int, bank: Bank):
-        bank.purchase_city(self)
-        board.place_city(self, vertexLoc)
-
-    def build_road(self, board: Board, edgeLoc: int, bank: Bank):
-        bank.purchase_road(self)
-        board.place_road(self, edgeLoc)
-
-    def buy_development_card(self, bank: Bank):
-        self.development_cards.append(bank.purchase_dev_card(self))
-
     def can_buy_development_card(self) -> bool:
-        resource_counts = self.resource_counts()
-        return (
-            resource_counts[ResourceType.ORE] >= 1
-            and resource_counts[ResourceType.WHEAT] >= 1
-            and resource_counts[ResourceType.SHEEP] >= 1
-        )
+        return self.can_purchase(Purchase.DEVELOPMENT_CARD)
 
     def get_hex_and_player_to_rob(
         self, board: Board, bank: Bank
@@ -405,12 +444,19 @@ class Player:
         if len(self.resources) == 0:
             return None
 
+        # Map the random index onto the hand counts so the stolen resource
+        # does not depend on the order cards were received in
         card_index = random.randrange(len(self.resources))
-        return self.resources.pop(card_index)
+        for resource, count in self.resource_counts().items():
+            if card_index < count:
+                return self.pop_resource(resource)
+            card_index -= count
+        return None  # pragma: no cover
 
     def move_robber(self, board: Board, bank: Bank) -> None:
         hex, player_to_rob = self.get_hex_and_player_to_rob(board, bank)
         board.move_robber(hex.id)
+        self.game.events.emit(GameEvent.MOVE_ROBBER, self, hex.id, player_to_rob)
 
         if player_to_rob is not None:
             card = player_to_rob.rob()
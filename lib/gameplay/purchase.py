@@ -0,0 +1,124 @@
+"""Cached affordability checks and payment plans for a hand of resources.
+
+A hand is a tuple with the number of cards of each resource in
+``ResourceType`` order. Hands are capped before lookup, so the caches stay
+small however many cards a player holds.
+"""
+
+from enum import Enum
+from functools import lru_cache
+from lib.gameplay.hex import ResourceType
+from typing import Iterable, Union
+
+NUM_RESOURCES = len(ResourceType)
+
+Hand = tuple[int, ...]
+
+
+class Purchase(Enum):
+    ROAD = 1
+    SETTLEMENT = 2
+    CITY = 3
+    DEVELOPMENT_CARD = 4
+
+
+class PurchaseResult(Enum):
+    SUCCESS = 0
+    CANNOT_AFFORD = 1
+    NO_PIECES = 2
+    NO_CARDS = 3
+    INVALID_LOCATION = 4
+
+
+def cost_vector(resources: Iterable[ResourceType]) -> Hand:
+    counts = [0] * NUM_RESOURCES
+    for resource in resources:
+        counts[resource.value - 1] += 1
+    return tuple(counts)
+
+
+COSTS: dict[Purchase, Hand] = {
+    Purchase.ROAD: cost_vector([ResourceType.BRICK, ResourceType.WOOD]),
+    Purchase.SETTLEMENT: cost_vector(
+        [
+            ResourceType.BRICK,
+            ResourceType.WOOD,
+            ResourceType.WHEAT,
+            ResourceType.SHEEP,
+        ]
+    ),
+    Purchase.CITY: cost_vector(
+        [
+            ResourceType.WHEAT,
+            ResourceType.WHEAT,
+            ResourceType.ORE,
+            ResourceType.ORE,
+            ResourceType.ORE,
+        ]
+    ),
+    Purchase.DEVELOPMENT_CARD: cost_vector(
+        [ResourceType.WHEAT, ResourceType.SHEEP, ResourceType.ORE]
+    ),
+}
+
+MAX_COST = max(sum(cost) for cost in COSTS.values())
+
+# Paid for with the exact resources, never with trades with the bank
+EXACT_PAYMENT = {Purchase.DEVELOPMENT_CARD}
+
+
+def hand_vector(
+    resources: Iterable[ResourceType], exchange_rate: int, cap: int = MAX_COST
+) -> Hand:
+    """Count a hand, capped at the most cards a payment of ``cap`` cards can use"""
+    limit = cap * (exchange_rate + 1)
+    counts = [0] * NUM_RESOURCES
+    for resource in resources:
+        counts[resource.value - 1] += 1
+    return tuple(min(count, limit) for count in counts)
+
+
+@lru_cache(maxsize=None)
+def payment_plan(hand: Hand, exchange_rate: int, cost: Hand) -> Union[Hand, None]:
+    """Cards of each resource to give up for a cost, or None if unaffordable.
+
+    Missing resources are bought from the bank with the first resource that
+    has ``exchange_rate`` spare cards. Every trade costs the same, so this
+    finds a plan whenever one exists.
+    """
+    spare = [have - need for have, need in zip(hand, cost)]
+    pay = [min(have, need) for have, need in zip(hand, cost)]
+    missing = sum(-count for count in spare if count < 0)
+    for _ in range(missing):
+        for i, count in enumerate(spare):
+            if count >= exchange_rate:
+                spare[i] -= exchange_rate
+                pay[i] += exchange_rate
+                break
+        else:
+            return None
+    return tuple(pay)
+
+
+def purchase_plan(
+    hand: Hand, exchange_rate: int, purchase: Purchase
+) -> Union[Hand, None]:
+    """Cards of each resource to give up for a purchase, or None if unaffordable"""
+    cost = COSTS[purchase]
+    if purchase in EXACT_PAYMENT:
+        return cost if all(have >= need for have, need in zip(hand, cost)) else None
+    return payment_plan(hand, exchange_rate, cost)
+
+
+@lru_cache(maxsize=None)
+def affordable(hand: Hand, exchange_rate: int) -> int:
+    """Bitmask of the purchases a hand can pay for, keyed by ``Purchase`` value"""
+    mask = 0
+    for purchase in COSTS:
+        if purchase_plan(hand, exchange_rate, purchase) is not None:
+            mask |= 1 << purchase.value
+    return mask
+
+
+def can_afford(hand: Hand, exchange_rate: int, purchase: Purchase) -> bool:
+    return bool(affordable(hand, exchange_rate) & (1 << purchase.value))
@@ -0,0 +1,109 @@
+"""Incremental road connectivity for one player.
+
+Roads are grouped into networks with a disjoint-set over edge ids, where two
+roads join when they share a vertex that no opponent has settled. The
+frontier holds the empty edges the player may build a road on, and is
+updated on every placement instead of being recomputed per candidate edge.
+"""
+
+from lib.gameplay.topology import EDGE_VERTICES, NUM_EDGES, NUM_VERTICES, VERTEX_EDGES
+from typing import TYPE_CHECKING
+import numpy as np
+
+if TYPE_CHECKING:  # pragma: no cover
+    from lib.gameplay.board import Board
+
+
+class RoadNetwork:
+    def __init__(self, player_id: int, board: "Board"):
+        self.player_id = player_id
+        self.board = board
+        self.parent = list(range(NUM_EDGES))
+        self.roads: list[int] = []
+        # Number of the player's roads ending at each vertex
+        self.vertex_roads = np.zeros(NUM_VERTICES, dtype=np.int8)
+        # Empty edges the player can build a road on
+        self.frontier: set[int] = set()
+
+    def reset(self) -> None:
+        self.parent = list(range(NUM_EDGES))
+        self.roads.clear()
+        self.vertex_roads[:] = 0
+        self.frontier.clear()
+
+    def find(self, edge: int) -> int:
+        parent = self.parent
+        while parent[edge] != edge:
+            parent[edge] = parent[parent[edge]]
+            edge = parent[edge]
+        return edge
+
+    def union(self, a: int, b: int) -> None:
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            self.parent[root_b] = root_a
+
+    def connected(self, a: int, b: int) -> bool:
+        """Whether two of the player's roads belong to the same network"""
+        return self.find(a) == self.find(b)
+
+    def networks(self) -> list[list[int]]:
+        groups: dict[int, list[int]] = {}
+        for road in self.roads:
+            groups.setdefault(self.find(road), []).append(road)
+        return list(groups.values())
+
+    def blocked(self, vertex: int) -> bool:
+        """Whether an opponent has settled the vertex"""
+        piece = self.board.vertices[vertex].piece
+        return piece is not None and piece.player.id != self.player_id
+
+    def reaches(self, vertex: int) -> bool:
+        """Whether a road may be extended from the vertex"""
+        return self.vertex_roads[vertex] > 0 and not self.blocked(vertex)
+
+    def is_buildable(self, edge: int) -> bool:
+        if self.board.edges[edge].piece is not None:
+            return False
+        return any(self.reaches(vertex) for vertex in EDGE_VERTICES[edge])
+
+    def add_road(self, edge: int) -> None:
+        self.roads.append(edge)
+        self.frontier.discard(edge)
+        for vertex in EDGE_VERTICES[edge]:
+            self.vertex_roads[vertex] += 1
+            if self.blocked(vertex):
+                continue
+            for other in VERTEX_EDGES[vertex]:
+                if other == edge:
+                    continue
+                piece = self.board.edges[other].piece
+                if piece is None:
+                    self.frontier.add(other)
+                elif piece.player.id == self.player_id:
+                    self.union(edge, other)
+
+    def edge_taken(self, edge: int) -> None:
+        """An opponent built on an edge"""
+        self.frontier.discard(edge)
+
+    def vertex_settled(self, vertex: int) -> None:
+        """A settlement was placed on a vertex"""
+        if self.vertex_roads[vertex] == 0 or not self.blocked(vertex):
+            return
+        # An opponent settlement splits the networks meeting at the vertex
+        for edge in VERTEX_EDGES[vertex]:
+            if edge in self.frontier and not self.is_buildable(edge):
+                self.frontier.discard(edge)
+        self.rebuild_networks()
+
+    def rebuild_networks(self) -> None:
+        self.parent = list(range(NUM_EDGES))
+        roads = set(self.roads)
+        for edge in self.roads:
+            for vertex in EDGE_VERTICES[edge]:
+                if self.blocked(vertex):
+                    continue
+                for other in VERTEX_EDGES[vertex]:
+                    if other != edge and other in roads:
+                        self.union(edge, other)
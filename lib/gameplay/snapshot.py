@@ -0,0 +1,312 @@
+"""Fixed-width binary snapshots of a game.
+
+A snapshot is a single record of ``SNAPSHOT_DTYPE``. Records have the same
+size, so many of them can be appended to one file and read back with
+``np.memmap`` without loading the whole file.
+"""
+
+from lib.gameplay.events import Event, GameEvent
+from lib.gameplay.constants import MAX_PLAYERS
+from lib.gameplay.game import Game
+from lib.gameplay.hex import ResourceType
+from lib.gameplay.layout import BoardLayout
+from lib.gameplay.params import DEFAULT_PARAMETERS, GameParameters
+from lib.gameplay.pieces import CardType, PieceType
+from lib.gameplay.player import Player
+from lib.gameplay.topology import NUM_EDGES, NUM_HEXES, NUM_VERTICES
+from typing import Callable, Iterable, Union, cast
+import numpy as np
+import os
+import random
+
+SNAPSHOT_MAGIC = b"CTAN"
+SNAPSHOT_VERSION = 2
+
+MAX_DEV_CARDS = 25
+NUM_RESOURCES = len(ResourceType)
+
+SNAPSHOT_DTYPE = np.dtype(
+    [
+        ("magic", "S4"),
+        ("version", "u1"),
+        ("num_players", "u1"),
+        ("turn_number", "<u2"),
+        ("current_player", "u1"),
+        ("winning_player", "i1"),
+        ("longest_road", "i1"),
+        ("largest_army", "i1"),
+        ("robber", "u1"),
+        ("dice", "u1", 2),
+        # Resource type value per hex, 0 for the desert
+        ("resources", "u1", NUM_HEXES),
+        # Number token per hex, 0 for the desert
+        ("values", "u1", NUM_HEXES),
+        # Owning player id, -1 when empty
+        ("vertex_owner", "i1", NUM_VERTICES),
+        ("vertex_city", "u1", NUM_VERTICES),
+        ("edge_owner", "i1", NUM_EDGES),
+        ("hands", "u1", (MAX_PLAYERS, NUM_RESOURCES)),
+        # Card type value per card, negative when flipped, 0 when unused
+        ("dev_cards", "i1", (MAX_PLAYERS, MAX_DEV_CARDS)),
+        # Card type values of the bank deck in draw order, 0 when unused
+        ("deck", "u1", MAX_DEV_CARDS),
+        ("deck_size", "u1"),
+        ("python_rng", "<u4", 625),
+        ("dice_rng", "<u4", 625),
+        ("numpy_rng", "<u4", 624),
+        ("numpy_rng_pos", "<u2"),
+        ("numpy_has_gauss", "u1"),
+        ("numpy_gauss", "<f8"),
+    ]
+)
+
+RESOURCE_TYPES = {resource.value: resource for resource in ResourceType}
+
+
+def snapshot(game: Game) -> np.ndarray:
+    """Capture the full state of a game as a single record"""
+    if game.num_players > MAX_PLAYERS:
+        raise ValueError(f"Snapshots support at most {MAX_PLAYERS} players")
+
+    record = np.zeros((), dtype=SNAPSHOT_DTYPE)
+    record["magic"] = SNAPSHOT_MAGIC
+    record["version"] = SNAPSHOT_VERSION
+    record["num_players"] = game.num_players
+    record["turn_number"] = game.turn_number
+    record["current_player"] = game.current_player
+
+    def player_id(player: Union[Player, None]) -> int:
+        return -1 if player is None else player.id
+
+    record["winning_player"] = player_id(game.winning_player)
+    record["longest_road"] = player_id(game.player_with_longest_road)
+    record["largest_army"] = player_id(game.player_with_largest_army)
+
+    board = game.board
+    record["robber"] = board.robberLoc
+    record["dice"] = game.dice.dice
+    record["resources"] = [
+        0 if resource is None else resource.value for resource in board.layout.resources
+    ]
+    record["values"] = [0 if value is None else value for value in board.layout.values]
+
+    record["vertex_owner"] = -1
+    for vertex in board.vertices:
+        if vertex.piece is not None:
+            record["vertex_owner"][vertex.id] = vertex.piece.player.id
+            record["vertex_city"][vertex.id] = vertex.piece.type == PieceType.CITY
+    record["edge_owner"] = -1
+    for edge in board.edges:
+        if edge.piece is not None:
+            record["edge_owner"][edge.id] = edge.piece.player.id
+
+    for player in game.players:
+        counts = player.resource_counts()
+        record["hands"][player.id] = [counts[resource] for resource in ResourceType]
+        for i, card in enumerate(player.development_cards):
+            value = card.cardType.value
+            record["dev_cards"][player.id, i] = -value if card.flipped else value
+
+    deck = game.bank.dev_cards
+    record["deck"][: len(deck)] = [card.cardType.value for card in deck]
+    record["deck_size"] = len(deck)
+
+    _, python_state, _ = random.getstate()
+    record["python_rng"] = python_state
+    _, dice_state, _ = game.dice.rng.getstate()
+    record["dice_rng"] = dice_state
+    _, keys, pos, has_gauss, gauss = cast(tuple, np.random.get_state())
+    record["numpy_rng"] = keys
+    record["numpy_rng_pos"] = pos
+    record["numpy_has_gauss"] = has_gauss
+    record["numpy_gauss"] = gauss
+    return record
+
+
+def to_bytes(game: Game) -> bytes:
+    return snapshot(game).tobytes()
+
+
+def from_bytes(data: bytes) -> np.ndarray:
+    if len(data) != SNAPSHOT_DTYPE.itemsize:
+        raise ValueError("Invalid snapshot size")
+    return np.frombuffer(data, dtype=SNAPSHOT_DTYPE)[0]
+
+
+def restore(
+    record: Union[np.ndarray, np.void, bytes],
+    parameters: Union[GameParameters, list[GameParameters]] = DEFAULT_PARAMETERS,
+    experiment_id: Union[str, None] = None,
+) -> Game:
+    """Build a game from a snapshot, including the dice and global generators"""
+    if isinstance(record, bytes):
+        record = from_bytes(record)
+    if record["magic"] != SNAPSHOT_MAGIC:
+        raise ValueError("Not a game snapshot")
+    if record["version"] != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version {record['version']}")
+
+    layout = BoardLayout(
+        [RESOURCE_TYPES.get(int(r)) for r in record["resources"]],
+        [None if v == 0 else int(v) for v in record["values"]],
+    )
+    game = Game(
+        num_players=int(record["num_players"]),
+        parameters=parameters,
+        experiment_id=experiment_id,
+        layout=layout,
+        placement="empty",
+    )
+    board, bank, players = game.board, game.bank, game.players
+
+    for vertexLoc, owner in enumerate(record["vertex_owner"]):
+        if owner >= 0:
+            board.place_settlement(players[owner], vertexLoc)
+            if record["vertex_city"][vertexLoc]:
+                board.place_city(players[owner], vertexLoc)
+    for edgeLoc, owner in enumerate(record["edge_owner"]):
+        if owner >= 0:
+            board.place_road(players[owner], edgeLoc)
+    board.move_robber(int(record["robber"]))
+
+    for player in players:
+        for resource, count in zip(ResourceType, record["hands"][player.id]):
+            for _ in range(count):
+                player.resources.append(bank.get_card(resource))
+        for value in record["dev_cards"][player.id]:
+            if value == 0:
+                continue
+            card = bank.get_dev_card(CardType(abs(int(value))))
+            if value < 0:
+                card.flip()
+            player.give_development_card(card)
+
+    deck = [
+        bank.get_dev_card(CardType(int(value)))
+        for value in record["deck"][: record["deck_size"]]
+    ]
+    bank.dev_cards = deck
+
+    def player_by_id(id: int) -> Union[Player, None]:
+        return None if id < 0 else players[id]
+
+    game.turn_number = int(record["turn_number"])
+    game.current_player = int(record["current_player"])
+    game.winning_player = player_by_id(int(record["winning_player"]))
+    game.player_with_longest_road = player_by_id(int(record["longest_road"]))
+    game.player_with_largest_army = player_by_id(int(record["largest_army"]))
+    game.dice.dice = [int(d) for d in record["dice"]]
+    game.dice.total = game.dice.get_sum()
+
+    random.setstate((3, tuple(int(x) for x in record["python_rng"]), None))
+    game.dice.rng.setstate((3, tuple(int(x) for x in record["dice_rng"]), None))
+    np.random.set_state(
+        (
+            "MT19937",
+            np.array(record["numpy_rng"], dtype=np.uint32),
+            int(record["numpy_rng_pos"]),
+            int(record["numpy_has_gauss"]),
+            float(record["numpy_gauss"]),
+        )
+    )
+    return game
+
+
+def apply_board_diff(
+    game: Game,
+    previous: Union[np.ndarray, np.void],
+    record: Union[np.ndarray, np.void],
+) -> bool:
+    """Place the pieces added between two snapshots on the board of a game.
+
+    Only the board is updated. Returns False, leaving the game untouched, when
+    ``record`` does not follow ``previous`` by adding pieces, e.g. when it is
+    the first record of the next game in a file.
+    """
+    if (
+        record["num_players"] != previous["num_players"]
+        or not np.array_equal(record["resources"], previous["resources"])
+        or not np.array_equal(record["values"], previous["values"])
+    ):
+        return False
+    new_vertices = record["vertex_owner"] != previous["vertex_owner"]
+    new_cities = record["vertex_city"] != previous["vertex_city"]
+    new_edges = record["edge_owner"] != previous["edge_owner"]
+    if (
+        (previous["vertex_owner"][new_vertices] >= 0).any()
+        or (previous["vertex_city"][new_cities] > 0).any()
+        or (previous["edge_owner"][new_edges] >= 0).any()
+    ):
+        return False
+
+    board, players = game.board, game.players
+    for vertexLoc in np.flatnonzero(new_vertices).tolist():
+        board.place_settlement(
+            players[int(record["vertex_owner"][vertexLoc])], vertexLoc
+        )
+    for vertexLoc in np.flatnonzero(new_cities).tolist():
+        board.place_city(players[int(record["vertex_owner"][vertexLoc])], vertexLoc)
+    for edgeLoc in np.flatnonzero(new_edges).tolist():
+        board.place_road(players[int(record["edge_owner"][edgeLoc])], edgeLoc)
+    if record["robber"] != board.robberLoc:
+        board.move_robber(int(record["robber"]))
+    return True
+
+
+def write_snapshots(
+    path: str, records: Iterable[Union[np.ndarray, np.void, bytes]]
+) -> int:
+    """Append snapshots to a file and return the number of records written"""
+    count = 0
+    with open(path, "ab") as f:
+        for record in records:
+            data = record if isinstance(record, bytes) else record.tobytes()
+            if len(data) != SNAPSHOT_DTYPE.itemsize:
+                raise ValueError("Invalid snapshot size")
+            f.write(data)
+            count += 1
+    return count
+
+
+def read_snapshots(path: str) -> np.ndarray:
+    """Memory map a snapshot file, ignoring a partially written last record"""
+    num_records = os.path.getsize(path) // SNAPSHOT_DTYPE.itemsize
+    if num_records == 0:
+        return np.zeros(0, dtype=SNAPSHOT_DTYPE)
+    return np.memmap(path, dtype=SNAPSHOT_DTYPE, mode="r", shape=(num_records,))
+
+
+def record_turns(game: Game, path: str) -> Callable[[], None]:
+    """Append a snapshot after setup and after every turn once the game ends.
+
+    The last record is taken after the winner is known. Every game played is
+    recorded, including games reused through ``Game.reset``, until the
+    returned function is called.
+    """
+    records = [snapshot(game)]
+
+    def on_start_game(event: Event) -> None:
+        # The setup of a reset game, dropping any turns of an abandoned game
+        records[:] = [snapshot(game)]
+
+    def on_end_turn(event: Event) -> None:
+        records.append(snapshot(game))
+
+    def on_end_game(event: Event) -> None:
+        records[-1] = snapshot(game)
+        write_snapshots(path, records)
+        records.clear()
+
+    subscriptions = [
+        (GameEvent.START_GAME, on_start_game),
+        (GameEvent.END_TURN, on_end_turn),
+        (GameEvent.END_GAME, on_end_game),
+    ]
+    for event_type, callback in subscriptions:
+        game.events.subscribe(event_type, callback)
+
+    def stop() -> None:
+        for event_type, callback in subscriptions:
+            game.events.unsubscribe(event_type, callback)
+
+    return stop
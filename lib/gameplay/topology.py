@@ -0,0 +1,106 @@
+"""Static wiring of the standard 19 hex board.
+
+Hexes are numbered row by row (3, 4, 5, 4, 3). Each entry lists the edges and
+vertices of a hex clockwise, starting from the top right edge / top vertex.
+"""
+
+NUM_HEXES = 19
+NUM_EDGES = 72
+NUM_VERTICES = 54
+
+HEX_EDGES: tuple[tuple[int, ...], ...] = (
+    (1, 7, 12, 11, 6, 0),
+    (3, 8, 14, 13, 7, 2),
+    (5, 9, 16, 15, 8, 4),
+    (11, 19, 25, 24, 18, 10),
+    (13, 20, 27, 26, 19, 12),
+    (15, 21, 29, 28, 20, 14),
+    (17, 22, 31, 30, 21, 16),
+    (24, 34, 40, 39, 33, 23),
+    (26, 35, 42, 41, 34, 25),
+    (28, 36, 44, 43, 35, 27),
+    (30, 37, 46, 45, 36, 29),
+    (32, 38, 48, 47, 37, 31),
+    (41, 50, 55, 54, 49, 40),
+    (43, 51, 57, 56, 50, 42),
+    (45, 52, 59, 58, 51, 44),
+    (47, 53, 61, 60, 52, 46),
+    (56, 63, 67, 66, 62, 55),
+    (58, 64, 69, 68, 63, 57),
+    (60, 65, 71, 70, 64, 59),
+)
+
+HEX_VERTICES: tuple[tuple[int, ...], ...] = (
+    (1, 2, 10, 9, 8, 0),
+    (3, 4, 12, 11, 10, 2),
+    (5, 6, 14, 13, 12, 4),
+    (8, 9, 19, 18, 17, 7),
+    (10, 11, 21, 20, 19, 9),
+    (12, 13, 23, 22, 21, 11),
+    (14, 15, 25, 24, 23, 13),
+    (17, 18, 29, 28, 27, 16),
+    (19, 20, 31, 30, 29, 18),
+    (21, 22, 33, 32, 31, 20),
+    (23, 24, 35, 34, 33, 22),
+    (25, 26, 37, 36, 35, 24),
+    (29, 30, 40, 39, 38, 28),
+    (31, 32, 42, 41, 40, 30),
+    (33, 34, 44, 43, 42, 32),
+    (35, 36, 46, 45, 44, 34),
+    (40, 41, 49, 48, 47, 39),
+    (42, 43, 51, 50, 49, 41),
+    (44, 45, 53, 52, 51, 43),
+)
+
+
+def _vertex_hexes() -> tuple[tuple[int, ...], ...]:
+    vertex_hexes: list[list[int]] = [[] for _ in range(NUM_VERTICES)]
+    for hex_id, vertices in enumerate(HEX_VERTICES):
+        for vertex in vertices:
+            vertex_hexes[vertex].append(hex_id)
+    return tuple(tuple(hexes) for hexes in vertex_hexes)
+
+
+def _edge_vertices() -> tuple[tuple[int, int], ...]:
+    # Edge i of a hex joins its vertices i and i + 1
+    edge_vertices: dict[int, tuple[int, int]] = {}
+    for edges, vertices in zip(HEX_EDGES, HEX_VERTICES):
+        for i, edge in enumerate(edges):
+            edge_vertices[edge] = (vertices[i], vertices[(i + 1) % 6])
+    return tuple(edge_vertices[edge] for edge in range(NUM_EDGES))
+
+
+def _vertex_edges() -> tuple[tuple[int, ...], ...]:
+    vertex_edges: list[list[int]] = [[] for _ in range(NUM_VERTICES)]
+    for edge, vertices in enumerate(EDGE_VERTICES):
+        for vertex in vertices:
+            vertex_edges[vertex].append(edge)
+    return tuple(tuple(edges) for edges in vertex_edges)
+
+
+def _hex_neighbors() -> tuple[tuple[int, ...], ...]:
+    edge_hexes: list[list[int]] = [[] for _ in range(NUM_EDGES)]
+    for hex_id, edges in enumerate(HEX_EDGES):
+        for edge in edges:
+            edge_hexes[edge].append(hex_id)
+
+    neighbors: list[set[int]] = [set() for _ in range(NUM_HEXES)]
+    for hexes in edge_hexes:
+        if len(hexes) == 2:
+            a, b = hexes
+            neighbors[a].add(b)
+            neighbors[b].add(a)
+    return tuple(tuple(sorted(n)) for n in neighbors)
+
+
+# Hexes touching each vertex (1 to 3 entries)
+VERTEX_HEXES = _vertex_hexes()
+
+# Hexes sharing an edge with each hex
+HEX_NEIGHBORS = _hex_neighbors()
+
+# The two vertices at the ends of each edge
+EDGE_VERTICES = _edge_vertices()
+
+# Edges meeting at each vertex (2 or 3 entries)
+VERTEX_EDGES = _vertex_edges()
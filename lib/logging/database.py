@@ -1,48 +1,210 @@
+import hashlib
+import json
 import logging
-import pymongo
+import os
 from datetime import datetime
-from typing import Dict, Any, Union
+from typing import TYPE_CHECKING, Dict, Any, Union
+
+if TYPE_CHECKING:  # pragma: no cover
+    import pymongo
+    from pymongo.database import Database
 
 logger = logging.getLogger(__name__)
 
+DUPLICATE_KEY = 11000
+
+# Indexes backing the aggregation pipelines in lib.logging.queries
+INDEXES: dict[str, list[list[str]]] = {
+    "action_logs": [
+        ["game_id"],
+        ["experiment_id", "action", "turn_number"],
+        ["action", "turn_number"],
+    ],
+    "game_logs": [["game_id"], ["experiment_id"]],
+}
+
 
 class MongoLogger:
     _instance = None
     _client = None
     _db = None
+    _spool = None
+    _spool_path: Union[str, None] = None
+    _disabled = False
 
     @classmethod
     def initialize(
         cls,
         connection_string: str = "mongodb://localhost:27017/",
         db_name: str = "catan",
+        timeout_ms: int = 1000,
+        spool_path: str = "output/mongo_spool.jsonl",
     ) -> "MongoLogger":
+        """Connect to MongoDB, or spool logs to a local file if it is unreachable.
+
+        The server is pinged once with a short timeout so a missing server
+        does not block every later insert on server selection.
+        """
         if not cls._instance:
             cls._instance = cls()
             try:
-                cls._client = pymongo.MongoClient(connection_string)
-                cls._db = cls._client[db_name]
+                client = cls.connect(connection_string, timeout_ms)
+                cls._client = client
+                cls._db = client[db_name]
+                cls.create_indexes(cls._db)
                 logger.info("MongoDB connection established")
             except Exception as e:
-                logger.error(f"Could not connect to MongoDB: {e}")
+                logger.warning(
+                    f"Could not connect to MongoDB, spooling logs to {spool_path}: {e}"
+                )
                 cls._client = None
                 cls._db = None
+                cls.open_spool(spool_path)
         return cls._instance
 
+    @staticmethod
+    def connect(connection_string: str, timeout_ms: int) -> "pymongo.MongoClient":
+        """A client whose server answered a ping within ``timeout_ms``"""
+        import pymongo
+
+        client: "pymongo.MongoClient" = pymongo.MongoClient(
+            connection_string, serverSelectionTimeoutMS=timeout_ms
+        )
+        client.admin.command("ping")
+        return client
+
+    @staticmethod
+    def create_indexes(db: "Database") -> None:
+        """Create the indexes the stats queries rely on, existing ones are kept"""
+        for collection_name, indexes in INDEXES.items():
+            for fields in indexes:
+                db[collection_name].create_index([(field, 1) for field in fields])
+
+    @classmethod
+    def disable(cls) -> None:
+        """Drop all logs, for simulation-only workers that never read them"""
+        cls._disabled = True
+
+    @classmethod
+    def open_spool(cls, spool_path: str) -> None:
+        directory = os.path.dirname(spool_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        cls._spool_path = spool_path
+        cls._spool = open(spool_path, "a")
+
     @classmethod
     def log(cls, collection_name: str, data: Dict[str, Any]) -> None:
+        if cls._disabled:
+            return
+        timestamp = datetime.now()
         if cls._db is None:
+            if cls._spool is not None:
+                cls.spool(collection_name, timestamp, data)
+                return
             logger.error(f"MongoDB not connected. Falling back to logging only: {data}")
             return
 
         try:
             collection = cls._db[collection_name]
-            log_entry = {"timestamp": datetime.now(), **data}
+            log_entry = {"timestamp": timestamp, **data}
 
             collection.insert_one(log_entry)
 
         except Exception as e:
-            logger.error(f"Failed to log to MongoDB: {e}")
+            # Avoid waiting on server selection again for every later log
+            logger.error(f"Failed to log to MongoDB, switching to local spool: {e}")
+            cls._db = None
+            cls.open_spool(cls._spool_path or "output/mongo_spool.jsonl")
+            cls.spool(collection_name, timestamp, data)
+
+    @classmethod
+    def spool(
+        cls, collection_name: str, timestamp: datetime, data: Dict[str, Any]
+    ) -> None:
+        if cls._spool is None:  # pragma: no cover
+            return
+        cls._spool.write(
+            json.dumps(
+                {
+                    "collection": collection_name,
+                    "timestamp": timestamp.isoformat(),
+                    "data": data,
+                },
+                default=str,
+            )
+            + "\n"
+        )
+        cls._spool.flush()
+
+    @classmethod
+    def replay_spool(
+        cls,
+        spool_path: str = "output/mongo_spool.jsonl",
+        connection_string: str = "mongodb://localhost:27017/",
+        db_name: str = "catan",
+        batch_size: int = 1000,
+        timeout_ms: int = 1000,
+    ) -> int:
+        """Insert spooled logs into MongoDB and remove the spool file.
+
+        Each log is inserted with a hash of its spool line as ``_id``, so
+        replaying again after a failure skips the logs already inserted.
+        """
+        if not os.path.exists(spool_path):
+            return 0
+        try:
+            client = cls.connect(connection_string, timeout_ms)
+        except Exception as e:
+            logger.error(f"Could not connect to MongoDB, keeping {spool_path}: {e}")
+            return 0
+        from pymongo.errors import BulkWriteError
+
+        db = client[db_name]
+        cls.create_indexes(db)
+        batches: dict[str, list[dict[str, Any]]] = {}
+        count = 0
+
+        def flush(collection_name: str) -> None:
+            if batches.get(collection_name):
+                try:
+                    db[collection_name].insert_many(
+                        batches[collection_name], ordered=False
+                    )
+                except BulkWriteError as e:
+                    # Only logs inserted by an earlier, interrupted replay
+                    if any(
+                        error["code"] != DUPLICATE_KEY
+                        for error in e.details["writeErrors"]
+                    ):
+                        raise
+                batches[collection_name] = []
+
+        with open(spool_path) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                collection_name = entry["collection"]
+                batches.setdefault(collection_name, []).append(
+                    {
+                        "_id": hashlib.sha1(line.strip().encode()).hexdigest(),
+                        "timestamp": datetime.fromisoformat(entry["timestamp"]),
+                        **entry["data"],
+                    }
+                )
+                count += 1
+                if len(batches[collection_name]) >= batch_size:
+                    flush(collection_name)
+        for collection_name in list(batches):
+            flush(collection_name)
+
+        if cls._spool is not None and cls._spool_path == spool_path:
+            cls._spool.close()
+            cls._spool = None
+        os.remove(spool_path)
+        logger.info(f"Replayed {count} spooled logs into MongoDB")
+        return count
 
     @classmethod
     def get_orange_study(cls, study_name: str) -> Union[dict[str, Any], None]:
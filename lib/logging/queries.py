@@ -0,0 +1,113 @@
+"""Aggregation pipelines over the MongoDB logs.
+
+Grouping and sorting run inside the database on the indexes created by
+``MongoLogger.create_indexes``, so only the aggregated rows are sent back.
+Results are read in batches rather than loaded into a list.
+"""
+
+from lib.robot.action_type import ActionType
+from typing import TYPE_CHECKING, Any, Iterator, Union
+
+if TYPE_CHECKING:  # pragma: no cover
+    from pymongo.database import Database
+
+Pipeline = list[dict[str, Any]]
+
+
+def match_actions(
+    action: Union[str, None] = None, experiment_id: Union[str, None] = None
+) -> dict[str, Any]:
+    """A ``$match`` stage using the leading fields of the action_logs indexes.
+
+    Without an action or experiment the stage is empty and matches every record.
+    """
+    match: dict[str, Any] = {}
+    if experiment_id is not None:
+        match["experiment_id"] = experiment_id
+    if action is not None:
+        # Version 1 records store the name, version 2 records the value
+        match["action"] = {"$in": [action, ActionType[action].value]}
+    return {"$match": match}
+
+
+def cost_by_turn_pipeline(
+    action: Union[str, None] = "BUILD_SETTLEMENT",
+    experiment_id: Union[str, None] = None,
+    bucket_size: int = 1,
+) -> Pipeline:
+    """Mean, min and max cost of an action per player and turn bucket.
+
+    With ``action=None`` the costs of every action are aggregated together.
+    """
+    if bucket_size < 1:
+        raise ValueError("bucket_size must be at least 1")
+    turn: Any = "$turn_number"
+    if bucket_size > 1:
+        turn = {
+            "$multiply": [{"$floor": {"$divide": [turn, bucket_size]}}, bucket_size]
+        }
+    return [
+        match_actions(action, experiment_id),
+        {
+            "$group": {
+                "_id": {"player_id": "$player_id", "turn": turn},
+                "count": {"$sum": 1},
+                "mean_cost": {"$avg": "$cost"},
+                "min_cost": {"$min": "$cost"},
+                "max_cost": {"$max": "$cost"},
+            }
+        },
+        {
+            "$project": {
+                "_id": 0,
+                "player_id": "$_id.player_id",
+                "turn": "$_id.turn",
+                "count": 1,
+                "mean_cost": 1,
+                "min_cost": 1,
+                "max_cost": 1,
+            }
+        },
+        {"$sort": {"player_id": 1, "turn": 1}},
+    ]
+
+
+def action_counts_pipeline(experiment_id: Union[str, None] = None) -> Pipeline:
+    """How often each player took each action, per experiment"""
+    return [
+        match_actions(experiment_id=experiment_id),
+        {
+            "$group": {
+                "_id": {
+                    "experiment_id": "$experiment_id",
+                    "player_id": "$player_id",
+                    "action": "$action",
+                },
+                "count": {"$sum": 1},
+            }
+        },
+        {
+            "$project": {
+                "_id": 0,
+                "experiment_id": "$_id.experiment_id",
+                "player_id": "$_id.player_id",
+                "action": "$_id.action",
+                "count": 1,
+            }
+        },
+        {"$sort": {"experiment_id": 1, "player_id": 1, "count": -1}},
+    ]
+
+
+def run_pipeline(
+    db: "Database",
+    collection_name: str,
+    pipeline: Pipeline,
+    batch_size: int = 1000,
+) -> Iterator[dict[str, Any]]:
+    """Stream the results of a pipeline, fetching ``batch_size`` rows at a time"""
+    cursor = db[collection_name].aggregate(
+        pipeline, allowDiskUse=True, batchSize=batch_size
+    )
+    with cursor:
+        yield from cursor
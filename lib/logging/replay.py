@@ -0,0 +1,339 @@
+"""Offline (state, action, outcome) dataset recorded from simulated games.
+
+Rows are buffered per game and appended to fixed-capacity shards once the
+outcome is known. Each shard is a directory of ``.npy`` files opened as
+memory maps, so readers only touch the rows of the batch they load.
+"""
+
+from lib.gameplay.constants import MAX_PLAYERS
+from lib.gameplay.hex import ResourceType
+from lib.gameplay.pieces import CardType, PieceType
+from lib.gameplay.topology import NUM_EDGES, NUM_HEXES, NUM_VERTICES
+from lib.robot.action_type import ActionType
+from typing import TYPE_CHECKING, Iterator, Union, cast
+import json
+import logging
+import numpy as np
+import os
+
+if TYPE_CHECKING:  # pragma: no cover
+    from lib.gameplay.game import Game
+    from lib.gameplay.player import Player
+    from lib.robot.action import Action
+    from lib.robot.build_city import BuildCity
+    from lib.robot.build_road import BuildRoad
+    from lib.robot.build_settlement import BuildSettlement
+    from lib.robot.play_development_card import PlayDevelopmentCard
+
+logger = logging.getLogger(__name__)
+
+PLAYER_FEATURES = 5
+
+OBSERVATION_SIZE = (
+    2 * NUM_VERTICES  # owner and city flag per vertex
+    + NUM_EDGES  # owner per edge
+    + 2 * NUM_HEXES  # resource and value per hex
+    + 1  # robber
+    + len(ResourceType)  # hand
+    + 2 * len(CardType)  # unflipped and flipped development cards
+    + MAX_PLAYERS * PLAYER_FEATURES
+    + 1  # turn number
+)
+
+# Offsets of each action type in the flat action space
+SETTLEMENT_OFFSET = 0
+CITY_OFFSET = SETTLEMENT_OFFSET + NUM_VERTICES
+ROAD_OFFSET = CITY_OFFSET + NUM_VERTICES
+BUY_DEVELOPMENT_CARD_INDEX = ROAD_OFFSET + NUM_EDGES
+PLAY_DEVELOPMENT_CARD_OFFSET = BUY_DEVELOPMENT_CARD_INDEX + 1
+NUM_ACTIONS = PLAY_DEVELOPMENT_CARD_OFFSET + len(CardType)
+
+MASK_BYTES = (NUM_ACTIONS + 7) // 8
+OUTCOME_FIELDS = ("won", "points", "turns")
+
+
+def encode_observation(game: "Game", player: "Player") -> np.ndarray:
+    """Encode the game from the point of view of a player.
+
+    Owners are stored as seats relative to the player (1 is the player,
+    0 is empty) so the encoding does not depend on seating order.
+    """
+    obs = np.zeros(OBSERVATION_SIZE, dtype=np.int16)
+    num_players = game.num_players
+    board = game.board
+
+    def seat(owner: "Player") -> int:
+        return (owner.id - player.id) % num_players + 1
+
+    i = 0
+    for vertex in board.vertices:
+        if vertex.piece is not None:
+            obs[i + vertex.id] = seat(vertex.piece.player)
+            obs[i + NUM_VERTICES + vertex.id] = vertex.piece.type == PieceType.CITY
+    i += 2 * NUM_VERTICES
+    for edge in board.edges:
+        if edge.piece is not None:
+            obs[i + edge.id] = seat(edge.piece.player)
+    i += NUM_EDGES
+    for hex in board.hexes:
+        obs[i + hex.id] = 0 if hex.resourceType is None else hex.resourceType.value
+        obs[i + NUM_HEXES + hex.id] = hex.value or 0
+    i += 2 * NUM_HEXES
+    obs[i] = board.robberLoc
+    i += 1
+    counts = player.resource_counts()
+    obs[i : i + len(ResourceType)] = [counts[r] for r in ResourceType]
+    i += len(ResourceType)
+    for card in player.development_cards:
+        offset = len(CardType) if card.flipped else 0
+        obs[i + offset + card.cardType.value - 1] += 1
+    i += 2 * len(CardType)
+    for other in game.players:
+        j = i + (seat(other) - 1) * PLAYER_FEATURES
+        obs[j] = other.points()
+        obs[j + 1] = len(other.resources)
+        obs[j + 2] = other.largest_army_size()
+        obs[j + 3] = game.player_with_longest_road == other
+        obs[j + 4] = game.player_with_largest_army == other
+    i += MAX_PLAYERS * PLAYER_FEATURES
+    obs[i] = game.turn_number
+    return obs
+
+
+def action_index(action: "Action") -> int:
+    """Position of an action in the flat action space"""
+    if action.action_type == ActionType.BUILD_SETTLEMENT:
+        return SETTLEMENT_OFFSET + cast("BuildSettlement", action).vertex.id
+    if action.action_type == ActionType.BUILD_CITY:
+        return CITY_OFFSET + cast("BuildCity", action).vertex.id
+    if action.action_type == ActionType.BUILD_ROAD:
+        return ROAD_OFFSET + cast("BuildRoad", action).edge.id
+    if action.action_type == ActionType.BUY_DEVELOPMENT_CARD:
+        return BUY_DEVELOPMENT_CARD_INDEX
+    card = cast("PlayDevelopmentCard", action).card
+    return PLAY_DEVELOPMENT_CARD_OFFSET + card.cardType.value - 1
+
+
+def action_mask(
+    game: "Game", player: "Player", actions: list["Action"]
+) -> np.ndarray:
+    mask = np.zeros(NUM_ACTIONS, dtype=bool)
+    for action in actions:
+        if action.can_execute(game.board, game.bank, player):
+            mask[action_index(action)] = True
+    return mask
+
+
+class ReplayShard:
+    """A directory of preallocated memory mapped arrays"""
+
+    FILES = {
+        "observations": (np.int16, (OBSERVATION_SIZE,)),
+        "actions": (np.int16, ()),
+        "masks": (np.uint8, (MASK_BYTES,)),
+        "outcomes": (np.int16, (len(OUTCOME_FIELDS),)),
+    }
+
+    def __init__(self, path: str, capacity: int, create: bool = True):
+        self.path = path
+        self.capacity = capacity
+        if create:
+            os.makedirs(path, exist_ok=True)
+            self.arrays = {
+                name: np.lib.format.open_memmap(
+                    os.path.join(path, f"{name}.npy"),
+                    mode="w+",
+                    dtype=dtype,
+                    shape=(capacity, *shape),
+                )
+                for name, (dtype, shape) in self.FILES.items()
+            }
+        else:
+            # Reopen a shard left by an earlier run without truncating it
+            self.arrays = {
+                name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r+")
+                for name in self.FILES
+            }
+
+    def write(self, start: int, rows: dict[str, np.ndarray]) -> None:
+        for name, values in rows.items():
+            self.arrays[name][start : start + len(values)] = values
+
+    def flush(self) -> None:
+        for array in self.arrays.values():
+            array.flush()
+
+
+class ReplayRecorder:
+    """Records every action executed by robots in the games it is attached to"""
+
+    def __init__(self, directory: str, shard_size: int = 100_000):
+        self.directory = directory
+        self.shard_size = shard_size
+        os.makedirs(directory, exist_ok=True)
+        self.meta_path = os.path.join(directory, "meta.json")
+        self.shard_counts: list[int] = []
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path) as f:
+                self.shard_counts = json.load(f)["shard_counts"]
+        self.shard: Union[ReplayShard, None] = None
+        self.pending: dict[str, list[tuple[int, np.ndarray, int, np.ndarray]]] = {}
+
+    def __len__(self) -> int:
+        return sum(self.shard_counts)
+
+    def attach(self, game: "Game") -> None:
+        game.recorder = self
+        self.pending[game.game_id] = []
+
+    def record(
+        self,
+        game: "Game",
+        player: "Player",
+        action: "Action",
+        actions: list["Action"],
+    ) -> None:
+        """Buffer the state before a player executes an action"""
+        rows = self.pending.setdefault(game.game_id, [])
+        rows.append(
+            (
+                player.id,
+                encode_observation(game, player),
+                action_index(action),
+                np.packbits(action_mask(game, player, actions)),
+            )
+        )
+
+    def discard(self, game: "Game") -> None:
+        """Drop the buffered rows of a game that will not finish"""
+        self.pending.pop(game.game_id, None)
+
+    def end_game(self, game: "Game") -> None:
+        """Append the buffered rows of a finished game with its outcome"""
+        rows = self.pending.pop(game.game_id, [])
+        if len(rows) == 0:
+            return
+        winner = game.winning_player
+        points = {player.id: player.points() for player in game.players}
+        outcomes = np.array(
+            [
+                (winner is not None and winner.id == id, points[id], game.turn_number)
+                for id, _, _, _ in rows
+            ],
+            dtype=np.int16,
+        )
+        self.append(
+            {
+                "observations": np.stack([row[1] for row in rows]),
+                "actions": np.array([row[2] for row in rows], dtype=np.int16),
+                "masks": np.stack([row[3] for row in rows]),
+                "outcomes": outcomes,
+            }
+        )
+
+    def append(self, rows: dict[str, np.ndarray]) -> None:
+        total = len(rows["actions"])
+        written = 0
+        while written < total:
+            if (
+                len(self.shard_counts) == 0
+                or self.shard_counts[-1] >= self.shard_size
+            ):
+                self.open_shard(len(self.shard_counts))
+            shard = self.current_shard()
+            start = self.shard_counts[-1]
+            count = min(total - written, self.shard_size - start)
+            shard.write(
+                start,
+                {
+                    name: values[written : written + count]
+                    for name, values in rows.items()
+                },
+            )
+            shard.flush()
+            self.shard_counts[-1] += count
+            written += count
+            self.save_meta()
+
+    def current_shard(self) -> ReplayShard:
+        path = self.shard_path(len(self.shard_counts) - 1)
+        if self.shard is None or self.shard.path != path:
+            self.shard = ReplayShard(path, self.shard_size, create=False)
+        return self.shard
+
+    def open_shard(self, index: int) -> None:
+        self.shard = ReplayShard(self.shard_path(index), self.shard_size)
+        self.shard_counts.append(0)
+
+    def shard_path(self, index: int) -> str:
+        return os.path.join(self.directory, f"shard_{index:05d}")
+
+    def save_meta(self) -> None:
+        with open(self.meta_path, "w") as f:
+            json.dump(
+                {
+                    "shard_size": self.shard_size,
+                    "shard_counts": self.shard_counts,
+                    "observation_size": OBSERVATION_SIZE,
+                    "num_actions": NUM_ACTIONS,
+                },
+                f,
+            )
+
+
+class ReplayDataset:
+    """Reads shuffled mini batches from the shards written by a ReplayRecorder"""
+
+    def __init__(self, directory: str):
+        with open(os.path.join(directory, "meta.json")) as f:
+            meta = json.load(f)
+        if meta["observation_size"] != OBSERVATION_SIZE:
+            raise ValueError("Replay dataset was recorded with a different encoding")
+        self.shard_counts: list[int] = meta["shard_counts"]
+        self.shards = [
+            {
+                name: np.load(
+                    os.path.join(directory, f"shard_{i:05d}", f"{name}.npy"),
+                    mmap_mode="r",
+                )
+                for name in ReplayShard.FILES
+            }
+            for i in range(len(self.shard_counts))
+        ]
+        self.offsets = np.cumsum([0] + self.shard_counts)
+
+    def __len__(self) -> int:
+        return int(self.offsets[-1])
+
+    def get(self, indices: np.ndarray) -> dict[str, np.ndarray]:
+        """Gather rows by global index, reading each shard in index order"""
+        indices = np.sort(indices)
+        shard_ids = np.searchsorted(self.offsets, indices, side="right") - 1
+        batch: dict[str, list[np.ndarray]] = {name: [] for name in ReplayShard.FILES}
+        for shard_id in np.unique(shard_ids):
+            local = indices[shard_ids == shard_id] - self.offsets[shard_id]
+            for name, array in self.shards[shard_id].items():
+                batch[name].append(array[local])
+        result = {name: np.concatenate(values) for name, values in batch.items()}
+        result["masks"] = np.unpackbits(result["masks"], axis=1)[
+            :, :NUM_ACTIONS
+        ].astype(bool)
+        return result
+
+    def batches(
+        self,
+        batch_size: int,
+        shuffle: bool = True,
+        seed: Union[int, None] = None,
+        drop_last: bool = False,
+    ) -> Iterator[dict[str, np.ndarray]]:
+        order = (
+            np.random.default_rng(seed).permutation(len(self))
+            if shuffle
+            else np.arange(len(self))
+        )
+        for start in range(0, len(order), batch_size):
+            indices = order[start : start + batch_size]
+            if drop_last and len(indices) < batch_size:
+                break
+            yield self.get(indices)
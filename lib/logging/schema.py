@@ -0,0 +1,108 @@
+"""Versioned schema of the ``action_logs`` records.
+
+Version 1 records stored enums and pieces as strings, e.g. ``"BUILD_ROAD"``
+and ``"PieceType.SETTLEMENT 17"``. Version 2 records store the action as its
+``ActionType`` value, hands as counts per type and pieces as board positions.
+The identifying fields keep their names so both versions share indexes.
+Records without a ``v`` field are version 1.
+"""
+
+from lib.gameplay.hex import ResourceType
+from lib.gameplay.pieces import CardType, Piece
+from lib.robot.action_type import ActionType
+from typing import TYPE_CHECKING, Any, Iterable, cast
+import re
+
+if TYPE_CHECKING:  # pragma: no cover
+    from lib.gameplay.game import Game
+    from lib.gameplay.player import Player
+    from lib.robot.action import Action
+
+SCHEMA_VERSION = 2
+
+RESOURCE_PATTERN = re.compile(r"ResourceType\.(\w+)")
+CARD_PATTERN = re.compile(r"CardType\.(\w+), flipped=(True|False)")
+
+
+def encode_action(game: "Game", player: "Player", action: "Action") -> dict[str, Any]:
+    counts = player.resource_counts()
+    cards = [0] * len(CardType)
+    played = [0] * len(CardType)
+    for card in player.development_cards:
+        (played if card.flipped else cards)[card.cardType.value - 1] += 1
+    return {
+        "v": SCHEMA_VERSION,
+        "game_id": game.game_id,
+        "experiment_id": game.experiment_id
+        if game.experiment_id is not None
+        else "none",
+        "turn_number": game.turn_number,
+        "player_id": player.id,
+        "action": action.action_type.value,
+        "cost": action.cost,
+        "reward": action.reward,
+        "priority": action.priority,
+        "can_execute": action.can_execute(game.board, game.bank, player),
+        "executed": action.executed,
+        "hand": [counts[resource] for resource in ResourceType],
+        "cards": cards,
+        "played": played,
+        "settlements": positions(player.get_active_settlements()),
+        "cities": positions(player.get_active_cities()),
+        "roads": positions(player.get_active_roads()),
+    }
+
+
+def positions(pieces: Iterable[Piece]) -> list[int]:
+    """Sorted board positions of pieces, which are all on the board"""
+    return sorted(cast(int, piece.position) for piece in pieces)
+
+
+def decode_action(record: dict[str, Any]) -> dict[str, Any]:
+    """Read a record of any version into the version 2 layout.
+
+    Version 1 logged piece ids rather than board positions, so the pieces of
+    upgraded records are piece ids.
+    """
+    version = record.get("v", 1)
+    if version == SCHEMA_VERSION:
+        return record
+    if version != 1:
+        raise ValueError(f"Unknown action log version {version}")
+
+    hand = [0] * len(ResourceType)
+    for resource in record.get("player_resources", []):
+        match = RESOURCE_PATTERN.search(resource)
+        if match:
+            hand[ResourceType[match.group(1)].value - 1] += 1
+    cards = [0] * len(CardType)
+    played = [0] * len(CardType)
+    for card in record.get("player_development_cards", []):
+        match = CARD_PATTERN.search(card)
+        if match:
+            counts = played if match.group(2) == "True" else cards
+            counts[CardType[match.group(1)].value - 1] += 1
+
+    decoded = {
+        key: value
+        for key, value in record.items()
+        if not key.startswith("player_") or key == "player_id"
+    }
+    decoded.update(
+        {
+            "v": 1,
+            "experiment_id": record.get("experiment_id", "none"),
+            "action": ActionType[record["action"]].value,
+            "hand": hand,
+            "cards": cards,
+            "played": played,
+            "settlements": piece_ids(record.get("player_settlements", [])),
+            "cities": piece_ids(record.get("player_cities", [])),
+            "roads": piece_ids(record.get("player_roads", [])),
+        }
+    )
+    return decoded
+
+
+def piece_ids(pieces: list[str]) -> list[int]:
+    return [int(piece.rsplit(" ", 1)[1]) for piece in pieces]
@@ -1,2 +1,17 @@
-from .action_graph import ActionGraph
-from .robot import Robot
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .action_graph import ActionGraph
+    from .robot import Robot
+
+
+def __getattr__(name: str) -> Any:
+    if name == "ActionGraph":
+        from .action_graph import ActionGraph
+
+        return ActionGraph
+    if name == "Robot":
+        from .robot import Robot
+
+        return Robot
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
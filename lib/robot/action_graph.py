@@ -1,8 +1,10 @@
 from typing import TYPE_CHECKING, Literal, Union
 
 
+from lib.gameplay.events import Event, GameEvent
 from lib.gameplay.pieces import CardType
 from lib.logging.database import MongoLogger
+from lib.logging.schema import encode_action
 from lib.robot.build_city import BuildCity
 from lib.robot.buy_development_card import BuyDevelopmentCard
 from lib.robot.build_settlement import BuildSettlement
@@ -13,7 +15,7 @@ from lib.robot.player_state import PlayerState
 
 if TYPE_CHECKING:
     from lib.gameplay.player import Player
-    from lib.gameplay.game import Game, GameEvent
+    from lib.gameplay.game import Game
 
 """
 Building an action graph.
@@ -40,48 +42,29 @@ class ActionGraph:
         self.player = player
         self.game = game
         self.player_state = PlayerState(self.player)
-        self.game.listen(self.on_game_event)
+        self.game.events.subscribe(GameEvent.START_TURN, self.on_game_event)
+        self.game.events.subscribe(GameEvent.END_TURN, self.on_game_event)
         self.settlement_actions = []
         self.city_actions = []
         self.road_actions = []
+        # Actions computed at each stage of the player's last turn, kept so
+        # visualizers do not have to generate them again
+        self.last_actions: dict[str, list[Action]] = {"pre_roll": [], "post_roll": []}
 
-    def on_game_event(self, event: "GameEvent") -> None:
-        if str(event) == "GameEvent.START_TURN" or str(event) == "GameEvent.END_TURN":
-            self.player_state.refresh_state()
+    def reset(self) -> None:
+        self.settlement_actions = []
+        self.city_actions = []
+        self.road_actions = []
+        self.last_actions = {"pre_roll": [], "post_roll": []}
+        self.player_state.refresh_state()
+
+    def on_game_event(self, event: Event) -> None:
+        self.player_state.refresh_state()
 
     def log_actions(self, actions: list[Action]) -> None:
         for action in actions:
             MongoLogger.log(
-                "action_logs",
-                {
-                    "game_id": self.game.game_id,
-                    "turn_number": self.game.turn_number,
-                    "player_id": self.player.id,
-                    "action": str(action.action_type),
-                    "cost": action.cost,
-                    "reward": action.reward,
-                    "priority": action.priority,
-                    "can_execute": action.can_execute(
-                        self.game.board, self.game.bank, self.player
-                    ),
-                    "player_resources": [
-                        str(resource) for resource in self.player.resources
-                    ],
-                    "player_development_cards": [
-                        str(card) for card in self.player.development_cards
-                    ],
-                    "player_settlements": [
-                        str(settlement)
-                        for settlement in self.player.get_active_settlements()
-                    ],
-                    "player_cities": [
-                        str(city) for city in self.player.get_active_cities()
-                    ],
-                    "player_roads": [
-                        str(road) for road in self.player.get_active_roads()
-                    ],
-                    "executed": action.executed,
-                },
+                "action_logs", encode_action(self.game, self.player, action)
             )
 
     def execute_actions(
@@ -92,11 +75,15 @@ class ActionGraph:
             if stage == "post_roll"
             else self.get_pre_roll_actions()
         )
+        self.last_actions[stage] = actions
+        recorder = self.game.recorder
         for action in actions:
             num_resources = len(self.player.resources)
             if (action.priority > 0 or num_resources > 7) and action.can_execute(
                 self.game.board, self.game.bank, self.player
             ):
+                if recorder is not None:
+                    recorder.record(self.game, self.player, action, actions)
                 action.execute(
                     self.game.board, self.game.bank, self.player, self.game.players
                 )
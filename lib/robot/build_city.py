@@ -1,5 +1,6 @@
 from lib.gameplay.hex import ResourceType
 from lib.gameplay.pieces import PieceType
+from lib.gameplay.purchase import Purchase, PurchaseResult
 from lib.robot.action_type import ActionType
 from lib.robot.action import Action
 from typing import TYPE_CHECKING
@@ -48,8 +49,12 @@ class BuildCity(Action):
         self, board: "Board", bank: "Bank", player: "Player", players: list["Player"]
     ) -> None:
         logger.info(f"{player} building city at {self.vertex.id}")
-        player.build_city(board, self.vertex.id, bank)
-        self.executed = True
+        result = player.purchase(Purchase.CITY, self.vertex.id)
+        self.executed = result == PurchaseResult.SUCCESS
+        if not self.executed:
+            logger.warning(
+                f"{player} could not build city at {self.vertex.id}: {result}"
+            )
 
     def resources_at_vertex(self) -> list[tuple[ResourceType, float]]:
         return [
@@ -1,6 +1,7 @@
 from lib.gameplay.bank import Bank
 from lib.gameplay.board import Board
 from lib.gameplay.pieces import PieceType
+from lib.gameplay.purchase import Purchase, PurchaseResult
 from lib.gameplay.player import Player
 from lib.operations.ops import normalize
 from lib.robot.action import Action
@@ -92,8 +93,10 @@ class BuildRoad(Action):
     ) -> None:
         logger.info(f"{player} building road at {self.edge.id}")
         logger.info(f"{self.player} has abundant resources, building road")
-        player.build_road(board, self.edge.id, bank)
-        self.executed = True
+        result = player.purchase(Purchase.ROAD, self.edge.id)
+        self.executed = result == PurchaseResult.SUCCESS
+        if not self.executed:
+            logger.warning(f"{player} could not build road at {self.edge.id}: {result}")
 
     def __str__(self) -> str:
         info = {
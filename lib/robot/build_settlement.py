@@ -1,5 +1,6 @@
 from lib.gameplay.hex import ResourceType
 from lib.gameplay.pieces import PieceType
+from lib.gameplay.purchase import Purchase, PurchaseResult
 from lib.operations.ops import normalize
 from lib.robot.action_type import ActionType
 from lib.robot.action import Action
@@ -79,8 +80,12 @@ class BuildSettlement(Action):
         self, board: "Board", bank: "Bank", player: "Player", players: list["Player"]
     ) -> None:
         logger.info(f"{player} building settlement at {self.vertex.id}")
-        player.build_settlement(board, self.vertex.id, bank)
-        self.executed = True
+        result = player.purchase(Purchase.SETTLEMENT, self.vertex.id)
+        self.executed = result == PurchaseResult.SUCCESS
+        if not self.executed:
+            logger.warning(
+                f"{player} could not build settlement at {self.vertex.id}: {result}"
+            )
 
     def __str__(self) -> str:
         info = {
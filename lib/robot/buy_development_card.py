@@ -1,6 +1,7 @@
 from lib.gameplay.bank import Bank
 from lib.gameplay.board import Board
 from lib.gameplay.player import Player
+from lib.gameplay.purchase import Purchase, PurchaseResult
 from lib.operations.ops import normalize
 from lib.robot.action_type import ActionType
 from lib.robot.action import Action
@@ -53,5 +54,7 @@ class BuyDevelopmentCard(Action):
         self, board: Board, bank: Bank, player: Player, players: list[Player]
     ) -> None:
         logger.info(f"{player} buying development card")
-        player.buy_development_card(bank)
-        self.executed = True
+        result = player.purchase(Purchase.DEVELOPMENT_CARD)
+        self.executed = result == PurchaseResult.SUCCESS
+        if not self.executed:
+            logger.warning(f"{player} could not buy a development card: {result}")
@@ -65,7 +65,7 @@ class PlayDevelopmentCard(Action):
         self, board: Board, bank: Bank, player: Player, players: list[Player]
     ) -> None:
         logger.info(f"{player} playing development card {self.card.cardType}")
-        self.card.flip()
+        player.play_development_card(self.card)
         self.executed = True
         if self.card.cardType == CardType.KNIGHT:
             player.move_robber(board, bank)
@@ -3,6 +3,7 @@ from lib.gameplay.player import Player
 from lib.robot.action_graph import ActionGraph
 from typing import TYPE_CHECKING, Union
 import logging
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
@@ -18,35 +19,31 @@ class Robot(Player):
         super().__init__(id, color, game)
         self.action_graph = ActionGraph(self, game)
 
+    def reset(self, bank: "Bank") -> None:
+        super().reset(bank)
+        self.action_graph.reset()
+
     def get_hex_and_player_to_rob(
         self, board: "Board", bank: "Bank"
     ) -> tuple["Hex", Union["Player", None]]:
-        # Get a sorted list of players by the number of points they have
-        # and secondarily by the number of resources they have
-        players = sorted(
-            self.game.players,
+        # Rob the player with the most points, then the most resources,
+        # on the hex blocking most of their production
+        victims = sorted(
+            (p for p in self.game.players if p is not self),
             key=lambda p: (p.points(), len(p.resources)),
             reverse=True,
         )
-        player_to_rob = next((p for p in players if p != self), None)
-        if player_to_rob is None:
-            return board.get_desert(), None
-
-        robber_loc = board.robberLoc
-
-        players_settled_hexes = [
-            hex
-            for hex in player_to_rob.get_settled_hexes()
-            if hex.id != robber_loc and self not in hex.get_settled_players()
-        ]
-
-        # find the hex with the highest likelihood
-        hex_to_rob = max(
-            players_settled_hexes,
-            key=lambda hex: hex.likelihood(),
-        )
-
-        return hex_to_rob, player_to_rob
+        for victim in victims:
+            scores = board.robber_scores(self, victim)
+            hex_id = int(np.argmax(scores))
+            if scores[hex_id] > 0:
+                return board.hexes[hex_id], victim
+
+        # Nobody can be blocked without blocking ourselves, so find the hex
+        # that hurts us least
+        harm = board.blocking[self.id].copy()
+        harm[board.robberLoc] = np.inf
+        return board.hexes[int(np.argmin(harm))], None
 
     def resource_importance(self) -> dict[ResourceType, float]:
         resource_abundance = self.resource_abundance()
@@ -1 +1,12 @@
-from .renderer import Renderer
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .renderer import Renderer
+
+
+def __getattr__(name: str) -> Any:
+    if name == "Renderer":
+        from .renderer import Renderer
+
+        return Renderer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
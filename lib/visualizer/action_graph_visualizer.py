@@ -1,44 +1,90 @@
 from lib.robot.action_graph import ActionGraph
-from lib.gameplay.game import Game, GameEvent
+from lib.gameplay.events import Event, GameEvent
+from lib.gameplay.game import Game
+from typing import Union
 import logging
+import math
+import time
 
 logger = logging.getLogger(__name__)
 
+PAGE = (
+    "<html><head><link rel='stylesheet' href='index.css' /></head><body>"
+    "<div style='display: flex; justify-content: space-between;'>"
+    "<a href='/'>Back</a>"
+    "<a href='/red'>Red</a>"
+    "<a href='/blue'>Blue</a>"
+    "<a href='/white'>White</a>"
+    "<a href='/orange'>Orange</a>"
+    "</div>"
+    "<h1>Action Graph for {player}</h1>"
+    "<h2>Stats</h2>"
+    "{state}"
+    "<h2>Actions</h2>"
+    "<ul>{actions}</ul>"
+    "</body></html>"
+)
+
 
 class ActionGraphVisualizer:
+    """Writes the actions a player's graph computed on its last turn.
+
+    The file is only rewritten when its content changes, and at most once
+    every ``min_interval`` seconds. A turn ending inside the interval is
+    written on the first event after it, and the end of the game is always
+    written.
+    Without an output file nothing is written and pages are only rendered on
+    request.
+    """
+
     def __init__(
         self,
         action_graph: ActionGraph,
         game: Game,
-        output_file: str = "action_graph.html",
+        output_file: Union[str, None] = "action_graph.html",
+        min_interval: float = 0,
     ):
         self.action_graph = action_graph
         self.game = game
-        self.game.listen(self.on_game_event)
+        if output_file is not None:
+            self.game.events.subscribe_all(self.on_game_event)
         self.output_file = output_file
+        self.min_interval = min_interval
+        self.last_html: Union[str, None] = None
+        self.last_write = -math.inf
+        # A turn ended since the page was last brought up to date
+        self.pending = False
+
+    def on_game_event(self, event: Event):
+        if event.type in (GameEvent.END_TURN, GameEvent.END_GAME):
+            self.pending = True
+        if self.pending:
+            self.visualize(force=event.type == GameEvent.END_GAME)
 
-    def on_game_event(self, event: GameEvent):
-        if event == GameEvent.END_TURN:
-            self.visualize()
+    def render(self) -> str:
+        actions = self.action_graph.last_actions
+        return PAGE.format(
+            player=self.action_graph.player,
+            state=self.action_graph.get_state(),
+            actions="".join(
+                f"<li style='color: {'green' if action.priority > 0 else 'black'};'>{action}</li>"
+                for action in actions["pre_roll"] + actions["post_roll"]
+            ),
+        )
 
-    def visualize(self):
+    def visualize(self, force: bool = False) -> bool:
+        """Write the page if it is due and changed, returning whether it was written"""
+        if self.output_file is None:
+            return False
+        if not force and time.monotonic() - self.last_write < self.min_interval:
+            return False
+        self.pending = False
+        html = self.render()
+        if html == self.last_html:
+            return False
         logger.info(f"Visualizing action graph for {self.action_graph.player}")
         with open(self.output_file, "w") as f:
-            html = "<html><head><link rel='stylesheet' href='index.css' /></head><body><script src='/livereload.js'></script>"
-            html += "<div style='display: flex; justify-content: space-between;'>"
-            html += "<a href='/'>Back</a>"
-            html += "<a href='/red'>Red</a>"
-            html += "<a href='/blue'>Blue</a>"
-            html += "<a href='/white'>White</a>"
-            html += "<a href='/orange'>Orange</a>"
-            html += "</div>"
-            html += f"<h1>Action Graph for {self.action_graph.player}</h1>"
-            html += "<h2>Stats</h2>"
-            html += f"{self.action_graph.get_state()}"
-            html += "<h2>Actions</h2>"
-            html += "<ul>"
-            actions = self.action_graph.get_post_roll_actions()
-            for action in actions:
-                html += f"<li style='color: {"green" if action.priority > 0 else "black"};'>{action}</li>"
-            html += "</ul></body></html>"
             f.write(html)
+        self.last_html = html
+        self.last_write = time.monotonic()
+        return True
@@ -0,0 +1,203 @@
+"""Streams an in-process game to the browser with server-sent events.
+
+Every step publishes one frame: the markup of the SVG elements that changed
+and a summary of each player's action graph. The page patches its copy of
+the SVG in place, so nothing is written to disk and the page never reloads.
+"""
+
+from lib.robot.robot import Robot
+from lib.visualizer.action_graph_visualizer import ActionGraphVisualizer
+from lib.visualizer.renderer import Renderer
+from typing import TYPE_CHECKING, Any, Callable, Generator, Union
+import json
+import queue
+import threading
+
+if TYPE_CHECKING:  # pragma: no cover
+    from lib.gameplay.game import Game
+
+# Seconds between keep-alive comments on an idle stream
+KEEP_ALIVE = 15
+
+
+class LiveGame:
+    def __init__(
+        self, game: "Game", new_game: Union[Callable[[], "Game"], None] = None
+    ):
+        self.new_game = new_game
+        self.lock = threading.Lock()
+        self.clients: list[queue.Queue[str]] = []
+        self.attach(game)
+
+    def attach(self, game: "Game") -> None:
+        self.game = game
+        self.renderer = Renderer(game, output_file=None)
+        self.renderer.update()
+        self.renderer.pop_changes()
+        self.visualizers = {
+            player.color: ActionGraphVisualizer(
+                player.action_graph, game, output_file=None
+            )
+            for player in game.players
+            if isinstance(player, Robot) and player.action_graph is not None
+        }
+
+    def step(self) -> None:
+        """Play one turn, like Game.play, and publish the changes"""
+        with self.lock:
+            game = self.game
+            if game.winning_player is not None:
+                return
+            if game.advance():
+                game.finish()
+            self.renderer.update()
+            frame = self.frame(self.renderer.pop_changes())
+        self.publish(frame)
+
+    def restart(self) -> None:
+        """Replace the game with a new one and resend the whole board"""
+        if self.new_game is None:
+            raise ValueError("No game factory to restart with")
+        with self.lock:
+            self.attach(self.new_game())
+            frame = self.snapshot()
+        self.publish(frame)
+
+    def frame(self, patch: dict[str, Union[str, None]]) -> dict[str, Any]:
+        game = self.game
+        return {
+            "turn": game.turn_number,
+            "current_player": game.get_current_player().color,
+            "winner": None
+            if game.winning_player is None
+            else game.winning_player.color,
+            "patch": patch,
+            "players": self.summaries(),
+        }
+
+    def snapshot(self) -> dict[str, Any]:
+        frame = self.frame({})
+        frame["svg"] = self.renderer.to_svg()
+        return frame
+
+    def summaries(self) -> list[dict[str, Any]]:
+        summaries = []
+        for player in self.game.players:
+            summary: dict[str, Any] = {
+                "color": player.color,
+                "points": player.points(),
+                "resources": len(player.resources),
+                "development_cards": len(player.development_cards),
+            }
+            if isinstance(player, Robot) and player.action_graph is not None:
+                summary["state"] = player.action_graph.get_state()
+            summaries.append(summary)
+        return summaries
+
+    def publish(self, frame: dict[str, Any]) -> None:
+        message = json.dumps(frame)
+        for client in list(self.clients):
+            client.put(message)
+
+    def stream(self) -> Generator[str, None, None]:
+        """Server-sent events for one client, starting with the whole board"""
+        client: queue.Queue[str] = queue.Queue()
+        with self.lock:
+            self.clients.append(client)
+            first = json.dumps(self.snapshot())
+        try:
+            yield f"data: {first}\n\n"
+            while True:
+                try:
+                    yield f"data: {client.get(timeout=KEEP_ALIVE)}\n\n"
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+        finally:
+            self.clients.remove(client)
+
+    def page(self) -> str:
+        with self.lock:
+            svg = self.renderer.to_svg()
+        return PAGE.replace("{svg}", svg)
+
+    def action_graph_page(self, color: str) -> Union[str, None]:
+        """The actions of a player of this game, None for an unknown color"""
+        with self.lock:
+            visualizer = self.visualizers.get(color)
+            return None if visualizer is None else visualizer.render()
+
+
+PAGE = """<!DOCTYPE html>
+<html>
+<head>
+    <title>Catan</title>
+    <link rel="stylesheet" href="index.css" />
+</head>
+<body>
+    <div style="display: flex; gap: 1em; align-items: center;">
+        <button id="step">Step</button>
+        <button id="play">Play</button>
+        <button id="restart">New game</button>
+        <span id="status"></span>
+    </div>
+    <div style="display: flex;">
+        <div id="board" style="flex: 3;">{svg}</div>
+        <div id="players" style="flex: 1;"></div>
+    </div>
+    <script>
+        const board = document.getElementById("board");
+        const status = document.getElementById("status");
+        const players = document.getElementById("players");
+        let timer = null;
+
+        function patch(changes) {
+            for (const [id, markup] of Object.entries(changes)) {
+                const element = document.getElementById(id);
+                if (markup === null) {
+                    if (element) element.remove();
+                } else if (element) {
+                    element.outerHTML = markup;
+                } else {
+                    document.getElementById("Hexes").insertAdjacentHTML("beforeend", markup);
+                }
+            }
+        }
+
+        function show(frame) {
+            if (frame.svg) board.innerHTML = frame.svg;
+            patch(frame.patch);
+            status.textContent = frame.winner
+                ? `Turn ${frame.turn}: ${frame.winner} wins`
+                : `Turn ${frame.turn}: ${frame.current_player} to play`;
+            players.innerHTML = frame.players.map((player) =>
+                `<h3><a href="/${player.color}" style="color: ${player.color}">${player.color}</a>: ${player.points} points</h3>` +
+                `<p>${player.resources} resources, ${player.development_cards} development cards</p>` +
+                (player.state ? `<div>${player.state}</div>` : "")
+            ).join("");
+            if (frame.winner && timer) togglePlay();
+        }
+
+        function step() {
+            return fetch("/step", { method: "POST" });
+        }
+
+        function togglePlay() {
+            if (timer) {
+                clearInterval(timer);
+                timer = null;
+            } else {
+                timer = setInterval(step, 200);
+            }
+            document.getElementById("play").textContent = timer ? "Pause" : "Play";
+        }
+
+        document.getElementById("step").onclick = step;
+        document.getElementById("play").onclick = togglePlay;
+        document.getElementById("restart").onclick = () =>
+            fetch("/restart", { method: "POST" });
+        new EventSource("/events").onmessage = (message) =>
+            show(JSON.parse(message.data));
+    </script>
+</body>
+</html>
+"""
@@ -1,17 +1,20 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Union
 import xml.etree.ElementTree as ET
 from enum import Enum
+from lib.gameplay.events import GameEvent
 from lib.gameplay.hex import ResourceType
 from lib.gameplay.pieces import PieceType
 import math
 import os
 import re
+import time
 import logging
 
 logger = logging.getLogger(__name__)
 
 if TYPE_CHECKING:
-    from lib.gameplay.game import Game, GameEvent
+    from lib.gameplay.events import Event
+    from lib.gameplay.game import Game
     from lib.gameplay.hex import Vertex, Edge, Hex
 
 
@@ -96,24 +99,178 @@ def tangent_line(
     return pointA, pointB
 
 
+# State of an element that has not been drawn yet
+UNRENDERED = object()
+
+
 class Renderer:
-    def __init__(self, game: "Game") -> None:
+    """Renders the board to ``index.html`` as the game is played.
+
+    The SVG template is parsed once and the renderer keeps a handle to the
+    element of every hex, vertex and edge. Each frame only updates the
+    elements whose piece changed since the last frame, and the page is
+    written at most ``max_fps`` times a second, or never without an
+    ``output_file``. The ids of changed elements are collected for
+    ``pop_changes`` so a live view can patch its copy of the SVG.
+    """
+
+    def __init__(
+        self,
+        game: "Game",
+        output_file: Union[str, None] = "index.html",
+        template: str = "catan_base.svg",
+        max_fps: float = 10,
+    ) -> None:
         self.game = game
-        self.game.listen(self.onGameEvent)
+        self.output_file = output_file
+        self.min_interval = 1 / max_fps if max_fps > 0 else 0.0
+        self.last_write = -math.inf
+        self.dirty = True
         ET.register_namespace("", "http://www.w3.org/2000/svg")
         self.namespace = {"svg": "http://www.w3.org/2000/svg"}
+        self.tree = ET.parse(template)
+        self.root = self.tree.getroot()
+        self.setup_elements()
+        self.game.events.subscribe_all(self.onGameEvent)
 
-    def onGameEvent(self, event: "GameEvent") -> None:
-        self.render()
-
-    def render(self) -> None:
-        self.tree = ET.parse("catan_base.svg")
+    def setup_elements(self) -> None:
+        board = self.game.board
+        hexes_group = self.root.find(".//*[@id='Hexes']")
+        roads_group = self.root.find(".//*[@id='Roads']")
+        robber = self.root.find(".//*[@id='Robber']")
+        if hexes_group is None or roads_group is None:
+            raise ValueError("Element with id='Hexes' or id='Roads' not found")
+        if robber is None:
+            raise ValueError("Element with id='Robber' not found")
+        self.hexes_group = hexes_group
+        self.roads_group = roads_group
+        self.robber = robber
 
-        self.root = self.tree.getroot()
-        self.render_hexes()
+        self.hex_polygons = [self.find_polygon(f"Hex{hex.id}") for hex in board.hexes]
+        self.hex_coordinates = [
+            self.parse_coordinates(polygon) for polygon in self.hex_polygons
+        ]
+        self.hex_groups = [self.find_group(f"Hex{hex.id}") for hex in board.hexes]
+        self.vertex_groups = []
+        self.vertex_polygons = []
+        self.vertex_paths = []
+        for vertex in board.vertices:
+            self.vertex_groups.append(self.find_group(f"Vertex{vertex.id}"))
+            self.vertex_polygons.append(self.find_polygon(f"Vertex{vertex.id}"))
+            path = self.root.find(
+                f".//*[@id='Vertex{vertex.id}']/svg:path", self.namespace
+            )
+            if path is None:
+                raise ValueError(
+                    f"Path not found inside element with id='Vertex{vertex.id}'"
+                )
+            self.vertex_paths.append(path)
+        self.robber_paths = [
+            (path, path.get("d") or "")
+            for path in robber.findall("svg:path", self.namespace)
+        ]
+        for path, _ in self.robber_paths:
+            path.set("stroke", "black")
+            path.set("stroke-width", "1")
+            path.set("fill", "beige")
 
-        # Get the XML tree as a string
-        tree_str = ET.tostring(self.root, encoding="utf-8").decode("utf-8")
+        # Labels never change apart from the number tokens
+        self.hex_values = []
+        for hex in board.hexes:
+            center = self.get_hex_center(hex.id)
+            text = self.draw_text(center.x, center.y, "")
+            text.set("id", f"HexValue{hex.id}")
+            self.hex_values.append(text)
+        for edge in board.edges:
+            start, end = self.get_edge_coordinates(edge)
+            self.draw_text(
+                (start.x + end.x) / 2, (start.y + end.y) / 2, str(edge.id), font_size=12
+            )
+        for vertex in board.vertices:
+            coordinate = self.get_vertex_coordinate(vertex)
+            self.draw_text(coordinate.x, coordinate.y, str(vertex.id), font_size=12)
+
+        self.road_elements: dict[int, ET.Element] = {}
+        # What each element currently shows, compared against the board every frame
+        self.hex_state: list[Any] = [UNRENDERED] * len(board.hexes)
+        self.vertex_state: list[Any] = [UNRENDERED] * len(board.vertices)
+        self.edge_state: list[Any] = [UNRENDERED] * len(board.edges)
+        self.robber_state: Any = UNRENDERED
+        # Elements changed since the last pop_changes, None once removed
+        self.changes: dict[str, Union[ET.Element, None]] = {}
+
+    def onGameEvent(self, event: "Event") -> None:
+        self.render(force=event.type == GameEvent.END_GAME)
+
+    def render(self, force: bool = False) -> None:
+        """Apply the changes since the last frame and write the page if it is due"""
+        if self.update() > 0:
+            self.dirty = True
+        if self.dirty and (
+            force or time.monotonic() - self.last_write >= self.min_interval
+        ):
+            self.write()
+
+    def flush(self) -> None:
+        """Write the latest state regardless of the frame rate"""
+        self.render(force=True)
+
+    def update(self) -> int:
+        """Bring every element in line with the board, returning the number changed"""
+        board = self.game.board
+        changed = 0
+        for hex in board.hexes:
+            state = (hex.resourceType, hex.value)
+            if self.hex_state[hex.id] != state:
+                self.hex_state[hex.id] = state
+                self.render_hex(hex)
+                self.changes[f"Hex{hex.id}"] = self.hex_groups[hex.id]
+                self.changes[f"HexValue{hex.id}"] = self.hex_values[hex.id]
+                changed += 1
+        for vertex in board.vertices:
+            piece = vertex.piece
+            state = None if piece is None else (piece.player.color, piece.type)
+            if self.vertex_state[vertex.id] != state:
+                self.vertex_state[vertex.id] = state
+                self.render_vertex(vertex)
+                self.changes[f"Vertex{vertex.id}"] = self.vertex_groups[vertex.id]
+                changed += 1
+        for edge in board.edges:
+            state = None if edge.piece is None else edge.piece.player.color
+            if self.edge_state[edge.id] != state:
+                self.edge_state[edge.id] = state
+                self.draw_edge(edge)
+                self.changes[f"Road{edge.id}"] = self.road_elements.get(edge.id)
+                changed += 1
+        if self.robber_state != board.robberLoc:
+            self.robber_state = board.robberLoc
+            self.render_robber(board.robberLoc)
+            self.changes["Robber"] = self.robber
+            changed += 1
+        return changed
+
+    def to_svg(self) -> str:
+        return ET.tostring(self.root, encoding="utf-8").decode("utf-8")
+
+    def pop_changes(self) -> dict[str, Union[str, None]]:
+        """Markup of every element changed since the last call, keyed by id.
+
+        Removed elements map to None. Only roads are ever added or removed,
+        and they belong at the end of the element with id ``Hexes``.
+        """
+        changes = {
+            id: None if element is None else ET.tostring(element, encoding="unicode")
+            for id, element in self.changes.items()
+        }
+        self.changes.clear()
+        return changes
+
+    def write(self) -> None:
+        self.dirty = False
+        self.last_write = time.monotonic()
+        if self.output_file is None:
+            return
+        tree_str = self.to_svg()
 
         links = "<div style='display: flex; justify-content: space-between;'>"
         links += "<a href='/'>Back</a>"
@@ -124,7 +281,7 @@ class Renderer:
         links += "</div>"
 
         # Write the SVG to the index.html as the first element of the body
-        with open("index.html", "w") as f:
+        with open(self.output_file, "w") as f:
             f.write(f"""<!DOCTYPE html>
                 <html>
                 <head>
@@ -138,30 +295,19 @@ class Renderer:
                 </html>
                 """)
 
-    def render_hexes(self) -> None:
-        hexes = self.game.board.get_hexes()
-
-        for hex in hexes:
-            self.set_hex_color(hex.id, RESOURCE_COLOR_MAP[hex.resourceType])
-        for hex in hexes:
-            self.render_hex_value(hex)
-        for vertex in self.game.board.vertices:
-            self.render_vertex(vertex)
-        self.render_robber(self.game.board.robberLoc)
-        for edge in self.game.board.edges:
-            self.draw_edge(edge)
-        for vertex in self.game.board.vertices:
-            self.draw_vertex(vertex)
+    def find_group(self, elementId: str) -> ET.Element:
+        element = self.root.find(f".//*[@id='{elementId}']")
+        if element is None:
+            raise ValueError(f"Element with id='{elementId}' not found")
+        return element
 
-    def get_hex_coordinates(self, hexId: int) -> list[Coordinate]:
-        hex_element = self.root.find(f".//*[@id='Hex{hexId}']")
-        if hex_element is None:
-            raise ValueError(f"Element with id='Hex{hexId}' not found")
-
-        polygon = hex_element.find("svg:polygon", self.namespace)
+    def find_polygon(self, elementId: str) -> ET.Element:
+        polygon = self.find_group(elementId).find("svg:polygon", self.namespace)
         if polygon is None:
-            raise ValueError(f"Polygon not found inside element with id='Hex{hexId}'")
+            raise ValueError(f"Polygon not found inside element with id='{elementId}'")
+        return polygon
 
+    def parse_coordinates(self, polygon: ET.Element) -> list[Coordinate]:
         points = polygon.get("points")
         if points is None:
             raise ValueError("Points attribute not found in polygon")
@@ -171,47 +317,30 @@ class Renderer:
             for points in pair_elements(points.strip().split())
         ]
 
-    def draw_vertex(self, vertex: "Vertex") -> None:
-        hex, vertexLoc = next(iter(vertex.hexes.items()))
-        coordinateIndex = ((vertexLoc + 4) % 12) // 2
-        vertexCoordinate = self.get_hex_coordinates(hex.id)[coordinateIndex]
+    def get_hex_coordinates(self, hexId: int) -> list[Coordinate]:
+        return self.hex_coordinates[hexId]
 
-        self.draw_text(
-            vertexCoordinate.x,
-            vertexCoordinate.y,
-            str(vertex.id),
-            font_size=12,
-        )
+    def get_vertex_coordinate(self, vertex: "Vertex") -> Coordinate:
+        hex, vertexLoc = vertex.hexes[0], vertex.hex_locations[0]
+        coordinateIndex = ((vertexLoc + 4) % 12) // 2
+        return self.get_hex_coordinates(hex.id)[coordinateIndex]
 
-    def draw_edge(self, edge: "Edge") -> None:
-        hex, edgeLoc = next(iter(edge.hexes.items()))
+    def get_edge_coordinates(self, edge: "Edge") -> list[Coordinate]:
+        hex, edgeLoc = edge.hexes[0], edge.hex_locations[0]
         coordinateIndex = ((edgeLoc + 4) % 12) // 2
-        hexCoordinates = self.get_hex_coordinates(hex.id)[
-            coordinateIndex : coordinateIndex + 2
-        ]
+        return self.get_hex_coordinates(hex.id)[coordinateIndex : coordinateIndex + 2]
 
+    def draw_edge(self, edge: "Edge") -> None:
+        road = self.road_elements.pop(edge.id, None)
+        if road is not None:
+            self.hexes_group.remove(road)
         if edge.piece is not None:
-            self.draw_line(
-                hexCoordinates[0], hexCoordinates[1], edge.piece.player.color
-            )
-
-        self.draw_text(
-            (hexCoordinates[0].x + hexCoordinates[1].x) / 2,
-            (hexCoordinates[0].y + hexCoordinates[1].y) / 2,
-            str(edge.id),
-            font_size=12,
-        )
-
-    def draw_line(self, start: Coordinate, end: Coordinate, color: str) -> None:
-        # Create a new line element
-        line = ET.Element("line")
-        line.set("x1", str(start.x))
-        line.set("y1", str(start.y))
-        line.set("x2", str(end.x))
-        line.set("y2", str(end.y))
-        line.set("stroke", color)
-        line.set("stroke-width", "8")
+            start, end = self.get_edge_coordinates(edge)
+            road = self.draw_line(start, end, edge.piece.player.color)
+            road.set("id", f"Road{edge.id}")
+            self.road_elements[edge.id] = road
 
+    def draw_line(self, start: Coordinate, end: Coordinate, color: str) -> ET.Element:
         rect = ET.Element("polygon", self.namespace)
 
         (a, b) = tangent_line(start, end, 8)
@@ -224,13 +353,12 @@ class Renderer:
         rect.set("stroke-width", "1")
         rect.set("fill", color)
 
-        # Find the element with id="Hex0"
-        hexes_group = self.root.find(".//*[@id='Hexes']")
+        self.hexes_group.append(rect)
+        return rect
 
-        if hexes_group is not None:
-            hexes_group.append(rect)
-
-    def draw_text(self, x: float, y: float, value: str, font_size: int = 24) -> None:
+    def draw_text(
+        self, x: float, y: float, value: str, font_size: int = 24
+    ) -> ET.Element:
         # Create a new text element
         text = ET.Element("text")
         text.set("x", str(x - 10))
@@ -239,11 +367,8 @@ class Renderer:
         text.set("fill", "black")
         text.text = value
 
-        # Find the element with id="Hexes"
-        hexes_group = self.root.find(".//*[@id='Roads']")
-
-        if hexes_group is not None:
-            hexes_group.append(text)
+        self.roads_group.append(text)
+        return text
 
     def get_hex_center(self, hexId: int) -> Coordinate:
         hex_coordinates = self.get_hex_coordinates(hexId)
@@ -253,72 +378,36 @@ class Renderer:
         maxY = max([c.y for c in hex_coordinates])
         return Coordinate((minX + maxX) / 2, (minY + maxY) / 2)
 
-    def render_hex_value(self, hex: "Hex") -> None:
-        if hex.value is not None:
-            center = self.get_hex_center(hex.id)
-
-            self.draw_text(center.x, center.y, str(hex.value))
+    def render_hex(self, hex: "Hex") -> None:
+        self.hex_polygons[hex.id].set("fill", RESOURCE_COLOR_MAP[hex.resourceType])
+        self.hex_values[hex.id].text = str(hex.value) if hex.value is not None else ""
 
     def render_vertex(self, vertex: "Vertex") -> None:
-        vertex_element = self.root.find(f".//*[@id='Vertex{vertex.id}']")
-
-        if vertex_element is not None:
-            polygon = vertex_element.find("svg:polygon", self.namespace)
-            if polygon is not None:
-                if vertex.piece is not None:
-                    color = vertex.piece.player.color
-                else:
-                    color = "transparent"
-                polygon.set("fill", color)
-
-            path = vertex_element.find("svg:path", self.namespace)
-            if path is not None:
-                if vertex.piece is None:
-                    path.set("opacity", "0")
-                else:
-                    path.set("opacity", "1")
-                    if vertex.piece.type == PieceType.CITY:
-                        path.set("stroke-width", "5")
-                        path.set("stroke", "black")
-            else:
-                raise ValueError(
-                    f"Polygon not found inside element with id='Vertex{vertex.id}'"
-                )
+        polygon = self.vertex_polygons[vertex.id]
+        path = self.vertex_paths[vertex.id]
+        if vertex.piece is None:
+            polygon.set("fill", "transparent")
+            path.set("opacity", "0")
         else:
-            raise ValueError(f"Element with id='Vertex{vertex.id}' not found")
-
-    def set_hex_color(self, hexId: int, color: str) -> None:
-        hex_element = self.root.find(f".//*[@id='Hex{hexId}']")
-
-        if hex_element is not None:
-            polygon = hex_element.find("svg:polygon", self.namespace)
-            if polygon is not None:
-                polygon.set("fill", color)
-            else:
-                raise ValueError(
-                    f"Polygon not found inside element with id='Hex{hexId}'"
-                )
+            polygon.set("fill", vertex.piece.player.color)
+            path.set("opacity", "1")
+        if vertex.piece is not None and vertex.piece.type == PieceType.CITY:
+            path.set("stroke-width", "5")
+            path.set("stroke", "black")
         else:
-            raise ValueError(f"Element with id='Hex{hexId}' not found")
+            path.attrib.pop("stroke-width", None)
+            path.attrib.pop("stroke", None)
 
     def render_robber(self, hexId: int):
-        robber_element = self.root.find(".//*[@id='Robber']")
-        if robber_element is None:
-            raise ValueError("Element with id='Robber' not found")
-
-        paths = robber_element.findall("svg:path", self.namespace)
         center = self.get_hex_center(hexId)
 
-        for path in paths:
-            current_d = path.get("d")
-            if current_d is not None:
-                # The current d starts with an M command, so we need to remove it
-                current_d = re.sub(
+        for path, original_d in self.robber_paths:
+            # The current d starts with an M command, so we need to remove it
+            path.set(
+                "d",
+                re.sub(
                     r"M[\d\.]+,[\d\.]+",
-                    f"M{round(center.x + 20,2)},{round(center.y + 20,2)}",
-                    current_d,
-                )
-                path.set("d", current_d)
-            path.set("stroke", "black")
-            path.set("stroke-width", "1")
-            path.set("fill", "beige")
+                    f"M{round(center.x + 20, 2)},{round(center.y + 20, 2)}",
+                    original_d,
+                ),
+            )
@@ -0,0 +1,143 @@
+"""Offline rendering of recorded games.
+
+Each snapshot file written by ``record_turns`` is rendered by a worker
+process to one SVG frame per record, optionally rasterised to PNG, with a
+page to step through the frames. An index page links every game.
+"""
+
+from lib.gameplay.constants import COLORS
+from lib.gameplay.game import Game
+from lib.gameplay.snapshot import apply_board_diff, read_snapshots, restore
+from lib.visualizer.renderer import Renderer
+from lib.worker import init_worker
+from multiprocessing import Pool
+from typing import Any, Iterable, Union
+import html
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+
+def render_game(path: str, output_dir: str, rasterize: bool = False) -> dict[str, Any]:
+    """Render every snapshot in a file to ``output_dir`` and return a summary"""
+    records = read_snapshots(path)
+    os.makedirs(output_dir, exist_ok=True)
+    game: Union[Game, None] = None
+    renderer: Union[Renderer, None] = None
+    frames = []
+    for i, record in enumerate(records):
+        # A game is restored once and later records only add their pieces
+        if game is None or not apply_board_diff(game, records[i - 1], record):
+            game = restore(record)
+        if renderer is None:
+            renderer = Renderer(game, output_file=None)
+        # Only the elements that differ from the previous frame are updated
+        renderer.game = game
+        renderer.update()
+        frame = f"frame_{i:05d}.svg"
+        with open(os.path.join(output_dir, frame), "w") as f:
+            f.write(renderer.to_svg())
+        if rasterize:
+            frame = rasterize_frame(os.path.join(output_dir, frame))
+        frames.append(frame)
+
+    winner = int(records[-1]["winning_player"]) if len(records) > 0 else -1
+    summary = {
+        "name": os.path.basename(output_dir),
+        "source": path,
+        "frames": frames,
+        "turns": int(records[-1]["turn_number"]) if len(records) > 0 else 0,
+        "winner": COLORS[winner] if winner >= 0 else None,
+    }
+    with open(os.path.join(output_dir, "index.html"), "w") as f:
+        f.write(game_page(summary))
+    return summary
+
+
+def rasterize_frame(svg_path: str) -> str:
+    try:
+        import cairosvg  # type: ignore[import-not-found]
+    except ImportError as e:
+        raise ImportError(
+            "Rasterising frames needs cairosvg: pip install cairosvg"
+        ) from e
+
+    png_path = svg_path.removesuffix(".svg") + ".png"
+    cairosvg.svg2png(url=svg_path, write_to=png_path)
+    return os.path.basename(png_path)
+
+
+def _render_task(task: tuple[str, str, bool]) -> dict[str, Any]:
+    path, output_dir, rasterize = task
+    try:
+        return render_game(path, output_dir, rasterize)
+    except Exception as e:
+        logger.error(f"Rendering {path} failed: {e}")
+        return {"name": os.path.basename(output_dir), "source": path, "error": str(e)}
+
+
+def render_replays(
+    paths: Iterable[str],
+    output_dir: str,
+    processes: Union[int, None] = None,
+    rasterize: bool = False,
+) -> list[dict[str, Any]]:
+    """Render snapshot files in parallel and write an index page linking them"""
+    tasks = []
+    for path in paths:
+        name = os.path.splitext(os.path.basename(path))[0]
+        tasks.append((path, os.path.join(output_dir, name), rasterize))
+    os.makedirs(output_dir, exist_ok=True)
+    with Pool(processes, initializer=init_worker) as pool:
+        summaries = pool.map(_render_task, tasks)
+    with open(os.path.join(output_dir, "index.html"), "w") as f:
+        f.write(index_page(summaries))
+    logger.info(f"Rendered {len(summaries)} games to {output_dir}")
+    return summaries
+
+
+def index_page(summaries: list[dict[str, Any]]) -> str:
+    rows = "".join(
+        f"<tr><td><a href='{html.escape(s['name'])}/index.html'>{html.escape(s['name'])}</a></td>"
+        f"<td>{s.get('winner') or ''}</td><td>{s.get('turns', '')}</td>"
+        f"<td>{len(s.get('frames', []))}</td><td>{html.escape(s.get('error', ''))}</td></tr>"
+        for s in summaries
+    )
+    return (
+        "<!DOCTYPE html><html><head><title>Replays</title></head><body>"
+        "<table><tr><th>Game</th><th>Winner</th><th>Turns</th><th>Frames</th><th>Error</th></tr>"
+        f"{rows}</table></body></html>"
+    )
+
+
+def game_page(summary: dict[str, Any]) -> str:
+    frames = json.dumps(summary["frames"])
+    return f"""<!DOCTYPE html>
+<html>
+<head><title>{html.escape(summary["name"])}</title></head>
+<body>
+    <a href="../index.html">Back</a>
+    <h1>{html.escape(summary["name"])}: {summary["winner"] or "no winner"} after {summary["turns"]} turns</h1>
+    <input id="frame" type="range" min="0" max="{max(len(summary["frames"]) - 1, 0)}" value="0" />
+    <span id="label"></span>
+    <div><img id="board" style="max-width: 100%;" /></div>
+    <script>
+        const frames = {frames};
+        const slider = document.getElementById("frame");
+        function show() {{
+            document.getElementById("board").src = frames[slider.value];
+            document.getElementById("label").textContent = `Frame ${{slider.value}}`;
+        }}
+        slider.oninput = show;
+        document.onkeydown = (event) => {{
+            if (event.key === "ArrowRight") slider.value = Number(slider.value) + 1;
+            if (event.key === "ArrowLeft") slider.value = Number(slider.value) - 1;
+            show();
+        }};
+        if (frames.length > 0) show();
+    </script>
+</body>
+</html>
+"""
@@ -0,0 +1,71 @@
+"""Minimal entry point for simulation-only worker processes.
+
+Importing this module only loads the game engine and NumPy; MongoDB,
+matplotlib, optuna and the visualizer are never imported.
+"""
+
+from lib.gameplay.game import Game
+from lib.gameplay.params import DEFAULT_PARAMETERS, GameParameters
+from lib.logging.database import MongoLogger
+from typing import Any, Callable, Union
+import logging
+import random
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Each worker process reuses one game instead of rebuilding every object
+_game: Union[Game, None] = None
+
+
+def init_worker(log_level: int = logging.WARNING) -> None:
+    """Process pool initializer: quiet logging and no database writes"""
+    logging.basicConfig(level=log_level)
+    MongoLogger.disable()
+
+
+def play_game(
+    parameters: Union[GameParameters, list[GameParameters]] = DEFAULT_PARAMETERS,
+    seed: Union[int, None] = None,
+    experiment_id: Union[str, None] = None,
+    setup: Union[Callable[[Game], None], None] = None,
+) -> dict[str, Any]:
+    """Play one game and return its outcome as plain data.
+
+    The game of the previous call is reset and played again. A game that
+    raised is thrown away, as cards may be lost mid action. ``setup`` is
+    called with the game before it is played.
+    """
+    global _game
+    if _game is None:
+        if seed is not None:
+            random.seed(seed)
+            np.random.seed(seed)
+        _game = Game(parameters=parameters, experiment_id=experiment_id)
+    else:
+        _game.reset(seed, parameters)
+        _game.experiment_id = experiment_id
+    game = _game
+    if setup is not None:
+        setup(game)
+    try:
+        game.play()
+    except Exception as e:
+        logger.error(f"Game failed: {e}")
+        _game = None
+        return {"seed": seed, "winner": None, "points": [], "turns": None}
+    return game_outcome(game, seed)
+
+
+def current_game() -> Union[Game, None]:
+    """The game of the last call to play_game, None if it failed"""
+    return _game
+
+
+def game_outcome(game: Game, seed: Union[int, None] = None) -> dict[str, Any]:
+    return {
+        "seed": seed,
+        "winner": game.winning_player.id if game.winning_player else None,
+        "points": [player.points() for player in game.players],
+        "turns": game.turn_number,
+    }
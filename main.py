@@ -49,6 +49,42 @@ def main():
         help="Delay in seconds before the script proceeds.",
     )
 
+    parser.add_argument(
+        "--precision",
+        type=float,
+        default=None,
+        help="Stop win_stats once every win rate interval is this narrow (half width)",
+    )
+    parser.add_argument(
+        "--stop-on-difference",
+        action="store_true",
+        help="Stop win_stats once one player wins significantly more often",
+    )
+
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Seed of the first game, seeded game outcomes are cached",
+    )
+    parser.add_argument(
+        "--cache",
+        default="output/results.sqlite",
+        help="SQLite file caching the outcomes of seeded games",
+    )
+
+    parser.add_argument(
+        "--paired",
+        action="store_true",
+        help="Evaluate a study against the defaults on the same seeds",
+    )
+
+    parser.add_argument(
+        "--replay-spool",
+        action="store_true",
+        help="Insert logs spooled while MongoDB was unreachable and exit",
+    )
+
     subparsers = parser.add_subparsers(dest="command", required=False)
 
     # Add 'play' subcommand
@@ -100,8 +136,29 @@ def main():
         help="Visualize the action graphs",
     )
 
+    # Add 'replay' subcommand
+    replay_parser = subparsers.add_parser(
+        "replay", help="Render recorded snapshot files to frames"
+    )
+    replay_parser.add_argument(
+        "snapshots", nargs="+", help="Snapshot files, one game per file"
+    )
+    replay_parser.add_argument(
+        "--output", "-o", default="output/replays", help="Output directory"
+    )
+    replay_parser.add_argument(
+        "--processes", "-p", type=int, default=None, help="Worker processes"
+    )
+    replay_parser.add_argument(
+        "--png", action="store_true", help="Rasterise frames (needs cairosvg)"
+    )
+
     args = parser.parse_args()
 
+    if args.replay_spool:
+        MongoLogger.replay_spool()
+        return
+
     MongoLogger.initialize()
 
     # Configure logger
@@ -111,23 +168,50 @@ def main():
     )
 
     if args.experiment:
+        cache = None
+        if args.seed is not None:
+            from lib.experiments.result_cache import ResultCache
+
+            cache = ResultCache(args.cache)
         for experiment in args.experiment:
             if experiment == "win_stats":
                 from lib.experiments.win_stats import win_stats
 
-                win_stats(100)
+                win_stats(
+                    100,
+                    target_half_width=args.precision,
+                    stop_on_difference=args.stop_on_difference,
+                    seed=args.seed,
+                    cache=cache,
+                )
             elif experiment == "optimize_orange":
                 from lib.experiments.optimize_orange import optimize_orange
 
                 study_name = args.study_name
 
                 if study_name is not None:
-                    optimize_orange(100, mode="evaluate", study_name=study_name)
+                    optimize_orange(
+                        100,
+                        mode="paired" if args.paired else "evaluate",
+                        study_name=study_name,
+                        seed=args.seed,
+                        cache=cache,
+                    )
                 else:
-                    optimize_orange(1000)
+                    optimize_orange(1000, seed=args.seed, cache=cache)
+            elif experiment == "heatmap":
+                from lib.experiments.heatmap import collect_heatmaps
+
+                collect_heatmaps(1000)
             else:
                 logger.error(f"Unknown experiment: {experiment}")
 
+    if args.command == "replay":
+        from lib.visualizer.replay import render_replays
+
+        render_replays(args.snapshots, args.output, args.processes, args.png)
+        return
+
     # Handle the 'play' command
     if args.command == "play":
         game = Game(num_players=args.num_players, game_delay=args.delay)
@@ -165,6 +249,8 @@ def main():
                 game.step()
             else:
                 game.step()
+            # Frames are throttled, so show the end of every step
+            renderer.flush()
 
 
 if __name__ == "__main__":
@@ -1,12 +1,13 @@
-from livereload import Server
-from flask import Flask, send_file, make_response
+from flask import Flask, Response, abort, send_file
+from lib.gameplay.game import Game
+from lib.visualizer.live import LiveGame
+import logging
 
 # Create Flask app first
 app = Flask(__name__)
-app.debug = True
 
-# Initialize the server with the Flask app
-server = Server(app.wsgi_app)
+# The game is played in this process and streamed to the page as it changes
+live = LiveGame(Game(), new_game=Game)
 
 
 @app.route("/index.css")
@@ -14,25 +15,42 @@ def serve_index_css():
     return send_file("index.css")
 
 
-# Add custom route to the Flask app, not the server
-@app.route("/<color>")
-def serve_red(color: str):
-    response = make_response(send_file(f"action_graph_{color}.html"))
-    response.headers["Content-Type"] = "text/html"
-    return response
-
-
 @app.route("/")
 def serve_index():
-    return send_file("index.html")
+    return live.page()
+
+
+@app.route("/events")
+def serve_events():
+    return Response(
+        live.stream(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 
+@app.route("/step", methods=["POST"])
+def step():
+    live.step()
+    return "", 204
+
+
+@app.route("/restart", methods=["POST"])
+def restart():
+    live.restart()
+    return "", 204
+
+
+# The actions each player of the live game computed on its last turn
+@app.route("/<color>")
+def serve_action_graph(color: str):
+    page = live.action_graph_page(color)
+    if page is None:
+        abort(404)
+    return page
 
-# Watch the specified HTML files for changes
-server.watch("index.html")
-server.watch("action_graph_red.html")
-server.watch("action_graph_orange.html")
-server.watch("action_graph_white.html")
-server.watch("action_graph_blue.html")
 
-# Serve files from the current directory on port 5500
-server.serve(root=".", port=5500)
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    # Serve on port 5500, one thread per open event stream
+    app.run(port=5500, threaded=True)
@@ -1,36 +1,39 @@
+from lib.logging.queries import cost_by_turn_pipeline, run_pipeline
 from pymongo import MongoClient
+import argparse
 import matplotlib.pyplot as plt
-import pandas as pd
+
+parser = argparse.ArgumentParser(description="Plot action cost by turn number")
+parser.add_argument("--action", default="BUILD_SETTLEMENT")
+parser.add_argument("--experiment", default=None, help="Only logs of this experiment")
+parser.add_argument("--bucket", type=int, default=1, help="Turns per point")
+parser.add_argument("--batch-size", type=int, default=1000)
+args = parser.parse_args()
 
 # Connect to the local MongoDB instance
 client = MongoClient("mongodb://localhost:27017/")
 db = client["catan"]
-collection = db["action_logs"]
-
-# Query the collection
-query = {"action": "BUILD_SETTLEMENT"}
-fields = {"cost": 1, "turn_number": 1, "player_id": 1, "_id": 0}
-
-cursor = collection.find(query, fields)
 
-# Convert to a DataFrame for easy manipulation (optional but convenient)
-df = pd.DataFrame(list(cursor))
+# Grouping runs in the database, only one row per player and turn comes back
+pipeline = cost_by_turn_pipeline(args.action, args.experiment, args.bucket)
+by_player: dict[int, tuple[list[int], list[float], list[float], list[float]]] = {}
+for row in run_pipeline(db, "action_logs", pipeline, args.batch_size):
+    turns, means, mins, maxs = by_player.setdefault(row["player_id"], ([], [], [], []))
+    turns.append(row["turn"])
+    means.append(row["mean_cost"])
+    mins.append(row["min_cost"])
+    maxs.append(row["max_cost"])
 
 # If the query returned no documents, ensure we have data before proceeding
-if df.empty:
-    print("No documents found for action = BUILD_SETTLEMENT.")
+if not by_player:
+    print(f"No documents found for action = {args.action}.")
     exit(0)
 
-# Group by player_id
-grouped = df.groupby("player_id")
-
-# Create one scatter plot per player_id
-for player_id, group_data in grouped:
-    # Sort by turn_number if desired (not strictly necessary)
-    group_data = group_data.sort_values("turn_number")
-
+# Create one plot per player_id
+for player_id, (turns, means, mins, maxs) in by_player.items():
     plt.figure(figsize=(8, 6))
-    plt.scatter(group_data["turn_number"], group_data["cost"], alpha=0.7)
+    plt.fill_between(turns, mins, maxs, alpha=0.3)
+    plt.plot(turns, means)
     plt.title(f"Cost vs Turn Number for Player ID: {player_id}")
     plt.xlabel("Turn Number")
     plt.ylabel("Cost")
@@ -0,0 +1,86 @@
+from lib.experiments.aggregator import ResultAggregator, RunningMoments, wilson_interval
+import pytest
+import random
+import statistics
+
+PLAYERS = ["red", "blue", "white", "orange"]
+
+
+@pytest.mark.aggregator
+def test_wilson_interval() -> None:
+    assert wilson_interval(0, 0, 1.96) == (0.0, 1.0)
+    # Reference values from Newcombe (1998)
+    assert wilson_interval(81, 263, 1.959964) == pytest.approx(
+        (0.2553, 0.3662), abs=1e-4
+    )
+    assert wilson_interval(5, 10, 1.96) == pytest.approx((0.2366, 0.7634), abs=1e-4)
+    low, high = wilson_interval(0, 10, 1.96)
+    assert low == 0.0
+    assert high == pytest.approx(0.2775, abs=1e-4)
+
+
+@pytest.mark.aggregator
+def test_running_moments() -> None:
+    rng = random.Random(1)
+    values = [rng.gauss(50, 12) for _ in range(500)]
+    moments = RunningMoments()
+    assert moments.variance == 0.0
+    for value in values:
+        moments.add(value)
+    assert moments.count == len(values)
+    assert moments.mean == pytest.approx(statistics.mean(values))
+    assert moments.variance == pytest.approx(statistics.variance(values))
+    assert moments.std == pytest.approx(statistics.stdev(values))
+
+
+@pytest.mark.aggregator
+def test_precision_reached() -> None:
+    aggregator = ResultAggregator(PLAYERS, target_half_width=0.05, min_games=20)
+    for i in range(10):
+        aggregator.add(PLAYERS[i % 4], 100)
+    assert not aggregator.precision_reached()
+    assert not aggregator.should_stop()
+    for i in range(390):
+        aggregator.add(PLAYERS[i % 4], 100)
+    assert aggregator.precision_reached()
+    assert aggregator.should_stop()
+    assert aggregator.turns.mean == 100
+
+    assert not ResultAggregator(PLAYERS).precision_reached()
+
+
+@pytest.mark.aggregator
+def test_difference_found() -> None:
+    aggregator = ResultAggregator(PLAYERS, stop_on_difference=True, min_games=20)
+    for _ in range(10):
+        aggregator.add("red", 80)
+    # Red won every game, but too few games were played to stop
+    assert aggregator.difference_found()
+    assert not aggregator.should_stop()
+    for i in range(30):
+        aggregator.add("red" if i % 3 else PLAYERS[1 + i % 3], 80)
+    assert aggregator.leader() == "red"
+    assert aggregator.difference_found()
+    assert aggregator.should_stop()
+
+    balanced = ResultAggregator(PLAYERS, stop_on_difference=True, min_games=20)
+    for i in range(40):
+        balanced.add(PLAYERS[i % 4], 80)
+    assert not balanced.difference_found()
+    assert not balanced.should_stop()
+
+    not_enabled = ResultAggregator(PLAYERS, min_games=0)
+    not_enabled.add("red", 80)
+    assert not not_enabled.difference_found()
+
+
+@pytest.mark.aggregator
+def test_failed_games() -> None:
+    aggregator = ResultAggregator(PLAYERS)
+    aggregator.add(None, None)
+    aggregator.add("green", 90)
+    summary = aggregator.summary()
+    assert summary["games"] == 2
+    assert summary["failed"] == 1
+    assert summary["win_rates"]["green"]["wins"] == 1
+    assert summary["turns"]["count"] == 1
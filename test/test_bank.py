@@ -4,6 +4,7 @@ from lib.gameplay.bank import Bank
 from lib.gameplay.game import Game
 from lib.gameplay.hex import ResourceType
 from lib.gameplay.params import DEFAULT_PARAMETERS
+from lib.gameplay.pieces import CardType
 from lib.gameplay.player import Player
 
 
@@ -186,3 +187,46 @@ def test_buy_dev_card() -> None:
     assert len(bank.wheat_cards) == DEFAULT_PARAMETERS["num_cards_per_resource"]
     assert len(bank.ore_cards) == DEFAULT_PARAMETERS["num_cards_per_resource"]
     assert len(bank.dev_cards) == 24
+
+
+@pytest.mark.bank
+def test_dev_card_deck() -> None:
+    bank = Bank(include_progress_cards=False)
+    order = bank.dev_cards
+    assert bank.num_dev_cards() == 19
+    assert bank.dev_card_counts[CardType.KNIGHT] == 14
+
+    # Draws come off the top of the shuffled deck
+    assert bank.get_dev_card() is order[0]
+    assert bank.get_dev_card() is order[1]
+
+    card = bank.get_dev_card(CardType.VICTORY_POINT)
+    assert card.cardType == CardType.VICTORY_POINT
+    assert bank.num_dev_cards() == 16
+    assert sum(bank.dev_card_counts.values()) == 16
+
+    card.flip()
+    bank.return_dev_card(card)
+    assert bank.dev_cards[0] is card
+    assert not card.flipped
+    assert bank.num_dev_cards() == 17
+    assert len(bank.deck) == 19
+
+    # Returned cards reuse the slots of drawn cards
+    for _ in range(10):
+        bank.return_dev_card(bank.get_dev_card())
+    assert bank.num_dev_cards() == 17
+    assert len(bank.deck) == 19
+
+    while bank.dev_card_counts[CardType.KNIGHT] > 0:
+        bank.get_dev_card(CardType.KNIGHT)
+    with pytest.raises(ValueError):
+        bank.get_dev_card(CardType.KNIGHT)
+    assert all(c.cardType == CardType.VICTORY_POINT for c in bank.dev_cards)
+
+    bank.dev_cards = []
+    with pytest.raises(ValueError):
+        bank.get_dev_card()
+
+    bank.reset()
+    assert bank.num_dev_cards() == 19
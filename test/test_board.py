@@ -4,6 +4,7 @@ from lib.gameplay.board import Board
 from lib.gameplay.game import Game
 from lib.gameplay.player import Player
 from lib.gameplay.pieces import PieceType
+from lib.gameplay.topology import EDGE_VERTICES
 import random
 
 
@@ -317,3 +318,86 @@ def test_shortest_path() -> None:
     board.place_settlement(player2, 17)
     shortest_path = board.shortest_path(player1, 17)
     assert shortest_path is None
+
+
+@pytest.mark.board
+def test_robber_blocking() -> None:
+    game = Game()
+    board = game.board
+    red, blue = game.players[0], game.players[1]
+    likelihood = board.tables.hex_likelihood
+
+    def expected(player: Player) -> list[float]:
+        values = [0.0] * len(board.hexes)
+        for piece in player.get_active_settlements() + player.get_active_cities():
+            assert piece.vertex is not None
+            weight = 1 if piece.type == PieceType.SETTLEMENT else 2
+            for hex in piece.vertex.hexes:
+                values[hex.id] += weight * likelihood[hex.id]
+        return values
+
+    assert board.blocking[red.id].tolist() == pytest.approx(expected(red))
+    board.place_city(red, 10)
+    assert board.blocking[red.id].tolist() == pytest.approx(expected(red))
+
+    scores = board.robber_scores(red, blue)
+    for hex in board.hexes:
+        if board.blocking[red.id, hex.id] > 0 or hex.id == board.robberLoc:
+            assert scores[hex.id] == 0
+        else:
+            assert scores[hex.id] == board.blocking[blue.id, hex.id]
+
+    hex, victim = red.get_hex_and_player_to_rob(board, game.bank)
+    assert victim is not None and victim != red
+    assert board.blocking[red.id, hex.id] == 0
+    assert board.blocking[victim.id, hex.id] > 0
+
+    game.reset()
+    assert board.blocking[red.id].tolist() == pytest.approx(expected(red))
+
+
+@pytest.mark.board
+def test_road_network() -> None:
+    game = Game()
+    board = Board()
+    red, blue = Player(1, "red", game), Player(2, "blue", game)
+
+    board.place_settlement(red, 0)
+    for edge in [0, 1, 2]:
+        board.place_road(red, edge)
+    network = board.network(red)
+    assert network.connected(0, 2)
+    assert len(network.networks()) == 1
+
+    # A blue settlement where roads 1 and 2 meet splits the road in two
+    (shared,) = set(EDGE_VERTICES[1]) & set(EDGE_VERTICES[2])
+    board.place_settlement(blue, shared)
+    assert network.connected(0, 1)
+    assert not network.connected(1, 2)
+    assert len(network.networks()) == 2
+    assert 2 not in board.network(blue).frontier
+
+
+@pytest.mark.board
+def test_road_frontier() -> None:
+    game = Game()
+    board = game.board
+    random.seed(3)
+    for _ in range(40):
+        for player in game.players:
+            expected = [
+                edge.id
+                for edge in board.edges
+                if edge.piece is None and edge.player_is_connected(player)
+            ]
+            assert [e.id for e in board.get_possible_road_locations(player)] == expected
+            settle = [
+                v.id
+                for v in board.vertices
+                if v.player_is_connected(player) and board.can_settle(v.id)
+            ]
+            assert board.possible_settlement_locations(player) == settle
+            if len(expected) > 0 and player.get_unplaced_road() is not None:
+                board.place_road(player, random.choice(expected))
+            if len(settle) > 0 and player.get_unplaced_settlement() is not None:
+                board.place_settlement(player, random.choice(settle))
@@ -0,0 +1,157 @@
+from lib.logging.database import DUPLICATE_KEY, MongoLogger
+from pathlib import Path
+from typing import Any, Callable, Iterator
+import json
+import os
+import pytest
+import sys
+import types
+
+
+class BulkWriteError(Exception):
+    def __init__(self, details: dict[str, Any]):
+        super().__init__("batch op errors occurred")
+        self.details = details
+
+
+class FakeCollection:
+    def __init__(self, server: "FakeServer"):
+        self.server = server
+        self.documents: dict[str, dict[str, Any]] = {}
+        self.indexes: list[list[tuple[str, int]]] = []
+
+    def create_index(self, keys: list[tuple[str, int]]) -> None:
+        self.indexes.append(keys)
+
+    def insert_many(self, documents: list[dict[str, Any]], ordered: bool = True):
+        if self.server.fail_after is not None:
+            if self.server.fail_after == 0:
+                raise ConnectionError("connection lost")
+            self.server.fail_after -= 1
+        errors = []
+        for document in documents:
+            if document["_id"] in self.documents:
+                errors.append({"code": DUPLICATE_KEY})
+            else:
+                self.documents[document["_id"]] = document
+        if errors:
+            raise BulkWriteError({"writeErrors": errors})
+
+
+class FakeServer:
+    def __init__(self, up: bool = True):
+        self.up = up
+        self.fail_after: Any = None
+        self.timeouts: list[int] = []
+        self.collections: dict[str, FakeCollection] = {}
+
+    def module(self) -> types.ModuleType:
+        """A pymongo module whose clients connect to this server"""
+        server = self
+
+        class Admin:
+            def command(self, name: str) -> None:
+                if not server.up:
+                    raise TimeoutError("No servers found yet")
+
+        class Database:
+            def __getitem__(self, name: str) -> FakeCollection:
+                return server.collections.setdefault(name, FakeCollection(server))
+
+        class MongoClient:
+            def __init__(self, _: str, serverSelectionTimeoutMS: int):
+                server.timeouts.append(serverSelectionTimeoutMS)
+                self.admin = Admin()
+
+            def __getitem__(self, _: str) -> Database:
+                return Database()
+
+        module = types.ModuleType("pymongo")
+        errors = types.ModuleType("pymongo.errors")
+        errors.BulkWriteError = BulkWriteError  # type: ignore[attr-defined]
+        module.MongoClient = MongoClient  # type: ignore[attr-defined]
+        module.errors = errors  # type: ignore[attr-defined]
+        return module
+
+
+@pytest.fixture
+def mongo(monkeypatch: pytest.MonkeyPatch) -> Iterator[Callable[[bool], FakeServer]]:
+    """Install a fake pymongo and a fresh MongoLogger, returning the server"""
+    server = FakeServer()
+
+    def install(up: bool) -> FakeServer:
+        server.up = up
+        module = server.module()
+        monkeypatch.setitem(sys.modules, "pymongo", module)
+        monkeypatch.setitem(sys.modules, "pymongo.errors", module.errors)
+        return server
+
+    for name in ["_instance", "_client", "_db", "_spool", "_spool_path"]:
+        monkeypatch.setattr(MongoLogger, name, None)
+    monkeypatch.setattr(MongoLogger, "_disabled", False)
+    yield install
+    if MongoLogger._spool is not None:
+        MongoLogger._spool.close()
+
+
+def spool_lines(path: Path) -> list[dict[str, Any]]:
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.mark.database
+def test_spool_when_unreachable(
+    mongo: Callable[[bool], FakeServer], tmp_path: Path
+) -> None:
+    server = mongo(False)
+    spool = tmp_path / "spool.jsonl"
+    MongoLogger.initialize(spool_path=str(spool), timeout_ms=5)
+    assert server.timeouts == [5]
+    assert MongoLogger._db is None
+
+    MongoLogger.log("action_logs", {"game_id": "a", "action": 1})
+    MongoLogger.log("game_logs", {"game_id": "a", "winning_player": 2})
+    lines = spool_lines(spool)
+    assert [line["collection"] for line in lines] == ["action_logs", "game_logs"]
+    assert lines[1]["data"] == {"game_id": "a", "winning_player": 2}
+
+    # Replaying while the server is still down keeps the spool
+    assert MongoLogger.replay_spool(str(spool), timeout_ms=5) == 0
+    assert server.timeouts == [5, 5]
+    assert spool.exists()
+
+    mongo(True)
+    assert MongoLogger.replay_spool(str(spool), timeout_ms=5) == 2
+    assert not spool.exists()
+    assert MongoLogger._spool is None
+    documents = list(server.collections["action_logs"].documents.values())
+    assert documents[0]["action"] == 1
+    assert documents[0]["timestamp"].isoformat() == lines[0]["timestamp"]
+    assert len(server.collections["game_logs"].documents) == 1
+    assert [("game_id", 1)] in server.collections["action_logs"].indexes
+
+
+@pytest.mark.database
+def test_replay_after_failure(
+    mongo: Callable[[bool], FakeServer], tmp_path: Path
+) -> None:
+    server = mongo(False)
+    spool = tmp_path / "spool.jsonl"
+    MongoLogger.initialize(spool_path=str(spool), timeout_ms=5)
+    for i in range(10):
+        MongoLogger.log("action_logs", {"game_id": "a", "turn_number": i})
+
+    server = mongo(True)
+    server.fail_after = 2
+    with pytest.raises(ConnectionError):
+        MongoLogger.replay_spool(str(spool), batch_size=3)
+    assert len(server.collections["action_logs"].documents) == 6
+    assert os.path.exists(spool)
+
+    server.fail_after = None
+    assert MongoLogger.replay_spool(str(spool), batch_size=3) == 10
+    turns = [
+        document["turn_number"]
+        for document in server.collections["action_logs"].documents.values()
+    ]
+    assert sorted(turns) == list(range(10))
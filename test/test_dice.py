@@ -1,5 +1,6 @@
 import pytest
 from lib.gameplay.dice import Dice
+import random
 
 
 @pytest.mark.dice
@@ -13,3 +14,21 @@ def test_dice() -> None:
         assert 1 <= dice.dice[1] <= 6
         assert dice.total == sum(dice.dice)
         assert dice.get_dice() == [dice.dice[0], dice.dice[1]]
+
+
+@pytest.mark.dice
+def test_dice_rng() -> None:
+    """The dice roll from their own generator"""
+    dice = Dice()
+    dice.reseed(7)
+    rolls = [list(dice.roll()) for _ in range(20)]
+    dice.reseed(7)
+    for roll in rolls:
+        random.random()
+        assert dice.roll() == roll
+
+    random.seed(3)
+    first = Dice()
+    random.seed(3)
+    second = Dice()
+    assert [first.roll()[:] for _ in range(5)] == [second.roll()[:] for _ in range(5)]
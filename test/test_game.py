@@ -3,10 +3,16 @@ from lib.gameplay.game import Game
 from lib.gameplay.bank import Bank
 from lib.gameplay.board import Board
 from lib.gameplay.dice import Dice
+from lib.gameplay.events import Event, EventBus, GameEvent
 from lib.gameplay.player import Player
 from lib.gameplay.hex import ResourceType
+from lib.gameplay.layout import DEFAULT_LAYOUT, generate_layout
 from lib.gameplay.pieces import CardType
+from lib.gameplay.snapshot import to_bytes
 import copy
+import random
+
+import numpy as np
 
 
 class FakeDice(Dice):
@@ -280,3 +286,63 @@ def test_can_place_city() -> None:
 
     assert not board.can_place_city(player, 19)
     assert not board.can_place_city(player, 38)
+
+
+@pytest.mark.game
+def test_reset() -> None:
+    random.seed(5)
+    np.random.seed(5)
+    expected = to_bytes(Game(placement="draft"))
+
+    game = Game(layout=generate_layout(1))
+    board = game.board
+    for _ in range(40):
+        game.step()
+        game.turn_number += 1
+    game.reset(5, layout=DEFAULT_LAYOUT)
+
+    assert game.board is board
+    assert game.turn_number == 0
+    assert game.winning_player is None
+    assert to_bytes(game) == expected
+    assert len(game.bank.dev_cards) == 19
+    assert not any(card.flipped for card in game.bank.dev_cards)
+    assert sum(game.bank.resource_counts().values()) + sum(
+        len(player.resources) for player in game.players
+    ) == 5 * game.bank.num_cards_per_resource
+    for player in game.players:
+        assert len(player.get_active_settlements()) == 2
+        assert len(player.get_active_roads()) == 2
+
+
+@pytest.mark.game
+def test_events() -> None:
+    random.seed(1)
+    np.random.seed(1)
+    game = Game()
+    assert not game.events.has_subscribers(GameEvent.MOVE_ROBBER)
+
+    builds: list[Event] = []
+    rolls: list[int] = []
+    legacy: list[GameEvent] = []
+    game.events.subscribe(GameEvent.BUILD_SETTLEMENT, builds.append)
+    game.events.subscribe(GameEvent.BUILD_CITY, builds.append)
+    game.events.subscribe(GameEvent.ROLL_DICE, lambda event: rolls.append(event.value))
+    game.listen(legacy.append)
+    ends: list[Event] = []
+    game.events.subscribe(GameEvent.END_GAME, ends.append)
+    game.play()
+
+    assert len(rolls) == game.turn_number + 1
+    assert all(2 <= roll <= 12 for roll in rolls)
+    for event in builds:
+        assert event.player is not None and event.location is not None
+        assert game.board.vertices[event.location].piece.player == event.player
+    assert len(ends) == 1 and ends[0].player == game.winning_player
+    assert legacy[0] == GameEvent.START_GAME and legacy[-1] == GameEvent.END_GAME
+    assert legacy.count(GameEvent.ROLL_DICE) == len(rolls)
+
+    bus = EventBus()
+    bus.subscribe(GameEvent.MOVE_ROBBER, ends.append)
+    bus.unsubscribe(GameEvent.MOVE_ROBBER, ends.append)
+    assert not bus.has_subscribers(GameEvent.MOVE_ROBBER)
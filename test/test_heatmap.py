@@ -0,0 +1,65 @@
+import pytest
+import random
+
+import numpy as np
+from pathlib import Path
+
+from lib.experiments.heatmap import (
+    LAYERS,
+    HeatmapAccumulator,
+    collect_heatmaps,
+    heat_color,
+    heatmap_svg,
+)
+from lib.gameplay.events import GameEvent
+from lib.gameplay.game import Game
+from lib.worker import play_game
+
+
+@pytest.mark.heatmap
+def test_heatmap_accumulator(tmp_path: Path) -> None:
+    random.seed(1)
+    np.random.seed(1)
+    accumulator = HeatmapAccumulator()
+    game = Game()
+    accumulator.attach(game)
+    robber_moves = []
+    game.events.subscribe(GameEvent.MOVE_ROBBER, robber_moves.append)
+    pieces = 0
+    for _ in range(3):
+        game.reset()
+        game.play()
+        pieces += len(game.board.get_settlements())
+
+    counts = accumulator.counts
+    assert accumulator.games == 3
+    assert counts["settlements"].sum() + counts["cities"].sum() == pieces
+    assert counts["robber"].sum() == len(robber_moves)
+    for layer in ["settlements", "cities", "roads", "robber"]:
+        assert np.all(counts[f"win_{layer}"] <= counts[layer])
+    assert counts["win_settlements"].sum() + counts["win_cities"].sum() > 0
+    assert len(accumulator.robber_moves) == 0
+
+    path = str(tmp_path / "counts.npz")
+    accumulator.save(path)
+    loaded = HeatmapAccumulator.load(path)
+    loaded.merge(accumulator)
+    assert loaded.games == 6
+    for layer in LAYERS:
+        assert np.array_equal(loaded.counts[layer], 2 * counts[layer])
+
+    svg = heatmap_svg(accumulator, "roads")
+    assert heat_color(1.0) == "rgb(255,0,0)"
+    assert heat_color(1.0) in svg
+
+
+@pytest.mark.heatmap
+def test_collect_heatmaps(tmp_path: Path) -> None:
+    accumulator = collect_heatmaps(2, str(tmp_path))
+    assert accumulator.games == 2
+    assert accumulator.counts["roads"].sum() > 0
+    assert (tmp_path / "heatmap_win_robber.svg").exists()
+    # The worker keeps its game, later games are not counted
+    play_game()
+    assert accumulator.games == 2
+    assert accumulator.attached == {}
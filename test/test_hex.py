@@ -19,7 +19,8 @@ def test_hex() -> None:
     hex.attach_edge(1, edge)
 
     assert hex.edges[1] == edge
-    assert edge.hexes == {hex: 1}
+    assert edge.hexes == (hex,)
+    assert edge.hex_locations == (1,)
 
     with pytest.raises(ValueError):
         hex.attach_edge(1, Edge(2))
@@ -36,7 +37,8 @@ def test_hex() -> None:
 
     assert hex.vertices[2] == vertex
 
-    assert vertex.hexes == {hex: 2}
+    assert vertex.hexes == (hex,)
+    assert vertex.hex_locations == (2,)
 
     assert hex.get_settled_players() == []
     assert hex.get_settlements() == []
@@ -177,6 +179,11 @@ def test_edge() -> None:
     assert len(edge.hexes) == 2
     assert hex in edge.hexes
     assert hex2 in edge.hexes
+    assert edge.hex_locations == (3, 9)
+
+    # Elements are compared by identity, not by id
+    assert edge != Edge(1)
+    assert not hasattr(edge, "__dict__")
 
     with pytest.raises(ValueError):
         edge.attach_hex(hex3, 3)
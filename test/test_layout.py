@@ -0,0 +1,86 @@
+import pytest
+
+from lib.gameplay.board import Board
+from lib.gameplay.hex import ResourceType
+from lib.gameplay.layout import (
+    DEFAULT_LAYOUT,
+    LayoutCache,
+    NUMBER_TOKENS,
+    RESOURCE_TILES,
+    BoardLayout,
+    generate_layout,
+    has_adjacent_red_numbers,
+)
+from lib.gameplay.topology import HEX_NEIGHBORS, VERTEX_HEXES
+
+
+@pytest.mark.layout
+def test_topology() -> None:
+    assert all(1 <= len(hexes) <= 3 for hexes in VERTEX_HEXES)
+    assert HEX_NEIGHBORS[9] == (4, 5, 8, 10, 13, 14)
+    assert HEX_NEIGHBORS[0] == (1, 3, 4)
+
+
+@pytest.mark.layout
+def test_default_layout() -> None:
+    board = Board()
+
+    assert board.layout == DEFAULT_LAYOUT
+    assert board.robberLoc == 9
+    assert board.get_desert().resourceType is None
+    assert board.hexes[0].resourceType == ResourceType.ORE
+    assert board.hexes[0].value == 10
+    assert board.hexes[18].resourceType == ResourceType.SHEEP
+    assert board.hexes[18].value == 11
+
+
+@pytest.mark.layout
+def test_generate_layout() -> None:
+    for seed in range(20):
+        layout = generate_layout(seed)
+        assert sorted(layout.resources, key=str) == sorted(RESOURCE_TILES, key=str)
+        assert sorted(v for v in layout.values if v is not None) == NUMBER_TOKENS
+        assert layout.values[layout.desert] is None
+        assert not has_adjacent_red_numbers(layout.values)
+
+    assert generate_layout(1) == generate_layout(1)
+    assert hash(generate_layout(1)) == hash(generate_layout(1))
+    assert generate_layout(1) != generate_layout(2)
+
+    layout = generate_layout(3)
+    board = Board(layout)
+    assert board.robberLoc == layout.desert
+    assert board.get_desert().robber
+    for hex in board.hexes:
+        assert hex.resourceType == layout.resources[hex.id]
+        assert hex.value == layout.values[hex.id]
+
+
+@pytest.mark.layout
+def test_invalid_layout() -> None:
+    with pytest.raises(ValueError):
+        BoardLayout(DEFAULT_LAYOUT.resources[:-1], DEFAULT_LAYOUT.values[:-1])
+
+    with pytest.raises(ValueError):
+        BoardLayout([ResourceType.WOOD] * 19, DEFAULT_LAYOUT.values)
+
+
+@pytest.mark.layout
+def test_layout_tables() -> None:
+    cache = LayoutCache(max_size=2)
+    tables = cache.get(DEFAULT_LAYOUT)
+
+    assert cache.get(DEFAULT_LAYOUT) is tables
+    assert len(cache) == 1
+
+    # Vertex 10 touches ore 10, sheep 2 and brick 6
+    assert tables.vertex_pips[10] == 3 + 1 + 5
+    assert tables.vertex_production[10].sum() == pytest.approx(0.08 + 0.03 + 0.14)
+    assert tables.dice_index[8] == (11, 12)
+    assert tables.dice_index[7] == ()
+    assert tables.hex_pips[9] == 0
+
+    cache.get(generate_layout(1))
+    cache.get(generate_layout(2))
+    assert len(cache) == 2
+    assert cache.get(DEFAULT_LAYOUT) is not tables
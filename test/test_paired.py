@@ -0,0 +1,72 @@
+from lib.experiments.aggregator import PairedComparison
+from lib.experiments.paired import paired_evaluation, seat_parameters
+from lib.experiments.result_cache import ResultCache
+from lib.gameplay.events import Event, GameEvent
+from lib.gameplay.game import Game
+from lib.gameplay.params import DEFAULT_PARAMETERS, GameParameters
+from pathlib import Path
+import pytest
+
+
+def rolls(game: Game, seed: int, turns: int) -> list[int]:
+    totals: list[int] = []
+
+    def on_roll(event: Event) -> None:
+        totals.append(event.value)
+
+    game.events.subscribe(GameEvent.ROLL_DICE, on_roll)
+    game.reset(seed)
+    for _ in range(turns):
+        if game.step():
+            break
+        game.turn_number += 1
+    game.events.unsubscribe(GameEvent.ROLL_DICE, on_roll)
+    return totals
+
+
+@pytest.mark.paired
+def test_common_random_numbers() -> None:
+    candidate: GameParameters = {
+        **DEFAULT_PARAMETERS,
+        "road_building_reward": 0,
+        "city_building_cost": 5,
+    }
+    baseline_game = Game()
+    candidate_game = Game(parameters=seat_parameters(candidate, 3))
+    baseline_rolls = rolls(baseline_game, 5, 60)
+    candidate_rolls = rolls(candidate_game, 5, 60)
+    length = min(len(baseline_rolls), len(candidate_rolls))
+    assert length > 20
+    assert baseline_rolls[:length] == candidate_rolls[:length]
+    assert [card.cardType for card in baseline_game.bank.all_dev_cards] == [
+        card.cardType for card in candidate_game.bank.all_dev_cards
+    ]
+
+
+@pytest.mark.paired
+def test_paired_comparison() -> None:
+    comparison = PairedComparison(confidence=0.95)
+    assert comparison.interval("points") == (float("-inf"), float("inf"))
+    for baseline, candidate in [(5, 7), (6, 7), (10, 10), (4, 7)]:
+        comparison.add(
+            {"points": baseline, "wins": float(baseline >= 10)},
+            {"points": candidate, "wins": float(candidate >= 10)},
+        )
+    summary = comparison.summary()
+    assert summary["pairs"] == 4
+    assert summary["points"]["difference"] == pytest.approx(1.5)
+    assert summary["points"]["baseline"] == pytest.approx(6.25)
+    assert summary["wins"]["difference"] == 0
+    low, high = comparison.interval("points")
+    assert low < 1.5 < high
+
+
+@pytest.mark.paired
+def test_paired_evaluation(tmp_path: Path) -> None:
+    cache = ResultCache(str(tmp_path / "results.sqlite"))
+    comparison = paired_evaluation(3, DEFAULT_PARAMETERS, seed=11, cache=cache)
+    # The candidate is the baseline, so every pair is read back from the cache
+    assert (cache.misses, cache.hits) == (3, 3)
+    assert comparison.pairs + comparison.failed == 3
+    if comparison.pairs >= 2:
+        assert comparison.interval("points") == (0, 0)
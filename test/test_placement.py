@@ -0,0 +1,83 @@
+import pytest
+
+from lib.gameplay.game import Game
+from lib.gameplay.layout import LAYOUT_CACHE, generate_layout
+from lib.gameplay.placement import OpeningBook, production_score
+
+
+@pytest.mark.placement
+def test_draft_placement() -> None:
+    layout = generate_layout(7)
+    game = Game(num_players=6, layout=layout)
+
+    assert game.placement == "draft"
+    assert len(game.players) == 6
+
+    for player in game.players:
+        settlements = player.get_active_settlements()
+        roads = player.get_active_roads()
+        assert len(settlements) == 2
+        assert len(roads) == 2
+        # Every road touches one of the player's settlements
+        for road in roads:
+            edge = game.board.edges[road.position]
+            assert any(v.piece in settlements for v in edge.vertices())
+        # Starting resources come from the hexes around the second settlement
+        second = settlements[1].vertex
+        assert second is not None
+        producing = [h for h in second.get_hexes() if h.resourceType is not None]
+        assert len(player.resources) == len(producing)
+
+    # The first pick is the best vertex on the board
+    scores = production_score(LAYOUT_CACHE.get(layout))
+    first = game.players[0].get_active_settlements()[0]
+    assert scores[first.position] == scores.max()
+
+
+@pytest.mark.placement
+def test_fixed_placement() -> None:
+    assert Game().placement == "fixed"
+    assert Game(num_players=5).placement == "draft"
+    assert Game(placement="draft").players[0].get_active_settlements() != []
+
+    with pytest.raises(ValueError):
+        Game(num_players=5, placement="fixed")
+
+    with pytest.raises(ValueError):
+        Game(num_players=7)
+
+
+@pytest.mark.placement
+def test_opening_book(tmp_path: str) -> None:
+    book = OpeningBook()
+    layout = generate_layout(3)
+    game = Game(layout=layout, opening_book=book)
+
+    assert layout.key in book
+    assert len(book) == 1
+
+    path = f"{tmp_path}/book.json"
+    book.save(path)
+    loaded = OpeningBook.load(path)
+    scores, order = loaded.ranking(game.board.tables)
+    assert list(order) == list(book.ranking(game.board.tables)[1])
+
+    other = Game(layout=layout, opening_book=loaded)
+    for a, b in zip(game.players, other.players):
+        assert [s.position for s in a.settlements] == [
+            s.position for s in b.settlements
+        ]
+
+
+@pytest.mark.placement
+def test_opening_book_bound() -> None:
+    book = OpeningBook(max_size=2)
+    tables = [LAYOUT_CACHE.get(generate_layout(seed)) for seed in range(3)]
+    book.ranking(tables[0])
+    book.ranking(tables[1])
+    # Using a layout keeps it, the least recently used one is evicted
+    book.ranking(tables[0])
+    book.ranking(tables[2])
+    assert len(book) == 2
+    assert tables[0].layout.key in book
+    assert tables[1].layout.key not in book
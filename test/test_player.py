@@ -2,6 +2,7 @@ import pytest
 
 from lib.gameplay.game import Game
 from lib.gameplay.hex import ResourceType
+from lib.gameplay.pieces import CardType
 from lib.gameplay.player import has_resources_or_can_trade
 
 
@@ -33,6 +34,34 @@ def test_player() -> None:
     assert game.board.hexes[12] in settled_hexes
 
 
+@pytest.mark.player
+def test_point_counters() -> None:
+    game = Game()
+    player = game.players[0]
+    assert player.victory_points == 2
+
+    game.board.place_city(player, 10)
+    assert player.points() == 3
+
+    player.give_development_card(game.bank.get_dev_card(CardType.VICTORY_POINT))
+    knight = game.bank.get_dev_card(CardType.KNIGHT)
+    player.give_development_card(knight)
+    assert player.points() == 4
+    assert player.largest_army_size() == 0
+
+    player.play_development_card(knight)
+    assert player.largest_army_size() == 1
+    with pytest.raises(ValueError):
+        player.play_development_card(knight)
+
+    game.player_with_longest_road = player
+    assert player.points() == 6
+
+    game.reset()
+    assert player.points() == 2
+    assert player.largest_army_size() == 0
+
+
 def test_has_resources_or_can_trade() -> None:
     game = Game()
     player = game.players[0]
@@ -0,0 +1,154 @@
+import pytest
+import random
+
+from lib.gameplay.game import Game
+from lib.gameplay.hex import ResourceType
+from lib.gameplay.purchase import (
+    COSTS,
+    EXACT_PAYMENT,
+    Purchase,
+    PurchaseResult,
+    affordable,
+    can_afford,
+    cost_vector,
+    hand_vector,
+    payment_plan,
+    purchase_plan,
+)
+
+
+def greedy_can_pay(hand: list[int], cost: tuple[int, ...], exchange_rate: int) -> bool:
+    spare = [have - need for have, need in zip(hand, cost)]
+    for _ in range(sum(-count for count in spare if count < 0)):
+        for i, count in enumerate(spare):
+            if count >= exchange_rate:
+                spare[i] -= exchange_rate
+                break
+        else:
+            return False
+    return True
+
+
+@pytest.mark.purchase
+def test_payment_plan() -> None:
+    road = COSTS[Purchase.ROAD]
+    assert road == cost_vector([ResourceType.WOOD, ResourceType.BRICK])
+    assert payment_plan((1, 1, 0, 0, 0), 4, road) == road
+    assert payment_plan((1, 0, 0, 0, 0), 4, road) is None
+    # Trade four sheep for the missing brick
+    assert payment_plan((1, 0, 4, 0, 0), 4, road) == (1, 0, 4, 0, 0)
+    assert payment_plan((1, 0, 3, 0, 0), 3, road) == (1, 0, 3, 0, 0)
+    assert payment_plan((1, 0, 3, 0, 0), 4, road) is None
+
+    mask = affordable((1, 1, 1, 1, 0), 4)
+    assert mask & (1 << Purchase.ROAD.value)
+    assert mask & (1 << Purchase.SETTLEMENT.value)
+    assert not mask & (1 << Purchase.CITY.value)
+    assert not can_afford((1, 1, 1, 1, 0), 4, Purchase.DEVELOPMENT_CARD)
+
+
+@pytest.mark.purchase
+def test_capped_hands() -> None:
+    rng = random.Random(0)
+    for _ in range(500):
+        exchange_rate = rng.choice([2, 3, 4])
+        hand = [rng.randint(0, 40) for _ in ResourceType]
+        cards = [r for r, count in zip(ResourceType, hand) for _ in range(count)]
+        capped = hand_vector(cards, exchange_rate)
+        for purchase, cost in COSTS.items():
+            if purchase in EXACT_PAYMENT:
+                expected = all(have >= need for have, need in zip(hand, cost))
+            else:
+                expected = greedy_can_pay(hand, cost, exchange_rate)
+            assert can_afford(capped, exchange_rate, purchase) == expected
+
+
+@pytest.mark.purchase
+def test_take_resources_matches_check() -> None:
+    game = Game()
+    player = game.players[1]
+    player.resources = game.bank.get_cards(
+        ResourceType.ORE,
+        ResourceType.ORE,
+        ResourceType.ORE,
+        ResourceType.ORE,
+        ResourceType.ORE,
+        ResourceType.WHEAT,
+        ResourceType.WHEAT,
+        ResourceType.WOOD,
+    )
+    assert player.can_afford(Purchase.CITY)
+    # Spare ore pays for one missing resource but not for two
+    assert player.can_afford(Purchase.ROAD)
+    assert not player.can_afford(Purchase.SETTLEMENT)
+
+    cards = player.take_resources_from_player(
+        [ResourceType.ORE] * 3 + [ResourceType.WHEAT] * 2
+    )
+    assert len(cards) == 5
+    assert player.resource_counts()[ResourceType.ORE] == 2
+    assert player.resource_counts()[ResourceType.WOOD] == 1
+
+    with pytest.raises(ValueError):
+        player.take_resources_from_player([ResourceType.SHEEP])
+    assert len(player.resources) == 3
+
+
+@pytest.mark.purchase
+def test_purchase() -> None:
+    game = Game()
+    bank = game.bank
+    player = game.players[0]
+    player.resources = bank.get_cards(ResourceType.WOOD)
+
+    assert player.purchase(Purchase.ROAD, 14) == PurchaseResult.CANNOT_AFFORD
+    assert len(player.resources) == 1
+
+    player.resources.extend(bank.get_cards(ResourceType.BRICK))
+    # Not connected to any of the player's roads
+    assert player.purchase(Purchase.ROAD, 0) == PurchaseResult.INVALID_LOCATION
+    assert player.purchase(Purchase.ROAD) == PurchaseResult.INVALID_LOCATION
+    assert len(player.resources) == 2
+
+    assert player.purchase(Purchase.ROAD, 14) == PurchaseResult.SUCCESS
+    assert len(player.resources) == 0
+    assert game.board.edges[14].piece is not None
+    assert game.board.edges[14].piece.player == player
+
+    player.resources = bank.get_cards(
+        *[ResourceType.ORE] * 3, *[ResourceType.WHEAT] * 2
+    )
+    assert player.purchase(Purchase.CITY, 10) == PurchaseResult.SUCCESS
+    assert player.points() == 3
+
+    bank.dev_cards = []
+    player.resources = bank.get_cards(
+        ResourceType.ORE, ResourceType.WHEAT, ResourceType.SHEEP
+    )
+    assert player.purchase(Purchase.DEVELOPMENT_CARD) == PurchaseResult.NO_CARDS
+    assert len(player.resources) == 3
+
+    player.roads = player.roads[:2]
+    assert player.purchase(Purchase.ROAD, 15) == PurchaseResult.NO_PIECES
+
+
+@pytest.mark.purchase
+def test_development_cards_need_exact_resources() -> None:
+    game = Game()
+    bank = game.bank
+    player = game.players[0]
+    # Four spare wheat would pay for the missing ore in a trade
+    player.resources = bank.get_cards(ResourceType.SHEEP, *[ResourceType.WHEAT] * 5)
+    hand = player.hand()
+    assert payment_plan(hand, bank.exchange_rate, COSTS[Purchase.DEVELOPMENT_CARD])
+    assert purchase_plan(hand, bank.exchange_rate, Purchase.DEVELOPMENT_CARD) is None
+    assert not can_afford(hand, bank.exchange_rate, Purchase.DEVELOPMENT_CARD)
+    assert not player.can_buy_development_card()
+    assert player.purchase(Purchase.DEVELOPMENT_CARD) == PurchaseResult.CANNOT_AFFORD
+    assert len(player.resources) == 6
+
+    player.resources.extend(bank.get_cards(ResourceType.ORE))
+    assert player.can_buy_development_card()
+    assert player.purchase(Purchase.DEVELOPMENT_CARD) == PurchaseResult.SUCCESS
+    assert player.resource_counts()[ResourceType.WHEAT] == 4
+    assert len(player.development_cards) == 1
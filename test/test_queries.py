@@ -0,0 +1,49 @@
+from lib.logging.database import INDEXES
+from lib.logging.queries import (
+    action_counts_pipeline,
+    cost_by_turn_pipeline,
+    match_actions,
+)
+import pytest
+
+
+@pytest.mark.queries
+def test_match_actions() -> None:
+    assert match_actions() == {"$match": {}}
+    assert match_actions("BUILD_ROAD", "exp") == {
+        "$match": {"experiment_id": "exp", "action": {"$in": ["BUILD_ROAD", 1]}}
+    }
+
+
+@pytest.mark.queries
+def test_pipelines_use_indexes() -> None:
+    # Every $match must be served by the prefix of an action_logs index
+    prefixes = [
+        fields[: i + 1] for fields in INDEXES["action_logs"] for i in range(len(fields))
+    ]
+    for pipeline in [
+        cost_by_turn_pipeline(),
+        cost_by_turn_pipeline(experiment_id="exp"),
+        cost_by_turn_pipeline(action=None, experiment_id="exp"),
+        action_counts_pipeline("exp"),
+    ]:
+        fields = list(pipeline[0]["$match"])
+        assert fields in prefixes
+        assert "$sort" in pipeline[-1]
+
+    # Without a filter every action is aggregated, which needs no index
+    for pipeline in [cost_by_turn_pipeline(action=None), action_counts_pipeline()]:
+        assert pipeline[0] == {"$match": {}}
+        assert "$sort" in pipeline[-1]
+
+
+@pytest.mark.queries
+def test_cost_by_turn_buckets() -> None:
+    pipeline = cost_by_turn_pipeline(bucket_size=1)
+    assert pipeline[1]["$group"]["_id"]["turn"] == "$turn_number"
+    pipeline = cost_by_turn_pipeline(bucket_size=10)
+    assert pipeline[1]["$group"]["_id"]["turn"] == {
+        "$multiply": [{"$floor": {"$divide": ["$turn_number", 10]}}, 10]
+    }
+    with pytest.raises(ValueError):
+        cost_by_turn_pipeline(bucket_size=0)
@@ -0,0 +1,226 @@
+import json
+import pytest
+import random
+from typing import cast
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import numpy as np
+
+from lib.gameplay.events import GameEvent
+from lib.gameplay.game import Game
+from lib.gameplay.snapshot import read_snapshots, record_turns, restore
+from lib.robot.action import Action
+from lib.robot.robot import Robot
+from lib.visualizer.action_graph_visualizer import ActionGraphVisualizer
+from lib.visualizer.live import LiveGame
+from lib.visualizer.renderer import Renderer
+from lib.visualizer import replay
+from lib.visualizer.replay import render_game, render_replays
+
+
+def elements(renderer: Renderer) -> list[str]:
+    # Roads are appended in the order they were built, so compare sorted
+    return sorted(
+        ET.tostring(element, encoding="unicode")
+        for element in renderer.root.iter()
+        if len(element) == 0
+    )
+
+
+@pytest.mark.renderer
+def test_incremental_render(tmp_path: Path) -> None:
+    random.seed(2)
+    np.random.seed(2)
+    game = Game()
+    output = tmp_path / "index.html"
+    renderer = Renderer(game, output_file=str(output), max_fps=0.1)
+    writes = 0
+    write = renderer.write
+
+    def counting_write() -> None:
+        nonlocal writes
+        writes += 1
+        write()
+
+    renderer.write = counting_write
+    game.play()
+
+    # Throttled to the first frame and the forced last frame
+    assert writes <= 3
+    assert renderer.to_svg() in output.read_text()
+
+    fresh = Renderer(game, output_file=str(tmp_path / "fresh.html"))
+    fresh.update()
+    assert elements(renderer) == elements(fresh)
+    assert len(renderer.road_elements) == len(game.board.get_roads())
+
+    game.reset(seed=3)
+    renderer.flush()
+    assert len(renderer.road_elements) == len(game.board.get_roads())
+    fresh = Renderer(game, output_file=str(tmp_path / "fresh.html"))
+    fresh.update()
+    assert elements(renderer) == elements(fresh)
+
+
+@pytest.mark.renderer
+def test_live_game() -> None:
+    random.seed(4)
+    np.random.seed(4)
+    live = LiveGame(Game(), new_game=Game)
+    stream = live.stream()
+    first = json.loads(next(stream).removeprefix("data: "))
+    assert first["svg"] == live.renderer.to_svg()
+    assert len(first["players"]) == 4
+    assert len(live.clients) == 1
+
+    before = {edge.id for edge in live.game.board.get_roads()}
+    while len(live.game.board.get_roads()) == len(before):
+        live.step()
+    frames = []
+    while not live.clients[0].empty():
+        frames.append(json.loads(live.clients[0].get()))
+    assert [frame["turn"] for frame in frames] == list(range(1, len(frames) + 1))
+    patched = {id for frame in frames for id in frame["patch"]}
+    for edge in live.game.board.get_roads():
+        assert (edge.id in before) or f"Road{edge.id}" in patched
+    stream.close()
+    assert len(live.clients) == 0
+
+
+@pytest.mark.renderer
+def test_action_graph_visualizer(tmp_path: Path) -> None:
+    random.seed(4)
+    np.random.seed(4)
+    game = Game()
+    graph = cast(Robot, game.players[0]).action_graph
+    output = tmp_path / "action_graph.html"
+    visualizer = ActionGraphVisualizer(graph, game, str(output))
+    generated = 0
+    get_post_roll_actions = graph.get_post_roll_actions
+
+    def counting() -> list[Action]:
+        nonlocal generated
+        generated += 1
+        return get_post_roll_actions()
+
+    graph.get_post_roll_actions = counting
+    for _ in range(8):
+        game.step()
+
+    # Only the red player's own turns generate actions
+    assert generated == 2
+    assert visualizer.last_html == output.read_text()
+    for action in graph.last_actions["post_roll"]:
+        assert str(action) in output.read_text()
+    assert not visualizer.visualize()
+
+
+@pytest.mark.renderer
+def test_action_graph_visualizer_throttle(tmp_path: Path) -> None:
+    random.seed(4)
+    np.random.seed(4)
+    game = Game()
+    graph = cast(Robot, game.players[0]).action_graph
+    output = tmp_path / "action_graph.html"
+    visualizer = ActionGraphVisualizer(graph, game, str(output), min_interval=3600)
+    rendered = 0
+    render = visualizer.render
+
+    def counting() -> str:
+        nonlocal rendered
+        rendered += 1
+        return render()
+
+    visualizer.render = counting
+    for _ in range(8):
+        game.step()
+
+    # Turns inside the interval are skipped before rendering
+    assert rendered == 1
+    first = output.read_text()
+    assert first == visualizer.last_html
+    assert visualizer.pending
+
+    # The skipped turns are written on the first event after the interval
+    visualizer.last_write -= 3600
+    game.notify(GameEvent.START_TURN)
+    assert rendered == 2
+    assert not visualizer.pending
+    trailing = output.read_text()
+    assert trailing == render()
+    assert trailing != first
+    game.notify(GameEvent.START_TURN)
+    assert rendered == 2
+
+    # The end of the game is written regardless of the interval
+    game.step()
+    assert rendered == 2
+    game.winning_player = game.players[0]
+    game.finish()
+    assert rendered == 3
+    assert output.read_text() == render()
+
+
+@pytest.mark.renderer
+def test_render_replays(tmp_path: Path) -> None:
+    paths = []
+    for seed in [1, 2]:
+        random.seed(seed)
+        np.random.seed(seed)
+        game = Game()
+        path = str(tmp_path / f"game_{seed}.bin")
+        record_turns(game, path)
+        game.play()
+        paths.append(path)
+        assert len(read_snapshots(path)) == game.turn_number + 2
+
+    output = tmp_path / "replays"
+    summaries = render_replays(paths, str(output), processes=2)
+    assert [summary["name"] for summary in summaries] == ["game_1", "game_2"]
+    for path, summary in zip(paths, summaries):
+        records = read_snapshots(path)
+        assert len(summary["frames"]) == len(records)
+        assert summary["winner"] is not None
+        last = (output / summary["name"] / summary["frames"][-1]).read_text()
+        fresh = Renderer(restore(records[-1]), output_file=None)
+        fresh.update()
+        # Roads are appended in the order they were built
+        assert sorted(part.strip() for part in last.split(">")) == sorted(
+            part.strip() for part in fresh.to_svg().split(">")
+        )
+    assert "game_2/index.html" in (output / "index.html").read_text()
+
+
+@pytest.mark.renderer
+def test_render_game(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    # Two games appended to the same file
+    path = str(tmp_path / "games.bin")
+    for seed in [3, 4]:
+        random.seed(seed)
+        np.random.seed(seed)
+        game = Game()
+        record_turns(game, path)
+        game.play()
+    records = read_snapshots(path)
+    restored = 0
+
+    def counting(record: np.ndarray) -> Game:
+        nonlocal restored
+        restored += 1
+        return restore(record)
+
+    monkeypatch.setattr(replay, "restore", counting)
+    output = tmp_path / "game"
+    summary = render_game(path, str(output))
+
+    # Each game is restored once, later frames only add pieces
+    assert restored == 2
+    assert len(summary["frames"]) == len(records)
+    for i in [*range(0, len(records), 10), len(records) - 1]:
+        frame = (output / summary["frames"][i]).read_text()
+        fresh = Renderer(restore(records[i]), output_file=None)
+        fresh.update()
+        assert sorted(part.strip() for part in frame.split(">")) == sorted(
+            part.strip() for part in fresh.to_svg().split(">")
+        )
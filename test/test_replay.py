@@ -0,0 +1,94 @@
+from lib.gameplay.game import Game
+from lib.logging.replay import (
+    MASK_BYTES,
+    NUM_ACTIONS,
+    OBSERVATION_SIZE,
+    OUTCOME_FIELDS,
+    ReplayDataset,
+    ReplayRecorder,
+)
+from pathlib import Path
+import numpy as np
+import pytest
+
+
+def rows(start: int, count: int) -> dict[str, np.ndarray]:
+    """Synthetic rows whose action is their global index"""
+    return {
+        "observations": np.full((count, OBSERVATION_SIZE), 1, dtype=np.int16),
+        "actions": np.arange(start, start + count, dtype=np.int16),
+        "masks": np.zeros((count, MASK_BYTES), dtype=np.uint8),
+        "outcomes": np.zeros((count, len(OUTCOME_FIELDS)), dtype=np.int16),
+    }
+
+
+@pytest.mark.replay
+def test_shard_rollover(tmp_path: Path) -> None:
+    recorder = ReplayRecorder(str(tmp_path), shard_size=7)
+    recorder.append(rows(0, 10))
+    recorder.append(rows(10, 5))
+    assert recorder.shard_counts == [7, 7, 1]
+    assert len(recorder) == 15
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "meta.json",
+        "shard_00000",
+        "shard_00001",
+        "shard_00002",
+    ]
+
+    # A new recorder continues the last shard of the directory
+    reopened = ReplayRecorder(str(tmp_path), shard_size=7)
+    assert reopened.shard_counts == [7, 7, 1]
+    reopened.append(rows(15, 8))
+    assert reopened.shard_counts == [7, 7, 7, 2]
+
+    dataset = ReplayDataset(str(tmp_path))
+    assert len(dataset) == 23
+    assert dataset.get(np.arange(23))["actions"].tolist() == list(range(23))
+
+
+@pytest.mark.replay
+def test_batches_cover_every_row(tmp_path: Path) -> None:
+    recorder = ReplayRecorder(str(tmp_path), shard_size=6)
+    recorder.append(rows(0, 20))
+    dataset = ReplayDataset(str(tmp_path))
+    for shuffle in (True, False):
+        batches = list(dataset.batches(4, shuffle=shuffle, seed=1))
+        assert [len(batch["actions"]) for batch in batches] == [4] * 5
+        actions = np.concatenate([batch["actions"] for batch in batches])
+        assert sorted(actions.tolist()) == list(range(20))
+    batches = list(dataset.batches(8, seed=1, drop_last=True))
+    assert [len(batch["actions"]) for batch in batches] == [8, 8]
+
+
+@pytest.mark.replay
+def test_recorded_games(tmp_path: Path) -> None:
+    recorder = ReplayRecorder(str(tmp_path), shard_size=500)
+    game = Game()
+    recorder.attach(game)
+    for seed in range(2):
+        game.reset(seed)
+        game.play()
+    assert recorder.pending == {}
+    assert len(recorder) > 0
+
+    dataset = ReplayDataset(str(tmp_path))
+    batch = dataset.get(np.arange(len(dataset)))
+    assert batch["masks"].shape == (len(dataset), NUM_ACTIONS)
+    # The executed action was always allowed
+    assert batch["masks"][np.arange(len(dataset)), batch["actions"]].all()
+    assert set(batch["outcomes"][:, 0].tolist()) <= {0, 1}
+
+
+@pytest.mark.replay
+def test_unfinished_games_are_dropped(tmp_path: Path) -> None:
+    recorder = ReplayRecorder(str(tmp_path))
+    game = Game()
+    recorder.attach(game)
+    for _ in range(30):
+        game.step()
+        game.turn_number += 1
+    assert len(recorder.pending[game.game_id]) > 0
+    game.reset()
+    assert recorder.pending == {}
+    assert len(recorder) == 0
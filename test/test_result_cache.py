@@ -0,0 +1,82 @@
+from lib.experiments.optimize_orange import objective
+from lib.experiments.result_cache import (
+    ResultCache,
+    parameters_hash,
+    play_cached,
+    quantize,
+)
+from lib.gameplay.params import DEFAULT_PARAMETERS, GameParameters
+from pathlib import Path
+from typing import cast
+import functools
+import lib.worker
+import pytest
+
+
+@pytest.mark.result_cache
+def test_parameters_hash() -> None:
+    default = parameters_hash(DEFAULT_PARAMETERS)
+    assert parameters_hash([DEFAULT_PARAMETERS] * 4) == default
+    reordered = cast(GameParameters, dict(reversed(DEFAULT_PARAMETERS.items())))
+    assert parameters_hash(reordered) == default
+    study = cast(GameParameters, {**DEFAULT_PARAMETERS, "_id": "study"})
+    assert parameters_hash(study) == default
+    assert parameters_hash([DEFAULT_PARAMETERS] * 3) != default
+    changed: GameParameters = {**DEFAULT_PARAMETERS, "road_building_cost": 0.5}
+    assert parameters_hash([DEFAULT_PARAMETERS] * 3 + [changed]) != default
+    nearly: GameParameters = {**DEFAULT_PARAMETERS, "road_building_cost": 0.401}
+    assert parameters_hash(nearly) == default
+    assert quantize(nearly) == DEFAULT_PARAMETERS
+
+
+@pytest.mark.result_cache
+def test_result_cache(tmp_path: Path) -> None:
+    path = str(tmp_path / "results.sqlite")
+    cache = ResultCache(path)
+    assert cache.get(DEFAULT_PARAMETERS, 1) is None
+    outcome = {"seed": 1, "winner": 2, "points": [3, 4, 10, 5], "turns": 80}
+    cache.put(DEFAULT_PARAMETERS, 1, outcome)
+    cache.put(
+        DEFAULT_PARAMETERS, 2, {"seed": 2, "winner": None, "points": [], "turns": None}
+    )
+    assert cache.get([DEFAULT_PARAMETERS] * 4, 1) == outcome
+    assert cache.get(DEFAULT_PARAMETERS, 2) is None
+    assert (cache.hits, cache.misses) == (1, 2)
+    cache.close()
+
+    assert ResultCache(path).get(DEFAULT_PARAMETERS, 1) == outcome
+    assert ResultCache(path, engine_version=-1).get(DEFAULT_PARAMETERS, 1) is None
+
+
+@pytest.mark.result_cache
+def test_play_cached(tmp_path: Path) -> None:
+    cache = ResultCache(str(tmp_path / "results.sqlite"))
+    lib.worker._game = None
+    outcomes = [play_cached(cache, DEFAULT_PARAMETERS, seed) for seed in [3, 4]]
+    assert cache.misses == 2
+    assert [play_cached(cache, DEFAULT_PARAMETERS, seed) for seed in [3, 4]] == outcomes
+    assert cache.hits == 2
+
+    # A fresh game plays a seed like the reused game that was cached
+    lib.worker._game = None
+    assert lib.worker.play_game(DEFAULT_PARAMETERS, 4) == outcomes[1]
+
+
+@pytest.mark.result_cache
+def test_repeated_trials_hit_cache(tmp_path: Path) -> None:
+    import optuna
+
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    cache = ResultCache(str(tmp_path / "results.sqlite"))
+    study = optuna.create_study(
+        direction="maximize", sampler=optuna.samplers.RandomSampler(seed=0)
+    )
+    trial_objective = functools.partial(objective, seed=3, cache=cache, num_seeds=2)
+    study.optimize(trial_objective, n_trials=1)
+    assert (cache.hits, cache.misses) == (0, 2)
+
+    # The same point suggested in a later trial plays the same cached seeds
+    study.enqueue_trial(study.trials[0].params)
+    study.optimize(trial_objective, n_trials=1)
+    assert (cache.hits, cache.misses) == (2, 2)
+    assert study.trials[1].value == study.trials[0].value
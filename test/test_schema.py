@@ -0,0 +1,72 @@
+from lib.gameplay.game import Game
+from lib.gameplay.player import Player
+from lib.logging.schema import SCHEMA_VERSION, decode_action, encode_action
+from lib.robot.action import Action
+from lib.robot.action_type import ActionType
+from lib.robot.robot import Robot
+from typing import Any, cast
+import json
+import pytest
+
+
+def legacy_record(game: Game, player: Player, action: Action) -> dict[str, Any]:
+    """An action log in the version 1 string format"""
+    return {
+        "game_id": game.game_id,
+        "turn_number": game.turn_number,
+        "player_id": player.id,
+        "action": str(action.action_type),
+        "cost": action.cost,
+        "reward": action.reward,
+        "priority": action.priority,
+        "can_execute": action.can_execute(game.board, game.bank, player),
+        "player_resources": [str(resource) for resource in player.resources],
+        "player_development_cards": [str(card) for card in player.development_cards],
+        "player_settlements": [str(s) for s in player.get_active_settlements()],
+        "player_cities": [str(c) for c in player.get_active_cities()],
+        "player_roads": [str(r) for r in player.get_active_roads()],
+        "executed": action.executed,
+    }
+
+
+@pytest.mark.schema
+def test_action_schema() -> None:
+    game = Game()
+    for _ in range(60):
+        if game.step():
+            break
+        game.turn_number += 1
+    checked = 0
+    for player in game.players:
+        graph = cast(Robot, player).action_graph
+        assert graph is not None
+        for action in graph.get_post_roll_actions():
+            record = encode_action(game, player, action)
+            legacy = legacy_record(game, player, action)
+            assert record["v"] == SCHEMA_VERSION
+            assert ActionType(record["action"]) == action.action_type
+            assert sum(record["hand"]) == len(player.resources)
+            assert sum(record["cards"]) + sum(record["played"]) == len(
+                player.development_cards
+            )
+            assert record["settlements"] == sorted(
+                s.vertex.id
+                for s in player.get_active_settlements()
+                if s.vertex is not None
+            )
+            assert decode_action(record) == record
+            # Both versions can be written to the spool file
+            assert len(json.dumps(record)) < len(json.dumps(legacy))
+
+            upgraded = decode_action(legacy)
+            assert upgraded["v"] == 1
+            assert upgraded["experiment_id"] == "none"
+            for key in ["action", "hand", "cards", "played", "cost", "player_id"]:
+                assert upgraded[key] == record[key]
+            assert len(upgraded["roads"]) == len(record["roads"])
+            assert not any(key.startswith("player_r") for key in upgraded)
+            checked += 1
+    assert checked > 0
+
+    with pytest.raises(ValueError):
+        decode_action({"v": SCHEMA_VERSION + 1})
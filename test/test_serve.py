@@ -0,0 +1,76 @@
+import json
+import pytest
+import random
+from typing import Any, cast
+
+import numpy as np
+
+from lib.gameplay.events import Event, GameEvent
+from lib.gameplay.game import Game
+from lib.robot.robot import Robot
+from lib.visualizer.action_graph_visualizer import ActionGraphVisualizer
+import serve
+
+
+@pytest.mark.serve
+def test_serve() -> None:
+    random.seed(5)
+    np.random.seed(5)
+    live = serve.live
+    live.attach(Game())
+    client = serve.app.test_client()
+
+    page = client.get("/")
+    assert page.status_code == 200
+    assert live.renderer.to_svg() in page.get_data(as_text=True)
+
+    events = client.get("/events", buffered=False)
+    assert events.mimetype == "text/event-stream"
+    stream = events.iter_encoded()
+
+    def next_frame() -> dict[str, Any]:
+        return json.loads(next(stream).decode().removeprefix("data: "))
+
+    first = next_frame()
+    assert first["turn"] == 0
+    assert first["svg"] == live.renderer.to_svg()
+    assert len(live.clients) == 1
+
+    assert client.post("/step").status_code == 204
+    frame = next_frame()
+    assert frame["turn"] == 1
+    assert "svg" not in frame
+
+    # Action graphs come from the players of the streamed game
+    red = cast(Robot, live.game.players[0])
+    page = client.get("/red")
+    assert page.status_code == 200
+    assert (
+        page.get_data(as_text=True)
+        == ActionGraphVisualizer(red.action_graph, live.game, output_file=None).render()
+    )
+    assert client.get("/purple").status_code == 404
+
+    assert client.post("/restart").status_code == 204
+    frame = next_frame()
+    assert frame["turn"] == 0
+    assert frame["svg"] == live.renderer.to_svg()
+
+    # The live game ends at the draw cap and finishes like Game.play
+    ended: list[Event] = []
+    game = live.game
+    game.events.subscribe(GameEvent.END_GAME, ended.append)
+    game.turn_number = 100 * game.num_players - 1
+    assert client.post("/step").status_code == 204
+    frame = next_frame()
+    assert game.winning_player is not None
+    assert frame["winner"] == game.winning_player.color
+    assert [event.value for event in ended] == [game.turn_number]
+
+    # Stepping a finished game changes nothing
+    assert client.post("/step").status_code == 204
+    assert len(ended) == 1
+    assert live.clients[0].empty()
+
+    events.close()
+    assert len(live.clients) == 0
@@ -0,0 +1,152 @@
+import pytest
+import random
+
+import numpy as np
+
+from lib.gameplay.game import Game
+from lib.gameplay.hex import ResourceType
+from lib.gameplay.layout import generate_layout
+from lib.gameplay.pieces import CardType, PieceType
+from lib.gameplay.snapshot import (
+    SNAPSHOT_DTYPE,
+    from_bytes,
+    read_snapshots,
+    record_turns,
+    restore,
+    snapshot,
+    to_bytes,
+    write_snapshots,
+)
+
+
+def play_turns(game: Game, turns: int) -> None:
+    for _ in range(turns):
+        game.step()
+        game.turn_number += 1
+
+
+@pytest.mark.snapshot
+def test_snapshot_round_trip() -> None:
+    game = Game(layout=generate_layout(4))
+    game.board.move_robber(3)
+    game.players[1].give_development_card(game.bank.get_dev_card(CardType.KNIGHT))
+    card = game.bank.get_dev_card(CardType.VICTORY_POINT)
+    card.flip()
+    game.players[2].give_development_card(card)
+    game.board.place_city(game.players[0], game.players[0].settlements[0].position)
+    game.player_with_largest_army = game.players[1]
+
+    data = to_bytes(game)
+    assert len(data) == SNAPSHOT_DTYPE.itemsize
+
+    restored = restore(data)
+    assert to_bytes(restored) == data
+    assert restored.board.layout == game.board.layout
+    assert restored.board.robberLoc == 3
+    assert restored.board.hexes[3].robber
+    assert not restored.board.get_desert().robber
+    assert restored.player_with_largest_army == restored.players[1]
+    assert restored.player_with_longest_road is None
+    assert len(restored.bank.dev_cards) == len(game.bank.dev_cards)
+
+    for original, copy in zip(game.players, restored.players):
+        assert original.resource_counts() == copy.resource_counts()
+        assert original.points() == copy.points()
+        assert [c.cardType for c in original.development_cards] == [
+            c.cardType for c in copy.development_cards
+        ]
+
+    vertex = restored.board.vertices[game.players[0].cities[0].position]
+    assert vertex.piece is not None
+    assert vertex.piece.type == PieceType.CITY
+
+
+@pytest.mark.snapshot
+def test_snapshot_resume() -> None:
+    random.seed(2)
+    np.random.seed(2)
+    game = Game()
+    play_turns(game, 30)
+    data = to_bytes(game)
+
+    play_turns(game, 40)
+    expected = to_bytes(game)
+
+    restored = restore(data)
+    play_turns(restored, 40)
+    assert to_bytes(restored) == expected
+
+
+@pytest.mark.snapshot
+def test_snapshot_file(tmp_path: str) -> None:
+    path = f"{tmp_path}/snapshots.bin"
+    game = Game()
+    records = []
+    for _ in range(3):
+        play_turns(game, 5)
+        records.append(snapshot(game))
+
+    assert write_snapshots(path, records[:2]) == 2
+    assert write_snapshots(path, [records[2].tobytes()]) == 1
+
+    # A partially written record is ignored
+    with open(path, "ab") as f:
+        f.write(b"partial")
+
+    snapshots = read_snapshots(path)
+    assert len(snapshots) == 3
+    assert snapshots[2]["turn_number"] == 15
+    assert snapshots[1].tobytes() == records[1].tobytes()
+    assert restore(snapshots[0]).turn_number == 5
+
+    with pytest.raises(ValueError):
+        from_bytes(b"short")
+
+    bad = records[0].copy()
+    bad["magic"] = b"NOPE"
+    with pytest.raises(ValueError):
+        restore(bad)
+
+
+@pytest.mark.snapshot
+def test_record_reused_game(tmp_path: str) -> None:
+    path = f"{tmp_path}/games.bin"
+    random.seed(6)
+    np.random.seed(6)
+    game = Game()
+    stop = record_turns(game, path)
+    game.play()
+    first_turns = game.turn_number
+
+    game.reset(7)
+    setup = snapshot(game)
+    game.play()
+    records = read_snapshots(path)
+    assert len(records) == first_turns + 2 + game.turn_number + 2
+    # The second game starts from its own setup
+    assert records[first_turns + 2].tobytes() == setup.tobytes()
+
+    stop()
+    game.reset(8)
+    game.play()
+    assert len(read_snapshots(path)) == len(records)
+
+
+@pytest.mark.snapshot
+def test_rob_ignores_hand_order() -> None:
+    game = Game()
+    player = game.players[0]
+    player.resources = game.bank.get_cards(
+        ResourceType.ORE, ResourceType.WOOD, ResourceType.ORE
+    )
+    random.seed(1)
+    first = player.rob()
+
+    player.resources = game.bank.get_cards(
+        ResourceType.WOOD, ResourceType.ORE, ResourceType.ORE
+    )
+    random.seed(1)
+    second = player.rob()
+
+    assert first is not None and second is not None
+    assert first.get_type() == second.get_type()
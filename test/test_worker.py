@@ -0,0 +1,52 @@
+from lib.gameplay.game import Game
+import json
+import lib.worker
+import pytest
+import subprocess
+import sys
+
+HEAVY_MODULES = [
+    "matplotlib",
+    "optuna",
+    "flask",
+    "pymongo",
+    "pandas",
+    "lib.visualizer.renderer",
+]
+
+
+@pytest.mark.worker
+def test_worker_imports_stay_light() -> None:
+    # A fresh interpreter, modules imported by other tests do not count
+    code = (
+        "import json, sys, lib.worker; "
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == []
+
+
+@pytest.mark.worker
+def test_play_game_reuses_game(monkeypatch: pytest.MonkeyPatch) -> None:
+    lib.worker._game = None
+    setups: list[Game] = []
+    first = lib.worker.play_game(seed=1, setup=setups.append)
+    game = lib.worker.current_game()
+    assert first["turns"] is not None
+    assert lib.worker.play_game(seed=1, setup=setups.append) == first
+    assert lib.worker.current_game() is game
+    assert setups == [game, game]
+
+    def fail(self: Game) -> None:
+        raise RuntimeError("lost a card")
+
+    monkeypatch.setattr(Game, "play", fail)
+    failed = lib.worker.play_game(seed=1)
+    assert failed == {"seed": 1, "winner": None, "points": [], "turns": None}
+    # A game that raised is not played again
+    assert lib.worker.current_game() is None
+    monkeypatch.undo()
+    assert lib.worker.play_game(seed=1) == first
+    assert lib.worker.current_game() is not game